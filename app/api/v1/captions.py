@@ -1,11 +1,19 @@
 """
-AI 캡션 생성 API: /captions/generate
+AI 캡션 생성 API: /captions/generate, /captions/generate/batch, /captions/generate/stream
 """
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from app.deps import get_current_user
-from app.models.user import User
-from app.schemas.caption import GenerateCaptionRequest, GenerateCaptionResponse
+from app.models.user import CurrentUser
+from app.schemas.caption import (
+    BatchGenerateCaptionRequest,
+    BatchGenerateCaptionResponse,
+    GenerateCaptionRequest,
+    GenerateCaptionResponse,
+)
 from app.services import caption_service
 
 router = APIRouter(prefix="/captions", tags=["captions"])
@@ -14,10 +22,42 @@ router = APIRouter(prefix="/captions", tags=["captions"])
 @router.post("/generate", response_model=GenerateCaptionResponse)
 async def generate_caption(
     req: GenerateCaptionRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """AI를 사용해 Instagram 캡션과 해시태그를 생성한다."""
     try:
         return await caption_service.generate_caption(req)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@router.post("/generate/batch", response_model=BatchGenerateCaptionResponse)
+async def generate_captions_batch(
+    req: BatchGenerateCaptionRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """여러 주제의 캡션(항목마다 후보 variants개)을 한 번에 생성한다. 실패는 항목별 error로 돌려준다."""
+    return await caption_service.generate_captions_batch(req.items, req.variants)
+
+
+@router.post("/generate/stream")
+async def generate_caption_stream(
+    req: GenerateCaptionRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """캡션 생성 과정을 SSE로 중계한다.
+
+    event: token  data: {"text": "..."}   (provider 응답 조각, 여러 번)
+    event: done   data: GenerateCaptionResponse
+    event: error  data: {"detail": "..."}
+    """
+
+    async def events():
+        async for event, data in caption_service.stream_caption(req):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,8 +4,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps import get_current_user, get_db
-from app.models.user import User
+from app.deps import get_current_user, get_db, invalidate_user_cache
+from app.models.user import CurrentUser, User
 from app.schemas.payment import PaymentVerifyRequest, PaymentVerifyResponse
 from app.schemas.subscription import SubscriptionResponse
 from app.services import payment_service
@@ -17,7 +17,7 @@ router = APIRouter(tags=["payment"])
 async def verify_and_upgrade(
     req: PaymentVerifyRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     아임포트 결제를 서버에서 검증한 뒤 구독 플랜을 업그레이드한다.
@@ -31,12 +31,14 @@ async def verify_and_upgrade(
             detail=str(e),
         )
 
-    current_user.plan = req.plan
+    user = await db.get(User, current_user.id)
+    user.plan = req.plan
     await db.commit()
-    await db.refresh(current_user)
+    await db.refresh(user)
+    invalidate_user_cache(user.id)
 
     return PaymentVerifyResponse(
         success=True,
-        plan=current_user.plan,
+        plan=user.plan,
         message=f"{req.plan} 플랜으로 업그레이드되었습니다.",
     )
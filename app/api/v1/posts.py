@@ -1,12 +1,20 @@
 """
 포스팅 API: /posts
 """
+from typing import Literal, Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.deps import get_current_user, get_db
-from app.models.user import User
-from app.schemas.post import CreatePostRequest, PostListResponse, PostResponse
+from app.models.user import CurrentUser
+from app.schemas.post import (
+    BatchCreatePostRequest,
+    BatchCreatePostResponse,
+    CreatePostRequest,
+    PostListResponse,
+    PostResponse,
+)
 from app.services import post_service
 
 router = APIRouter(prefix="/posts", tags=["posts"])
@@ -16,28 +24,40 @@ router = APIRouter(prefix="/posts", tags=["posts"])
 async def create_post(
     req: CreatePostRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """포스팅 생성 (즉시 실행 또는 예약)."""
     return await post_service.create_post(db, current_user, req)
 
 
+@router.post("/batch", response_model=BatchCreatePostResponse)
+async def create_posts_batch(
+    req: BatchCreatePostRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """포스팅 일괄 생성 (한 트랜잭션, 항목별 결과 반환)."""
+    return await post_service.create_posts_batch(db, current_user, req.items)
+
+
 @router.get("", response_model=PostListResponse)
 async def list_posts(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정 시 page 무시)"),
+    count: Literal["exact", "estimate", "none"] = Query("exact"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """포스팅 목록 조회 (페이지네이션)."""
-    return await post_service.list_posts(db, current_user.id, page, size)
+    """포스팅 목록 조회 (page/size 또는 cursor 페이지네이션)."""
+    return await post_service.list_posts(db, current_user.id, page, size, cursor, count)
 
 
 @router.get("/{post_id}", response_model=PostResponse)
 async def get_post(
     post_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """포스팅 상세 조회."""
     return await post_service.get_post(db, current_user.id, post_id)
@@ -47,7 +67,7 @@ async def get_post(
 async def delete_post(
     post_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """포스팅 삭제."""
     await post_service.delete_post(db, current_user.id, post_id)
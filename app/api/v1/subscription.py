@@ -6,8 +6,8 @@ from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps import get_current_user, get_db
-from app.models.user import User
+from app.deps import get_current_user, get_db, invalidate_user_cache
+from app.models.user import CurrentUser, User
 from app.schemas.subscription import PlanInfo, SubscriptionResponse, UpgradeRequest, UsageResponse
 from app.services.quota_service import get_monthly_usage
 
@@ -42,7 +42,7 @@ async def list_plans():
 
 
 @router.get("/me/subscription", response_model=SubscriptionResponse)
-async def my_subscription(current_user: User = Depends(get_current_user)):
+async def my_subscription(current_user: CurrentUser = Depends(get_current_user)):
     """내 구독 현황 조회."""
     return SubscriptionResponse(
         plan=current_user.plan,
@@ -54,7 +54,7 @@ async def my_subscription(current_user: User = Depends(get_current_user)):
 @router.get("/me/usage", response_model=UsageResponse)
 async def my_usage(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """이번 달 포스팅 사용량 조회."""
     used = await get_monthly_usage(db, current_user.id)
@@ -73,14 +73,16 @@ async def my_usage(
 async def upgrade_subscription(
     req: UpgradeRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """구독 플랜 변경."""
-    current_user.plan = req.plan
+    user = await db.get(User, current_user.id)
+    user.plan = req.plan
     await db.commit()
-    await db.refresh(current_user)
+    await db.refresh(user)
+    invalidate_user_cache(user.id)
     return SubscriptionResponse(
-        plan=current_user.plan,
-        monthly_limit=current_user.monthly_limit,
-        is_active=current_user.is_active,
+        plan=user.plan,
+        monthly_limit=user.monthly_limit,
+        is_active=user.is_active,
     )
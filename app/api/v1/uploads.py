@@ -1,22 +1,87 @@
 """
 미디어 업로드 API: /uploads
 """
-from fastapi import APIRouter, Depends, UploadFile
+from typing import Callable
+
+from fastapi import APIRouter, Depends, Request, Response, UploadFile
+from fastapi.routing import APIRoute
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.deps import get_current_user, get_db
-from app.models.user import User
-from app.schemas.media import MediaFileResponse
+from app.models.user import CurrentUser
+from app.schemas.media import (
+    CompleteUploadRequest,
+    MediaFileResponse,
+    PresignUploadRequest,
+    PresignUploadResponse,
+)
 from app.services import media_service
 
 router = APIRouter(prefix="/uploads", tags=["uploads"])
 
 
-@router.post("", response_model=MediaFileResponse, status_code=201)
+class _DeclaredSizeLimitRoute(APIRoute):
+    """multipart 본문을 파싱(임시 파일로 스풀링)하기 전에 Content-Length로 큰 요청을 거절한다."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request) -> Response:
+            media_service.check_declared_size(request.headers.get("content-length"))
+            return await handler(request)
+
+        return limited_handler
+
+
 async def upload_media(
     file: UploadFile,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """미디어 파일(이미지/동영상) 업로드."""
     return await media_service.save_upload(db, current_user.id, file)
+
+
+router.add_api_route(
+    "",
+    upload_media,
+    methods=["POST"],
+    response_model=MediaFileResponse,
+    status_code=201,
+    route_class_override=_DeclaredSizeLimitRoute,
+)
+
+
+@router.post("/presign", response_model=PresignUploadResponse)
+async def presign_upload(
+    req: PresignUploadRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """저장소 직접 업로드 URL 발급 (큰 파일은 멀티파트 파트별 URL)."""
+    return await media_service.presign_upload(current_user.id, req)
+
+
+@router.put("/direct/{token}", status_code=204)
+async def direct_upload(token: str, request: Request):
+    """로컬 저장소 모드의 직접 업로드 대상 (presigned URL과 같이 토큰으로 인증)."""
+    await media_service.receive_direct_upload(token, request.stream())
+
+
+@router.post("/complete", response_model=MediaFileResponse, status_code=201)
+async def complete_upload(
+    req: CompleteUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """직접 업로드 완료 처리: 크기/형식 확인 후 MediaFile 기록."""
+    return await media_service.complete_upload(db, current_user.id, req)
+
+
+@router.delete("/{media_id}", status_code=204)
+async def delete_media(
+    media_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """미디어 파일 삭제 (같은 내용을 다른 파일이 참조하면 저장 객체는 유지)."""
+    await media_service.delete_media(db, current_user.id, media_id)
@@ -25,7 +25,17 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     ANTHROPIC_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
-    AI_PROVIDER: str = "gemini"  # "openai" | "anthropic" | "gemini"
+    AI_PROVIDER: str = "gemini"  # "openai" | "anthropic" | "gemini" | "stub"(오프라인 부하 테스트용)
+    CAPTION_STUB_LATENCY_MS: int = 200        # stub provider 응답 지연
+    AI_PROVIDER_CHAIN: str = ""               # 쉼표 구분 장애 조치 순서 ("openai,anthropic"), 비우면 AI_PROVIDER만
+    AI_PROVIDER_TIMEOUT_SECONDS: float = 20.0  # provider 호출 1회 시간 제한
+    AI_HEDGE_ENABLED: bool = False            # 앞 provider가 p95 안에 답하지 않으면 다음 provider 동시 시작
+    AI_HEDGE_MIN_DELAY_MS: int = 300          # 헤징 대기 하한
+    AI_PROVIDER_STATS_WINDOW: int = 100       # 순서 조정에 쓰는 최근 호출 수
+    CAPTION_CACHE_SIZE: int = 5000            # 메모리 캐시 항목 수
+    CAPTION_CACHE_TTL_SECONDS: int = 86400    # 같은 요청 결과 재사용 시간
+    CAPTION_CACHE_PERSIST: bool = False       # True면 DB(caption_cache)에도 저장해 재시작/인스턴스 간 공유
+    CAPTION_BATCH_CONCURRENCY: int = 4        # 배치 생성 시 동시 AI 호출 수
 
     # Cloudflare R2
     R2_ACCOUNT_ID: str = ""
@@ -33,11 +43,45 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: str = ""
     R2_BUCKET_NAME: str = "autosns-media"
     R2_PUBLIC_URL: str = ""  # https://pub-xxx.r2.dev or custom domain
+    R2_ENDPOINT_URL: str = ""  # S3 호환 엔드포인트 직접 지정 (MinIO 등 로컬 테스트용)
+    STORAGE_PART_SIZE: int = 8 * 1024 * 1024  # 멀티파트 업로드 파트 크기 (최소 5 MB)
+    DIRECT_UPLOAD_EXPIRE_SECONDS: int = 3600  # presigned 직접 업로드 URL/토큰 유효 시간
+    STORAGE_MULTIPART_CONCURRENCY: int = 4   # 객체 하나당 동시에 전송할 파트 수
+    STORAGE_TRANSFER_WORKERS: int = 16       # 저장소 블로킹 호출 전용 스레드 수
+    STORAGE_MAX_POOL_CONNECTIONS: int = 32   # 공용 S3 클라이언트 HTTP 연결 풀 크기
+
+    # 업로드 이미지 정규화 (Pillow) 프로세스 풀
+    MEDIA_PROCESS_WORKERS: int = 2
 
     # 아임포트 (PortOne)
     IMP_KEY: str = ""      # REST API 키
     IMP_SECRET: str = ""   # REST API Secret
 
+    # Instagram 클라이언트 풀 (로그인된 Client 재사용)
+    IG_CLIENT_POOL_MAX_SIZE: int = 50        # 풀에 유지할 최대 Client 수 (메모리 상한)
+    IG_CLIENT_POOL_TTL_SECONDS: int = 1800   # Client 재사용 최대 시간
+    IG_CLIENT_WARMUP_MINUTES: int = 5        # 예약 시각 N분 전부터 미리 로그인
+
+    # Instagram 블로킹 호출 전용 스레드 풀
+    IG_EXECUTOR_MAX_WORKERS: int = 4
+    IG_LOGIN_TIMEOUT_SECONDS: int = 120
+    IG_UPLOAD_TIMEOUT_SECONDS: int = 900
+
+    # 예약 포스팅 동시 실행 한도
+    SCHEDULER_MAX_CONCURRENCY: int = 8
+    SCHEDULER_PER_ACCOUNT_CONCURRENCY: int = 1
+    SCHEDULER_RECONCILE_MINUTES: int = 5     # 타이머 디스패처 안전망 (DB 전체 재조회 주기)
+    USAGE_RECONCILE_MINUTES: int = 60        # usage_counters 재계산 주기
+
+    # 다중 인스턴스 실행 리스 (비우면 hostname-pid-랜덤값)
+    INSTANCE_ID: str = ""
+    POST_LEASE_SECONDS: int = 120            # 하트비트 없이 이 시간이 지나면 다른 인스턴스가 회수
+
+    # 인증 캐시 (get_current_user)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_SIZE: int = 10000
+
     # CORS (쉼표 구분 문자열: "https://a.com,https://b.com")
     CORS_ORIGINS: str = "http://localhost:3000"
 
@@ -45,6 +89,11 @@ class Settings(BaseSettings):
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     UPLOADS_DIR: Path = BASE_DIR / "uploads"
     SESSIONS_DIR: Path = BASE_DIR / "sessions"
+    MEDIA_CACHE_DIR: Path = BASE_DIR / "cache" / "media"  # 포스팅 실행용 다운로드 캐시
+    MEDIA_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 캐시 디스크 상한 (LRU 축출)
+    MEDIA_PRESTAGE_LEAD_MINUTES: int = 10    # 예약 시각 N분 전부터 미디어 사전 다운로드
+    MEDIA_PRESTAGE_MAX_BYTES: int = 1024 * 1024 * 1024  # 사전 다운로드로 고정할 수 있는 디스크 상한
+    MEDIA_PRESTAGE_CONCURRENCY: int = 4      # 동시에 사전 다운로드할 포스팅 수
 
     def get_cors_origins(self) -> list[str]:
         return [o.strip() for o in self.CORS_ORIGINS.split(",") if o.strip()]
@@ -55,3 +104,4 @@ settings = Settings()
 # 필요 디렉토리 자동 생성
 settings.UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 settings.SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+settings.MEDIA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,6 +1,7 @@
 """
 SQLAlchemy 비동기 엔진, 세션, Base
 """
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -33,10 +34,64 @@ class Base(DeclarativeBase):
     pass
 
 
+def dialect_insert(db: AsyncSession, model):
+    """DB 방언에 맞는 INSERT (on_conflict_do_update/do_nothing 지원)."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 async def init_db() -> None:
     """앱 시작 시 모든 테이블 생성."""
     # 모델을 임포트해야 Base.metadata에 등록됨
-    from app.models import user, ig_account, post, media_file  # noqa: F401
+    from app.models import (  # noqa: F401
+        user, ig_account, post, media_blob, media_file, usage_counter, caption_cache,
+    )
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+        await conn.run_sync(_drop_retired_indexes)
+
+
+def _add_missing_columns(sync_conn) -> None:
+    """기존 DB 마이그레이션: create_all은 이미 있는 테이블에 컬럼을 추가하지 않으므로
+    모델에 새로 생긴 컬럼을 ALTER TABLE로 추가한다. (새 컬럼은 nullable이거나 server_default 필요)
+    """
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            col_type = column.type.compile(dialect=sync_conn.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+            if column.server_default is not None:
+                default = column.server_default.arg
+                ddl += f" DEFAULT {getattr(default, 'text', None) or repr(str(default))}"
+            sync_conn.execute(text(ddl))
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """기존 DB 마이그레이션: create_all은 새 테이블을 만들 때만 인덱스를 생성하므로
+    이미 있는 테이블에 모델에 새로 정의된 인덱스를 추가한다.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+# 모델에서 빠진 인덱스 (새 DB와 기존 DB의 스키마를 같게 맞추기 위해 삭제)
+_RETIRED_INDEXES = [
+    "ix_posts_status",  # (status, ...) 복합 인덱스로 대체
+]
+
+
+def _drop_retired_indexes(sync_conn) -> None:
+    for name in _RETIRED_INDEXES:
+        sync_conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
@@ -0,0 +1,143 @@
+"""
+Instagram(instagrapi) 블로킹 호출 전용 스레드 풀
+- 기본 executor와 분리해 긴 동영상 업로드가 다른 블로킹 작업을 굶기지 않게 한다
+- 같은 IG 계정의 작업은 순서대로 하나씩 실행 (계정 단위 직렬화)
+- 호출마다 시간 제한: 초과 시 결과를 포기하고 TimeoutError (스레드가 끝날 때까지 계정은 사용 중으로 둔다)
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class IGExecutor:
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ig-worker")
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: dict[Hashable, int] = {}
+        self._counter_lock = threading.Lock()
+        self.queued = 0      # 계정 락 또는 워커를 기다리는 호출 수
+        self.active = 0      # 워커 스레드에서 실행 중인 호출 수
+        self.abandoned = 0   # 시간 초과로 포기했지만 스레드가 아직 붙잡고 있는 호출 수
+        self.completed = 0
+        self.timeouts = 0
+
+    async def run(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """key(IG 계정) 단위로 직렬화해 fn(*args)를 전용 풀에서 실행한다.
+
+        시간 초과/취소로 결과를 포기해도 스레드가 아직 실행 중이면 계정 락은 그 스레드가
+        끝날 때까지 잡아 둔다 (같은 계정의 다음 작업이 포기된 업로드와 겹치지 않도록).
+        """
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        self._add("queued", 1)
+        state = {"started": False, "finished": False, "timed_out": False}
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._add("queued", -1)
+            self._leave(key)
+            raise
+
+        loop = asyncio.get_running_loop()
+        release_now = True
+        try:
+            job = self._executor.submit(self._call, state, fn, args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(job), timeout)
+            except asyncio.CancelledError:
+                release_now = not self._abandon(state)
+                raise
+            except asyncio.TimeoutError:
+                release_now = not self._abandon(state)
+                self._add("timeouts", 1)
+                logger.error(
+                    "IG 작업 시간 초과 (%s, %ss): %s", key, timeout, getattr(fn, "__name__", fn)
+                )
+                raise TimeoutError(f"Instagram 작업 시간 초과 ({timeout:g}초)") from None
+        finally:
+            if release_now:
+                self._release(key, lock)
+            else:
+                # 포기한 스레드가 끝나면(워커 스레드에서 호출) 이벤트 루프에서 락을 푼다
+                job.add_done_callback(
+                    lambda _job: loop.call_soon_threadsafe(self._release, key, lock)
+                )
+
+    def _release(self, key: Hashable, lock: asyncio.Lock) -> None:
+        lock.release()
+        self._leave(key)
+
+    def _leave(self, key: Hashable) -> None:
+        remaining = self._lock_users[key] - 1
+        if remaining:
+            self._lock_users[key] = remaining
+        else:
+            del self._lock_users[key]
+            self._locks.pop(key, None)
+
+    def _abandon(self, state: dict) -> bool:
+        """결과를 포기한다. 스레드가 아직 실행 중이면 True."""
+        with self._counter_lock:
+            state["timed_out"] = True
+            if state["finished"]:
+                return False
+            if state["started"]:
+                # 실행 중인 스레드는 멈출 수 없으므로 결과만 포기한다
+                self.abandoned += 1
+                return True
+            self.queued -= 1
+            return False
+
+    def _call(self, state: dict, fn: Callable[..., Any], args: tuple) -> Any:
+        with self._counter_lock:
+            if state["timed_out"]:
+                return None  # 대기 중에 시간 초과로 포기된 호출
+            state["started"] = True
+            self.queued -= 1
+            self.active += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._counter_lock:
+                state["finished"] = True
+                self.active -= 1
+                self.completed += 1
+                if state["timed_out"]:
+                    self.abandoned -= 1
+
+    def _add(self, name: str, delta: int) -> None:
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "abandoned": self.abandoned,
+                "completed": self.completed,
+                "timeouts": self.timeouts,
+                "accounts_waiting": len(self._lock_users),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+ig_executor = IGExecutor(max_workers=settings.IG_EXECUTOR_MAX_WORKERS)
@@ -0,0 +1,243 @@
+"""
+포스팅 실행용 로컬 미디어 캐시 (디스크, 크기 제한 LRU)
+- 저장소 키 기준으로 한 번 내려받은 파일을 재시도/다계정 포스팅에서 재사용
+- 전체 크기가 MEDIA_CACHE_MAX_BYTES를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+- 사용 중(use 블록 안)이거나 예약 포스팅용으로 미리 받아 둔(pin) 파일은 축출하지 않는다
+- 이미 로컬 경로인 미디어는 복사 없이 그대로 돌려준다
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from app.core import storage
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    path: Path
+    size: int
+    refs: int = 0
+    last_used: float = field(default_factory=time.time)
+
+
+class MediaCache:
+    """저장소 키 → 로컬 파일 LRU (이벤트 루프 단일 스레드에서만 접근)."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._waiting: dict[str, int] = {}  # 다운로드 결과를 기다리는 호출 수 (그동안 축출 금지)
+        self._pins: dict[int, list[str]] = {}  # post_id → 미리 받아 둔 캐시 키
+        self._loaded = False
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _cache_key(self, location: str) -> str:
+        key = storage.key_from_location(location)
+        if key is None:
+            # 우리 저장소 밖 URL: URL 해시로 보관
+            digest = hashlib.sha256(location.encode()).hexdigest()
+            key = f"url/{digest}{Path(location.split('?', 1)[0]).suffix}"
+        return key
+
+    def _load_index(self) -> None:
+        """재시작 후 디스크에 남은 파일로 인덱스를 복원한다 (mtime 순)."""
+        self._loaded = True
+        if not self.root.exists():
+            return
+        found = []
+        for path in self.root.rglob("*"):
+            if not path.is_file():
+                continue
+            if path.name.endswith(".part"):
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            found.append((stat.st_mtime, path.relative_to(self.root).as_posix(), path, stat.st_size))
+        for mtime, key, path, size in sorted(found):
+            self._entries[key] = _CacheEntry(path=path, size=size, last_used=mtime)
+            self.total_bytes += size
+        self._evict()
+
+    async def fetch(self, location: str) -> str:
+        """미디어 위치(URL/로컬 경로)를 로컬 파일 경로로 바꾼다. 캐시 미스면 내려받는다."""
+        return await self._fetch(location)
+
+    async def _fetch(self, location: str, held: Optional[list[str]] = None) -> str:
+        """held가 주어지면 경로를 돌려주기 전에 같은 스텝에서 참조 카운트를 올리고 키를 held에 넣는다.
+
+        다운로드 완료 후 대기자가 깨어나기 전까지는 _waiting으로 축출을 막으므로
+        돌려준 경로가 그 사이에 지워지지 않는다.
+        """
+        if not location.startswith("http"):
+            return location
+        if not self._loaded:
+            self._load_index()
+
+        key = self._cache_key(location)
+        entry = self._entries.get(key)
+        if entry is not None and entry.path.exists():
+            self._touch(key, entry)
+            self.hits += 1
+        else:
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._download(key, location))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+            try:
+                path = await asyncio.shield(future)
+            finally:
+                self._waiting[key] -= 1
+                if not self._waiting[key]:
+                    del self._waiting[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return path
+
+        if held is not None:
+            entry.refs += 1
+            held.append(key)
+        return str(entry.path)
+
+    @asynccontextmanager
+    async def use(self, locations: list[str]) -> AsyncIterator[list[str]]:
+        """여러 미디어를 동시에 받아 로컬 경로 목록(입력 순서)을 주고, 블록 안에서는 축출을 막는다."""
+        keys: list[str] = []
+        try:
+            paths = await self._acquire_all(locations, keys)
+            yield paths
+        finally:
+            self._release(keys)
+            self._evict()
+
+    async def pin(self, post_id: int, locations: list[str]) -> None:
+        """예약 포스팅 미디어를 미리 받아 unpin까지 축출되지 않게 고정한다."""
+        if post_id in self._pins:
+            return
+        keys: list[str] = []
+        try:
+            await self._acquire_all(locations, keys)
+        except BaseException:
+            self._release(keys)
+            raise
+        self._pins[post_id] = keys
+
+    def unpin(self, post_id: int) -> None:
+        """포스팅이 끝났거나 취소되면 고정을 푼다 (파일은 일반 LRU 항목으로 남는다)."""
+        keys = self._pins.pop(post_id, None)
+        if keys is not None:
+            self._release(keys)
+            self._evict()
+
+    def pinned_posts(self) -> list[int]:
+        return list(self._pins)
+
+    @property
+    def pinned_bytes(self) -> int:
+        keys = {key for keys in self._pins.values() for key in keys}
+        return sum(self._entries[key].size for key in keys if key in self._entries)
+
+    async def _acquire_all(self, locations: list[str], keys: list[str]) -> list[str]:
+        """모든 위치를 동시에 받아 참조 카운트를 올린다. 올린 키는 keys에 모은다.
+
+        하나라도 실패하면 나머지를 취소하고 모두 끝난 뒤에 예외를 다시 던진다.
+        그래서 호출자가 keys를 풀 때 나중에 참조를 잡는 작업이 남지 않는다.
+        """
+        tasks = [asyncio.ensure_future(self._fetch(location, keys)) for location in locations]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def _release(self, keys: list[str]) -> None:
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs -= 1
+
+    def _touch(self, key: str, entry: _CacheEntry) -> None:
+        entry.last_used = time.time()
+        self._entries.move_to_end(key)
+        try:
+            os.utime(entry.path)
+        except OSError:
+            pass
+
+    async def _download(self, key: str, location: str) -> str:
+        path = self.root / key
+        part = path.with_name(path.name + ".part")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            size = await storage.download_to_path(location, part)
+            os.replace(part, path)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old.size
+        self._entries[key] = _CacheEntry(path=path, size=size)
+        self.total_bytes += size
+        self._evict()
+        return str(path)
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs > 0 or key in self._inflight or key in self._waiting:
+                continue
+            del self._entries[key]
+            self.total_bytes -= entry.size
+            self.evictions += 1
+            entry.path.unlink(missing_ok=True)
+            logger.debug("미디어 캐시 축출: %s (%d bytes)", key, entry.size)
+
+    def invalidate(self, key: str) -> None:
+        """원본 저장소 객체가 삭제되면 캐시 파일도 지운다."""
+        entry = self._entries.get(key)
+        if entry is None or entry.refs > 0 or key in self._waiting:
+            return  # 사용 중이면 그대로 두고 LRU 축출에 맡긴다
+        del self._entries[key]
+        self.total_bytes -= entry.size
+        entry.path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "pinned_posts": len(self._pins),
+            "pinned_bytes": self.pinned_bytes,
+            "inflight_downloads": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+media_cache = MediaCache(root=settings.MEDIA_CACHE_DIR, max_bytes=settings.MEDIA_CACHE_MAX_BYTES)
@@ -0,0 +1,40 @@
+"""
+CPU 바운드 미디어 처리 전용 프로세스 풀
+이미지 디코딩/리사이즈/인코딩은 GIL을 오래 잡으므로 이벤트 루프·스레드 풀과 분리해 실행한다.
+풀은 첫 사용 시 생성한다 (임포트만으로 자식 프로세스를 띄우지 않도록).
+"""
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+_AUTOSNS_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_AUTOSNS_ROOT) not in sys.path:
+    sys.path.insert(0, str(_AUTOSNS_ROOT))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.MEDIA_PROCESS_WORKERS)
+    return _pool
+
+
+async def normalize_image(src: str, dst: str) -> tuple[int, int, int]:
+    """autosns.image_prep.normalize_image를 프로세스 풀에서 실행한다. (width, height, bytes) 반환."""
+    from autosns.image_prep import normalize_image as _normalize
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), _normalize, src, dst)
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -47,6 +47,27 @@ def create_refresh_token(user_id: int) -> str:
     )
 
 
+def create_upload_token(
+    user_id: int,
+    key: str,
+    content_type: str,
+    size: int,
+    upload_id: Optional[str] = None,
+) -> str:
+    """직접 업로드 토큰: 업로드 대상/선언 크기/형식을 서명해 서버 상태 없이 완료 단계에서 검증."""
+    return _create_token(
+        {
+            "sub": str(user_id),
+            "type": "upload",
+            "key": key,
+            "ct": content_type,
+            "size": size,
+            "uid": upload_id,
+        },
+        timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRE_SECONDS),
+    )
+
+
 def decode_token(token: str) -> Optional[dict]:
     """토큰 디코딩. 유효하지 않으면 None 반환."""
     try:
@@ -1,29 +1,133 @@
 """
 Cloudflare R2 (S3 호환) 파일 저장소
 R2_ACCOUNT_ID 등이 설정되지 않으면 로컬 파일시스템 사용 (개발 환경)
+
+S3 클라이언트는 프로세스에서 하나만 만들어 연결 풀을 재사용하고,
+블로킹 전송은 전용 스레드 풀(STORAGE_TRANSFER_WORKERS)에서 실행한다.
+큰 객체는 STORAGE_PART_SIZE 단위 멀티파트로 병렬 업로드/다운로드한다.
+R2_ENDPOINT_URL로 MinIO 같은 로컬 S3 호환 서버를 가리킬 수 있다.
 """
 import asyncio
+import functools
+import hashlib
+import io
+import logging
+import os
 import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# S3 멀티파트 최소 파트 크기는 5 MB (마지막 파트 제외)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """스트리밍 업로드 중 max_size를 넘었을 때."""
+
+
+@dataclass
+class StoredObject:
+    url: str      # R2 공개 URL 또는 로컬 경로
+    size: int     # bytes
+    sha256: str   # hex digest
+
 
+_transfer_executor = ThreadPoolExecutor(
+    max_workers=settings.STORAGE_TRANSFER_WORKERS, thread_name_prefix="storage"
+)
+
+# 전송 처리량 통계 (스레드 풀에서도 갱신)
+_stats_lock = threading.Lock()
+_transfer_stats = {
+    direction: {"count": 0, "bytes": 0, "seconds": 0.0, "last_mbps": None}
+    for direction in ("upload", "download")
+}
+
+
+@functools.lru_cache(maxsize=1)
 def _get_s3_client():
+    """프로세스 공용 S3 클라이언트 (boto3 클라이언트는 스레드 안전)."""
     import boto3
+    from botocore.config import Config
+
     return boto3.client(
         "s3",
-        endpoint_url=f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
+        endpoint_url=settings.R2_ENDPOINT_URL or f"https://{settings.R2_ACCOUNT_ID}.r2.cloudflarestorage.com",
         aws_access_key_id=settings.R2_ACCESS_KEY_ID,
         aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
         region_name="auto",
+        config=Config(
+            max_pool_connections=settings.STORAGE_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
+    )
+
+
+def _transfer_config():
+    from boto3.s3.transfer import TransferConfig
+
+    part_size = max(settings.STORAGE_PART_SIZE, MIN_PART_SIZE)
+    return TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=settings.STORAGE_MULTIPART_CONCURRENCY,
+        use_threads=True,
     )
 
 
 def _is_r2_enabled() -> bool:
-    return bool(settings.R2_ACCOUNT_ID and settings.R2_ACCESS_KEY_ID and settings.R2_SECRET_ACCESS_KEY)
+    return bool(
+        (settings.R2_ACCOUNT_ID or settings.R2_ENDPOINT_URL)
+        and settings.R2_ACCESS_KEY_ID
+        and settings.R2_SECRET_ACCESS_KEY
+    )
+
+
+async def _run(fn: Callable[..., Any], *args: Any) -> Any:
+    """블로킹 저장소 작업을 전송 전용 스레드 풀에서 실행한다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_transfer_executor, functools.partial(fn, *args))
+
+
+def _record_transfer(direction: str, key: str, nbytes: int, seconds: float) -> None:
+    mbps = (nbytes / (1024 * 1024)) / seconds if seconds > 0 else None
+    with _stats_lock:
+        stats = _transfer_stats[direction]
+        stats["count"] += 1
+        stats["bytes"] += nbytes
+        stats["seconds"] += seconds
+        stats["last_mbps"] = round(mbps, 2) if mbps is not None else None
+    logger.info(
+        "%s %s: %.1f MB / %.2fs (%s MB/s)",
+        direction, key, nbytes / (1024 * 1024), seconds, f"{mbps:.1f}" if mbps else "-",
+    )
+
+
+def transfer_stats() -> dict:
+    """방향별 누적 전송량과 평균/최근 처리량 (MB/s)."""
+    with _stats_lock:
+        result = {}
+        for direction, stats in _transfer_stats.items():
+            avg = (stats["bytes"] / (1024 * 1024)) / stats["seconds"] if stats["seconds"] else None
+            result[direction] = {**stats, "avg_mbps": round(avg, 2) if avg else None}
+        return result
+
+
+def shutdown() -> None:
+    _transfer_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _public_url(key: str) -> str:
+    return f"{settings.R2_PUBLIC_URL.rstrip('/')}/{key}"
 
 
 async def upload_file(content: bytes, key: str, content_type: str) -> str:
@@ -31,45 +135,386 @@ async def upload_file(content: bytes, key: str, content_type: str) -> str:
     if not _is_r2_enabled():
         return await _save_local(content, key)
 
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _upload_r2, content, key, content_type)
-    return f"{settings.R2_PUBLIC_URL.rstrip('/')}/{key}"
+    started = time.monotonic()
+    await _run(_upload_r2, content, key, content_type)
+    _record_transfer("upload", key, len(content), time.monotonic() - started)
+    return _public_url(key)
+
+
+async def upload_stream(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    content_type: str,
+    max_size: Optional[int] = None,
+) -> StoredObject:
+    """청크 단위로 받아 저장소에 스트리밍 업로드한다.
+
+    크기 제한은 누적 바이트로 즉시 검사하고(초과 시 FileTooLargeError, 부분 업로드는 정리),
+    SHA-256은 받는 대로 계산한다. 메모리 사용량은 파일 크기와 무관하게
+    R2는 파트 크기, 로컬은 청크 크기 수준으로 일정하다.
+    """
+    if not _is_r2_enabled():
+        return await _stream_local(chunks, key, max_size)
+    return await _stream_r2(chunks, key, content_type, max_size)
+
+
+async def promote_object(src_key: str, dst_key: str) -> str:
+    """임시 키로 올린 객체를 최종 키로 옮기고 URL/경로를 반환한다."""
+    if not _is_r2_enabled():
+        dst = settings.UPLOADS_DIR / dst_key
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        await _run(os.replace, settings.UPLOADS_DIR / src_key, dst)
+        return str(dst)
+
+    def _move() -> None:
+        client = _get_s3_client()
+        bucket = settings.R2_BUCKET_NAME
+        client.copy_object(Bucket=bucket, Key=dst_key, CopySource={"Bucket": bucket, "Key": src_key})
+        client.delete_object(Bucket=bucket, Key=src_key)
+
+    await _run(_move)
+    return _public_url(dst_key)
+
+
+async def delete_object(key: str) -> None:
+    """저장소 객체 삭제 (없으면 무시)."""
+    if not _is_r2_enabled():
+        await _run(lambda: (settings.UPLOADS_DIR / key).unlink(missing_ok=True))
+        return
+    await _run(lambda: _get_s3_client().delete_object(Bucket=settings.R2_BUCKET_NAME, Key=key))
+
+
+def key_from_location(url_or_path: str) -> Optional[str]:
+    """upload_*가 돌려준 URL/로컬 경로에서 저장소 키를 되찾는다. 알 수 없으면 None."""
+    if _is_r2_enabled():
+        prefix = settings.R2_PUBLIC_URL.rstrip("/") + "/"
+        return url_or_path[len(prefix):] if url_or_path.startswith(prefix) else None
+    try:
+        return Path(url_or_path).relative_to(settings.UPLOADS_DIR).as_posix()
+    except ValueError:
+        return None
+
+
+def is_direct_upload_supported() -> bool:
+    """presigned URL 직접 업로드 가능 여부 (R2 모드). 로컬 모드는 API 서버가 대신 받는다."""
+    return _is_r2_enabled()
+
+
+async def presign_put(key: str, content_type: str, expires_in: int) -> str:
+    """단일 PUT 업로드용 presigned URL."""
+    return await _run(
+        lambda: _get_s3_client().generate_presigned_url(
+            "put_object",
+            Params={"Bucket": settings.R2_BUCKET_NAME, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+    )
+
+
+async def presign_multipart(
+    key: str, content_type: str, size: int, part_size: int, expires_in: int
+) -> tuple[str, list[str]]:
+    """멀티파트 업로드를 시작하고 파트별 presigned PUT URL을 반환한다."""
+
+    def _presign() -> tuple[str, list[str]]:
+        client = _get_s3_client()
+        bucket = settings.R2_BUCKET_NAME
+        upload_id = client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)["UploadId"]
+        part_count = max(1, -(-size // part_size))
+        urls = [
+            client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": n},
+                ExpiresIn=expires_in,
+            )
+            for n in range(1, part_count + 1)
+        ]
+        return upload_id, urls
+
+    return await _run(_presign)
+
+
+async def complete_multipart(key: str, upload_id: str, parts: list[dict]) -> None:
+    """parts: [{"PartNumber": n, "ETag": "..."}]"""
+    await _run(
+        lambda: _get_s3_client().complete_multipart_upload(
+            Bucket=settings.R2_BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+        )
+    )
+
+
+async def head_object(key: str) -> Optional[tuple[int, Optional[str]]]:
+    """저장된 객체의 (크기, Content-Type). 없으면 None. 로컬 모드는 Content-Type을 모른다(None)."""
+    if not _is_r2_enabled():
+        path = settings.UPLOADS_DIR / key
+        try:
+            stat = await _run(path.stat)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, None
+
+    def _head() -> Optional[tuple[int, Optional[str]]]:
+        from botocore.exceptions import ClientError
+
+        try:
+            resp = _get_s3_client().head_object(Bucket=settings.R2_BUCKET_NAME, Key=key)
+        except ClientError:
+            return None
+        return resp["ContentLength"], resp.get("ContentType")
+
+    return await _run(_head)
+
+
+class _RangeReader(io.RawIOBase):
+    """R2 객체를 range GET으로 필요한 만큼만 읽는 seek 가능한 읽기 전용 파일 객체 (동기)."""
+
+    def __init__(self, key: str, size: int) -> None:
+        super().__init__()
+        self._key = key
+        self._size = size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        if self._pos >= self._size or size == 0:
+            return b""
+        end = self._size if size is None or size < 0 else min(self._size, self._pos + size)
+        resp = _get_s3_client().get_object(
+            Bucket=settings.R2_BUCKET_NAME, Key=self._key, Range=f"bytes={self._pos}-{end - 1}"
+        )
+        data = resp["Body"].read()
+        self._pos += len(data)
+        return data
+
+
+async def inspect_object(key: str, fn: Callable[[io.RawIOBase], Any]) -> Any:
+    """저장된 객체를 파일 객체로 열어 fn에 넘긴다 (전송 스레드에서 실행).
+
+    R2는 전체를 내려받지 않고 fn이 읽는 구간만 range GET으로 가져온다.
+    """
+    if not _is_r2_enabled():
+        def _local() -> Any:
+            with open(settings.UPLOADS_DIR / key, "rb") as fh:
+                return fn(fh)
+        return await _run(_local)
+
+    def _remote() -> Any:
+        size = _get_s3_client().head_object(Bucket=settings.R2_BUCKET_NAME, Key=key)["ContentLength"]
+        return fn(_RangeReader(key, size))
+
+    return await _run(_remote)
+
+
+def location_for_key(key: str) -> str:
+    """저장소 키의 공개 URL(R2) 또는 로컬 경로."""
+    if _is_r2_enabled():
+        return _public_url(key)
+    return str(settings.UPLOADS_DIR / key)
 
 
 async def download_to_tempfile(file_url_or_path: str, suffix: str = "") -> str:
     """R2 URL 또는 로컬 경로에서 임시 파일로 다운로드. 임시 파일 경로 반환."""
-    if file_url_or_path.startswith("http"):
-        import httpx
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _download_http, file_url_or_path, suffix)
-    # 이미 로컬 경로
-    return file_url_or_path
+    if not file_url_or_path.startswith("http"):
+        # 이미 로컬 경로
+        return file_url_or_path
+    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    tmp.close()
+    try:
+        await download_to_path(file_url_or_path, tmp.name)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+    return tmp.name
+
+
+async def download_to_path(file_url: str, dest: str | Path) -> int:
+    """URL의 객체를 dest에 스트리밍으로 저장한다 (메모리에 전체를 올리지 않음). 바이트 수 반환."""
+    key = key_from_location(file_url) if _is_r2_enabled() else None
+    started = time.monotonic()
+    if key is not None:
+        # 우리 버킷 객체는 S3 API로 병렬 ranged GET
+        await _run(_download_s3, key, str(dest))
+    else:
+        await _run(_download_http, file_url, str(dest))
+    size = os.path.getsize(dest)
+    _record_transfer("download", key or file_url, size, time.monotonic() - started)
+    return size
 
 
 def _upload_r2(content: bytes, key: str, content_type: str):
+    """STORAGE_PART_SIZE보다 크면 boto3 전송 관리자가 파트를 병렬 업로드한다."""
     client = _get_s3_client()
-    client.put_object(
-        Bucket=settings.R2_BUCKET_NAME,
-        Key=key,
-        Body=content,
-        ContentType=content_type,
+    client.upload_fileobj(
+        io.BytesIO(content),
+        settings.R2_BUCKET_NAME,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=_transfer_config(),
     )
 
 
-def _download_http(url: str, suffix: str) -> str:
+async def _stream_r2(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    content_type: str,
+    max_size: Optional[int],
+) -> StoredObject:
+    """파트 크기만큼 모이면 upload_part를 병렬로 보낸다 (동시에 최대 STORAGE_MULTIPART_CONCURRENCY개).
+
+    전체가 한 파트보다 작으면 put_object 한 번으로 끝낸다.
+    메모리 상한은 (동시 파트 수 + 1) × 파트 크기.
+    """
+    client = _get_s3_client()
+    bucket = settings.R2_BUCKET_NAME
+    part_size = max(settings.STORAGE_PART_SIZE, MIN_PART_SIZE)
+    slots = asyncio.Semaphore(settings.STORAGE_MULTIPART_CONCURRENCY)
+    started = time.monotonic()
+
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    upload_id: Optional[str] = None
+    parts: list[dict] = []
+    inflight: set[asyncio.Task] = set()
+    next_part = 0
+
+    async def send_part(part_number: int, body: bytes) -> None:
+        try:
+            resp = await _run(
+                lambda: client.upload_part(
+                    Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+                )
+            )
+            parts.append({"PartNumber": part_number, "ETag": resp["ETag"]})
+        finally:
+            slots.release()
+
+    async def flush_part() -> None:
+        nonlocal upload_id, next_part
+        if upload_id is None:
+            created = await _run(
+                lambda: client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)
+            )
+            upload_id = created["UploadId"]
+        # 앞서 실패한 파트가 있으면 바로 중단
+        for task in [t for t in inflight if t.done()]:
+            inflight.discard(task)
+            task.result()
+        # 파트 번호는 버퍼 순서대로 고정 (완료 순서와 무관)
+        next_part += 1
+        part_number = next_part
+        await slots.acquire()
+        body = bytes(buffer)
+        buffer.clear()
+        inflight.add(asyncio.create_task(send_part(part_number, body)))
+
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise FileTooLargeError(f"파일 크기 제한({max_size} bytes) 초과")
+            digest.update(chunk)
+            buffer.extend(chunk)
+            if len(buffer) >= part_size:
+                await flush_part()
+
+        if upload_id is None:
+            body = bytes(buffer)
+            await _run(
+                lambda: client.put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+            )
+        else:
+            if buffer:
+                await flush_part()
+            await asyncio.gather(*inflight)
+            await _run(
+                lambda: client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+                )
+            )
+    except BaseException:
+        for task in inflight:
+            task.cancel()
+        if upload_id is not None:
+            await _run(lambda: client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id))
+        raise
+
+    _record_transfer("upload", key, size, time.monotonic() - started)
+    return StoredObject(url=_public_url(key), size=size, sha256=digest.hexdigest())
+
+
+async def _stream_local(
+    chunks: AsyncIterator[bytes],
+    key: str,
+    max_size: Optional[int],
+) -> StoredObject:
+    """로컬 저장: 파일 쓰기는 executor에서 수행하고 .part 파일에 쓴 뒤 이름을 바꾼다."""
+    save_path = settings.UPLOADS_DIR / key
+    part_path = save_path.with_name(save_path.name + ".part")
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fh = await _run(open, part_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise FileTooLargeError(f"파일 크기 제한({max_size} bytes) 초과")
+            digest.update(chunk)
+            await _run(fh.write, chunk)
+        await _run(fh.close)
+        await _run(os.replace, part_path, save_path)
+    except BaseException:
+        fh.close()
+        part_path.unlink(missing_ok=True)
+        raise
+
+    return StoredObject(url=str(save_path), size=size, sha256=digest.hexdigest())
+
+
+def _download_s3(key: str, dest: str) -> None:
+    _get_s3_client().download_file(settings.R2_BUCKET_NAME, key, dest, Config=_transfer_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client():
+    """외부 URL 다운로드용 공용 httpx.Client (연결 재사용, 스레드 안전)."""
     import httpx
-    with httpx.Client(timeout=60) as client:
-        response = client.get(url)
+
+    return httpx.Client(timeout=60, follow_redirects=True)
+
+
+def _download_http(url: str, dest: str) -> None:
+    with _get_http_client().stream("GET", url) as response:
         response.raise_for_status()
-    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-    tmp.write(response.content)
-    tmp.close()
-    return tmp.name
+        with open(dest, "wb") as fh:
+            for chunk in response.iter_bytes(1024 * 1024):
+                fh.write(chunk)
 
 
 async def _save_local(content: bytes, key: str) -> str:
-    """로컬 개발 환경용: uploads 디렉토리에 저장."""
+    """로컬 개발 환경용: uploads 디렉토리에 저장 (쓰기는 executor에서)."""
     save_path = settings.UPLOADS_DIR / key
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    save_path.write_bytes(content)
+    await _run(save_path.write_bytes, content)
     return str(save_path)
@@ -1,18 +1,28 @@
 """
 공용 FastAPI 의존성
 """
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.core.security import decode_token
-from app.models.user import User
+from app.models.user import CurrentUser, User
 
 bearer_scheme = HTTPBearer()
 
+# 인증 캐시 (프로세스 로컬): 검증된 access 토큰 payload, 사용자 스냅샷(CurrentUser).
+# 플랜 변경/비활성화 시 invalidate_user_cache()로 즉시 무효화하고,
+# 다른 인스턴스에서의 변경은 AUTH_CACHE_TTL_SECONDS 안에 반영된다.
+_token_cache = TTLCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
@@ -22,12 +32,40 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def _verify_access_token(token: str) -> Optional[dict]:
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access":
+        return None
+    exp = payload.get("exp")
+    if exp is not None:
+        # 토큰 만료 이후까지 캐시에 남지 않도록 TTL을 만료 시각으로 제한
+        _token_cache.set(token, payload, ttl_seconds=exp - time.time())
+    return payload
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """플랜 변경, 비활성화 등 사용자 정보가 바뀌면 호출한다."""
+    _user_cache.delete(user_id)
+
+
+def auth_cache_stats() -> dict:
+    return {"tokens": _token_cache.stats(), "users": _user_cache.stats()}
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> CurrentUser:
+    """현재 사용자의 읽기 전용 스냅샷. 캐시 적중 시 DB를 조회하지 않는다.
+
+    ORM 객체가 아니므로 수정하려면 db.get(User, current_user.id)로 다시 읽는다.
+    """
     token = credentials.credentials
-    payload = decode_token(token)
+    payload = _verify_access_token(token)
 
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -35,18 +73,24 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    if payload is None or payload.get("type") != "access":
+    if payload is None:
         raise credentials_exception
 
     user_id = payload.get("sub")
     if user_id is None:
         raise credentials_exception
+    user_id = int(user_id)
 
-    from sqlalchemy import select
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    current_user = _user_cache.get(user_id)
+    if current_user is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise credentials_exception
+        current_user = CurrentUser.from_user(user)
+        _user_cache.set(user_id, current_user)
 
-    if user is None or not user.is_active:
+    if not current_user.is_active:
         raise credentials_exception
 
-    return user
+    return current_user
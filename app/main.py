@@ -32,6 +32,16 @@ async def lifespan(app: FastAPI):
     await stop_scheduler()
     logger.info("스케줄러 종료")
 
+    from app.core.ig_executor import ig_executor
+    ig_executor.shutdown()
+
+    from app.core import media_processor, storage
+    storage.shutdown()
+    media_processor.shutdown()
+
+    from app.services.caption_providers import close_providers
+    await close_providers()
+
 
 app = FastAPI(
     title="AutoSNS API",
@@ -58,3 +68,38 @@ app.include_router(v1_router, prefix="/api/v1")
 @app.get("/health", tags=["health"])
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/ig", tags=["health"])
+async def ig_health():
+    """IG 전용 executor 대기열/워커 현황과 클라이언트 풀 현황 (운영자 용량 산정용)."""
+    from app.core.ig_executor import ig_executor
+    from app.services.client_pool import client_pool
+
+    return {"executor": ig_executor.stats(), "client_pool": client_pool.stats()}
+
+
+@app.get("/health/cache", tags=["health"])
+async def cache_health():
+    """프로세스 내 캐시 적중률 (캡션 캐시는 아낀 생성 시간 포함)."""
+    from app.deps import auth_cache_stats
+    from app.services.caption_service import caption_cache_stats
+
+    return {"auth": auth_cache_stats(), "caption": caption_cache_stats()}
+
+
+@app.get("/health/storage", tags=["health"])
+async def storage_health():
+    """저장소 업로드/다운로드 누적 처리량 (MB/s)과 로컬 미디어 캐시 현황."""
+    from app.core.media_cache import media_cache
+    from app.core.storage import transfer_stats
+
+    return {"transfers": transfer_stats(), "media_cache": media_cache.stats()}
+
+
+@app.get("/health/ai", tags=["health"])
+async def ai_health():
+    """캡션 provider 체인의 현재 순서와 provider별 지연(p95)/오류율."""
+    from app.services.caption_chain import provider_stats
+
+    return provider_stats()
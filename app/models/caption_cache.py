@@ -0,0 +1,24 @@
+"""
+CaptionCacheEntry 모델 - AI 캡션 생성 결과 영속 캐시 (CAPTION_CACHE_PERSIST=true일 때만 사용)
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class CaptionCacheEntry(Base):
+    __tablename__ = "caption_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # 정규화 요청 + provider + model 해시
+    provider: Mapped[str] = mapped_column(String(20), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)  # GenerateCaptionResponse JSON
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,26 @@
+"""
+MediaBlob 모델 - 내용(SHA-256) 기준으로 한 번만 저장되는 미디어 원본
+같은 바이트를 올린 MediaFile들은 하나의 blob을 참조하고, ref_count가 0이 되면 저장소에서 삭제한다.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class MediaBlob(Base):
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    storage_key: Mapped[str] = mapped_column(String(500), nullable=False)
+    url: Mapped[str] = mapped_column(String(500), nullable=False)  # R2 URL 또는 로컬 경로
+    mimetype: Mapped[str] = mapped_column(String(100), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # bytes
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
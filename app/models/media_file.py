@@ -2,8 +2,9 @@
 MediaFile 모델 - 업로드된 미디어 파일
 """
 from datetime import datetime, timezone
+from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -16,8 +17,21 @@ class MediaFile(Base):
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     filepath: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Instagram 규격 JPEG 사본 (이미지만, 포스팅 시 원본 대신 사용)
+    normalized_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     mimetype: Mapped[str] = mapped_column(String(100), nullable=False)
     size: Mapped[int] = mapped_column(Integer, nullable=False)  # bytes
+    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # 업로드 중 계산한 내용 해시
+    blob_sha256: Mapped[Optional[str]] = mapped_column(
+        String(64), ForeignKey("media_blobs.sha256"), nullable=True, index=True
+    )  # 공유 저장 객체 (blob 도입 이전 업로드는 None)
+    # 동영상 메타데이터 (업로드 시 moov에서 읽음, 회전 적용 후 크기). 이미지는 None
+    duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    height: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rotation: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    video_codec: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    audio_codec: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
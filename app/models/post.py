@@ -5,17 +5,28 @@ import json
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
 # status: pending | running | done | failed | cancelled
 # type: photo | carousel | video | reel
+# prestage_status: None(아직) | staged | failed  — 예약 시각 전 미디어 사전 다운로드 결과
 
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        # 스케줄러: status = 'pending' AND scheduled_at <= now
+        Index("ix_posts_status_scheduled_at", "status", "scheduled_at"),
+        # 스케줄러: status = 'running' AND lease_expires_at < now (리스 회수)
+        Index("ix_posts_status_lease_expires_at", "status", "lease_expires_at"),
+        # quota_service.get_monthly_usage: user_id = ? AND status = 'done' AND executed_at >= 월초
+        Index("ix_posts_user_status_executed_at", "user_id", "status", "executed_at"),
+        # post_service.list_posts: user_id = ? ORDER BY created_at DESC, id DESC (키셋)
+        Index("ix_posts_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -23,10 +34,15 @@ class Post(Base):
     post_type: Mapped[str] = mapped_column(String(20), nullable=False)  # photo|carousel|video|reel
     caption: Mapped[str] = mapped_column(Text, default="", nullable=False)
     _media_paths: Mapped[str] = mapped_column("media_paths", Text, default="[]", nullable=False)
-    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     scheduled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     executed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # 실행 리스: 실행 중인 인스턴스, 만료 시각, 마지막 하트비트
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    prestage_status: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
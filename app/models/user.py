@@ -1,6 +1,7 @@
 """
 User 모델
 """
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from sqlalchemy import Boolean, DateTime, Integer, String
@@ -43,3 +44,29 @@ class User(Base):
     @property
     def monthly_limit(self) -> int:
         return PLAN_LIMITS.get(self.plan, 10)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """인증된 요청의 사용자 (get_current_user 반환값).
+
+    세션에 붙지 않은 읽기 전용 스냅샷이라 인증 캐시에서 그대로 재사용한다.
+    최대 AUTH_CACHE_TTL_SECONDS만큼 오래됐을 수 있으므로, 수정하거나 최신 값이 필요하면
+    db.get(User, current_user.id)로 다시 읽는다.
+    """
+
+    id: int
+    email: str
+    plan: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id, email=user.email, plan=user.plan, is_active=user.is_active, created_at=user.created_at
+        )
+
+    @property
+    def monthly_limit(self) -> int:
+        return PLAN_LIMITS.get(self.plan, 10)
@@ -1,6 +1,9 @@
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_BATCH_CAPTIONS = 50
+MAX_CAPTION_VARIANTS = 5
 
 
 class GenerateCaptionRequest(BaseModel):
@@ -9,9 +12,27 @@ class GenerateCaptionRequest(BaseModel):
     hashtag_count: int = 10
     language: str = "ko"
     extra_context: Optional[str] = None
+    regenerate: bool = False  # True면 캐시를 무시하고 새로 생성 ("다시 만들기")
 
 
 class GenerateCaptionResponse(BaseModel):
     caption: str
     hashtags: List[str]
     full_text: str  # caption + hashtags 합본
+
+
+class BatchGenerateCaptionRequest(BaseModel):
+    items: List[GenerateCaptionRequest] = Field(..., min_length=1, max_length=MAX_BATCH_CAPTIONS)
+    variants: int = Field(1, ge=1, le=MAX_CAPTION_VARIANTS)  # 항목마다 생성할 후보 수
+
+
+class BatchCaptionResult(BaseModel):
+    index: int  # 요청 items 내 위치
+    variants: List[GenerateCaptionResponse] = []
+    error: Optional[str] = None
+
+
+class BatchGenerateCaptionResponse(BaseModel):
+    items: List[BatchCaptionResult]
+    succeeded: int
+    failed: int
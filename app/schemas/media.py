@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -9,5 +10,34 @@ class MediaFileResponse(BaseModel):
     mimetype: str
     size: int
     created_at: datetime
+    duration_seconds: Optional[float] = None  # 동영상만
+    width: Optional[int] = None
+    height: Optional[int] = None
 
     model_config = {"from_attributes": True}
+
+
+class PresignUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+    size: int  # bytes
+
+
+class PresignUploadResponse(BaseModel):
+    upload_token: str  # /uploads/complete에 그대로 전달
+    method: str = "PUT"
+    url: Optional[str] = None  # 단일 업로드 URL (multipart면 None)
+    headers: Dict[str, str] = {}
+    multipart: bool = False
+    part_size: Optional[int] = None
+    part_urls: List[str] = []  # 파트 번호 1부터 순서대로
+
+
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class CompleteUploadRequest(BaseModel):
+    upload_token: str
+    parts: List[UploadedPart] = []  # multipart일 때 각 파트 PUT 응답의 ETag
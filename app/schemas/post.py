@@ -1,7 +1,9 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_BATCH_POSTS = 500
 
 
 class CreatePostRequest(BaseModel):
@@ -23,12 +25,31 @@ class PostResponse(BaseModel):
     scheduled_at: Optional[datetime]
     executed_at: Optional[datetime]
     created_at: datetime
+    prestage_status: Optional[str] = None  # 예약 포스팅 미디어 사전 다운로드: staged | failed
 
     model_config = {"from_attributes": True}
 
 
+class BatchCreatePostRequest(BaseModel):
+    items: List[CreatePostRequest] = Field(..., min_length=1, max_length=MAX_BATCH_POSTS)
+
+
+class BatchPostResult(BaseModel):
+    index: int  # 요청 items 내 위치
+    post: Optional[PostResponse] = None
+    error: Optional[str] = None
+
+
+class BatchCreatePostResponse(BaseModel):
+    items: List[BatchPostResult]
+    created: int
+    failed: int
+
+
 class PostListResponse(BaseModel):
     items: List[PostResponse]
-    total: int
+    total: Optional[int]  # count=none이면 None
+    total_exact: bool = True  # count=estimate에서 상한에 걸리면 False
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 키셋 커서 (없으면 마지막 페이지)
@@ -1,9 +1,9 @@
 """
 Instagram 계정 연결/관리 서비스
-autosns.client.get_client()를 run_in_executor로 비동기 래핑
+autosns.client.get_client()를 IG 전용 executor로 비동기 래핑
 """
-import asyncio
 import sys
+from functools import partial
 from pathlib import Path
 
 from fastapi import HTTPException, status
@@ -11,9 +11,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.ig_executor import ig_executor
 from app.core.security import decrypt_password, encrypt_password
 from app.models.ig_account import IGAccount
 from app.schemas.ig_account import IGAccountResponse, LinkAccountRequest
+from app.services.client_pool import account_key, client_pool
 
 # autosns 패키지 경로 추가
 _AUTOSNS_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -26,16 +28,27 @@ async def link_account(db: AsyncSession, user_id: int, req: LinkAccountRequest)
     session_dir = settings.SESSIONS_DIR / str(user_id)
     session_dir.mkdir(parents=True, exist_ok=True)
 
-    # 로그인 검증 (동기 instagrapi를 executor에서 실행)
-    loop = asyncio.get_event_loop()
+    # 기존 계정 중복 확인
+    result = await db.execute(
+        select(IGAccount).where(
+            IGAccount.user_id == user_id,
+            IGAccount.username == req.username,
+        )
+    )
+    existing = result.scalar_one_or_none()
+    # 저장된 세션은 비밀번호를 확인하지 않으므로, 저장된 것과 다른 비밀번호는 실제 로그인으로 검증한다
+    verify_password = existing is None or not _same_password(existing, req.password)
+
+    # 로그인 검증 (동기 instagrapi를 IG 전용 executor에서 실행)
     try:
         from autosns.client import get_client
-        await loop.run_in_executor(
-            None,
-            get_client,
+        await ig_executor.run(
+            account_key(user_id, req.username),
+            partial(get_client, verify_password=verify_password),
             req.username,
             req.password,
             session_dir,
+            timeout=settings.IG_LOGIN_TIMEOUT_SECONDS,
         )
     except Exception as e:
         raise HTTPException(
@@ -43,19 +56,12 @@ async def link_account(db: AsyncSession, user_id: int, req: LinkAccountRequest)
             detail=f"Instagram 로그인 실패: {e}",
         )
 
-    # 기존 계정 중복 확인
-    result = await db.execute(
-        select(IGAccount).where(
-            IGAccount.user_id == user_id,
-            IGAccount.username == req.username,
-        )
-    )
-    existing = result.scalar_one_or_none()
     if existing:
         # 비밀번호 업데이트 (재연결)
         existing.encrypted_password = encrypt_password(req.password)
         existing.session_path = str(session_dir / f"{req.username}.json")
         await db.commit()
+        client_pool.invalidate(existing.id)
         await db.refresh(existing)
         return IGAccountResponse.model_validate(existing)
 
@@ -71,6 +77,13 @@ async def link_account(db: AsyncSession, user_id: int, req: LinkAccountRequest)
     return IGAccountResponse.model_validate(account)
 
 
+def _same_password(account: IGAccount, password: str) -> bool:
+    try:
+        return decrypt_password(account.encrypted_password) == password
+    except ValueError:
+        return False
+
+
 async def list_accounts(db: AsyncSession, user_id: int) -> list[IGAccountResponse]:
     result = await db.execute(
         select(IGAccount).where(IGAccount.user_id == user_id).order_by(IGAccount.id)
@@ -89,3 +102,4 @@ async def delete_account(db: AsyncSession, user_id: int, account_id: int) -> Non
 
     await db.delete(account)
     await db.commit()
+    client_pool.invalidate(account_id)
@@ -0,0 +1,243 @@
+"""
+캡션 provider 체인: 순서대로 시도하는 장애 조치(failover) + 선택적 헤징(hedging)
+- provider마다 AI_PROVIDER_TIMEOUT_SECONDS 시간 제한, 실패/시간 초과면 다음 provider
+- AI_HEDGE_ENABLED면 앞 provider가 자기 p95 지연 안에 답하지 않을 때 다음 provider를 동시에 시작,
+  먼저 도착한 유효 응답을 쓰고 나머지는 취소
+- 최근 지연/오류율로 체인 순서를 조정 (오류가 잦은 provider는 뒤로, 나머지는 p95가 짧은 순)
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.core.config import settings
+from app.services.caption_providers import CaptionProvider, get_provider
+
+logger = logging.getLogger(__name__)
+
+UNHEALTHY_ERROR_RATE = 0.5
+MIN_SAMPLES = 5  # 이보다 적게 호출된 provider는 오류율로 밀어내지 않는다
+
+
+class ProviderStats:
+    """최근 AI_PROVIDER_STATS_WINDOW회 호출의 성공 지연과 오류 여부."""
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.outcomes: deque[bool] = deque(maxlen=window)  # True = 오류
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedged_wins = 0
+
+    def record_success(self, seconds: float) -> None:
+        self.calls += 1
+        self.latencies.append(seconds)
+        self.outcomes.append(False)
+
+    def record_error(self, timeout: bool = False) -> None:
+        self.calls += 1
+        self.errors += 1
+        if timeout:
+            self.timeouts += 1
+        self.outcomes.append(True)
+
+    def p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def unhealthy(self) -> bool:
+        return len(self.outcomes) >= MIN_SAMPLES and self.error_rate() >= UNHEALTHY_ERROR_RATE
+
+    def snapshot(self) -> dict:
+        p95 = self.p95()
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "hedged_wins": self.hedged_wins,
+            "recent_error_rate": round(self.error_rate(), 4),
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+_stats: dict[str, ProviderStats] = {}
+
+
+def _stats_for(name: str) -> ProviderStats:
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = ProviderStats(settings.AI_PROVIDER_STATS_WINDOW)
+    return stats
+
+
+def chain_names() -> list[str]:
+    """설정 순서의 provider 이름 (AI_PROVIDER_CHAIN, 비어 있으면 AI_PROVIDER 하나)."""
+    names = [n.strip() for n in settings.AI_PROVIDER_CHAIN.split(",") if n.strip()]
+    return list(dict.fromkeys(names or [settings.AI_PROVIDER]))
+
+
+def chain_id() -> str:
+    """캐시 키용 체인 식별자 (어느 provider가 답하든 같은 체인 결과로 취급)."""
+    providers = [get_provider(name) for name in chain_names()]
+    return ",".join(f"{p.name}:{p.model}" for p in providers)
+
+
+def ordered_providers() -> list[CaptionProvider]:
+    """오류가 잦은 provider는 뒤로 보낸다. 나머지는 설정 순서를 유지하되,
+    지연 기록이 있는 provider끼리만 p95가 짧은 순으로 자리를 바꾼다 (기록이 없으면 제자리).
+    """
+    providers = [get_provider(name) for name in chain_names()]
+    providers = list({p.name: p for p in providers}.values())  # 알 수 없는 이름이 openai로 겹친 경우
+
+    healthy = [p for p in providers if not _stats_for(p.name).unhealthy()]
+    unhealthy = [p for p in providers if _stats_for(p.name).unhealthy()]
+
+    slots = [i for i, p in enumerate(healthy) if _stats_for(p.name).p95() is not None]
+    measured = sorted((healthy[i] for i in slots), key=lambda p: _stats_for(p.name).p95())
+    for i, provider in zip(slots, measured):
+        healthy[i] = provider
+    return healthy + unhealthy
+
+
+def _hedge_delay(provider: CaptionProvider) -> float:
+    p95 = _stats_for(provider.name).p95()
+    floor = settings.AI_HEDGE_MIN_DELAY_MS / 1000
+    return max(floor, p95) if p95 is not None else max(floor, settings.AI_PROVIDER_TIMEOUT_SECONDS / 2)
+
+
+async def _call(
+    provider: CaptionProvider,
+    system: str,
+    prompt: str,
+    variants: int,
+    validate: Callable[[dict], Any],
+) -> Any:
+    stats = _stats_for(provider.name)
+    started = time.monotonic()
+    try:
+        data = await asyncio.wait_for(
+            provider.complete(system, prompt, variants), settings.AI_PROVIDER_TIMEOUT_SECONDS
+        )
+        result = validate(data)
+    except asyncio.TimeoutError:
+        stats.record_error(timeout=True)
+        raise TimeoutError(f"{settings.AI_PROVIDER_TIMEOUT_SECONDS:g}초 안에 응답하지 않았습니다") from None
+    except asyncio.CancelledError:
+        raise  # 헤징에서 진 호출: 통계에 넣지 않는다
+    except Exception:
+        stats.record_error()
+        raise
+    stats.record_success(time.monotonic() - started)
+    return result
+
+
+async def complete(
+    system: str,
+    prompt: str,
+    variants: int,
+    validate: Callable[[dict], Any],
+) -> tuple[Any, CaptionProvider]:
+    """체인 순서대로 시도해 처음 성공한 (validate(응답), provider)를 반환한다.
+
+    validate가 예외를 던지면(잘못된 JSON 등) 그 응답은 실패로 보고 다음 provider로 넘어간다.
+
+    Raises:
+        ValueError: 모든 provider가 실패했을 때
+    """
+    remaining = ordered_providers()
+    pending: dict[asyncio.Task, CaptionProvider] = {}
+    errors: list[str] = []
+    last_launched: Optional[CaptionProvider] = None
+
+    def launch() -> None:
+        nonlocal last_launched
+        provider = remaining.pop(0)
+        task = asyncio.create_task(_call(provider, system, prompt, variants, validate))
+        pending[task] = provider
+        last_launched = provider
+
+    launch()
+    try:
+        while pending:
+            hedge = settings.AI_HEDGE_ENABLED and remaining
+            timeout = _hedge_delay(last_launched) if hedge else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                logger.info("캡션 헤징: %s 응답 지연, %s 동시 시작", last_launched.name, remaining[0].name)
+                launch()
+                continue
+            for task in done:
+                provider = pending.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.warning("캡션 provider %s 실패: %s", provider.name, e)
+                    errors.append(f"{provider.name}: {e}")
+                    continue
+                if pending:
+                    _stats_for(provider.name).hedged_wins += 1  # 동시에 달리던 호출을 이김
+                return result, provider
+            if not pending and remaining:
+                launch()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    raise ValueError("모든 AI provider 호출이 실패했습니다. " + "; ".join(errors))
+
+
+async def stream(system: str, prompt: str) -> AsyncIterator[tuple[CaptionProvider, str]]:
+    """체인 순서대로 스트리밍을 시도한다. 첫 조각이 오기 전에 실패하면 다음 provider로 넘어간다.
+
+    첫 조각 대기에는 provider 시간 제한을 적용하고, 이후 중간 실패는 그대로 전파한다.
+    """
+    errors: list[str] = []
+    for provider in ordered_providers():
+        stats = _stats_for(provider.name)
+        started = time.monotonic()
+        chunks = provider.stream(system, prompt).__aiter__()
+        try:
+            first = await asyncio.wait_for(chunks.__anext__(), settings.AI_PROVIDER_TIMEOUT_SECONDS)
+        except StopAsyncIteration:
+            stats.record_error()
+            errors.append(f"{provider.name}: 빈 응답")
+            continue
+        except asyncio.TimeoutError:
+            stats.record_error(timeout=True)
+            errors.append(f"{provider.name}: 시간 초과")
+            try:
+                await chunks.aclose()
+            except Exception:
+                pass
+            continue
+        except Exception as e:
+            stats.record_error()
+            errors.append(f"{provider.name}: {e}")
+            continue
+
+        yield provider, first
+        try:
+            async for chunk in chunks:
+                yield provider, chunk
+        except Exception:
+            stats.record_error()
+            raise
+        stats.record_success(time.monotonic() - started)
+        return
+
+    raise ValueError("모든 AI provider 호출이 실패했습니다. " + "; ".join(errors))
+
+
+def provider_stats() -> dict:
+    return {
+        "chain": [p.name for p in ordered_providers()],
+        "hedging": settings.AI_HEDGE_ENABLED,
+        "providers": {name: stats.snapshot() for name, stats in _stats.items()},
+    }
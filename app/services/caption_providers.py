@@ -0,0 +1,236 @@
+"""
+캡션 생성 AI provider 레지스트리
+SDK 클라이언트는 provider마다 프로세스에서 한 번만 만들어 HTTP 연결 풀을 재사용한다.
+"stub"은 네트워크 없이 결정적인 응답을 주는 로컬 provider (부하 테스트/벤치마크용, 지연 시간 설정 가능).
+"""
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, AsyncIterator, Optional
+
+from app.core.config import settings
+
+
+def parse_json(text: str) -> dict:
+    # JSON 블록 추출
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    return json.loads(text)
+
+
+class CaptionProvider:
+    """system/user 프롬프트로 JSON 응답(dict)을 돌려주는 provider 공통 인터페이스."""
+
+    name: str = ""
+    model: str = ""
+
+    def __init__(self) -> None:
+        self._client: Any = None
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        raise NotImplementedError
+
+    async def stream(self, system: str, prompt: str, variants: int = 1) -> AsyncIterator[str]:
+        """응답 텍스트 조각을 생성되는 대로 내보낸다. 이어 붙이면 JSON 응답 전체가 된다."""
+        yield json.dumps(await self.complete(system, prompt, variants), ensure_ascii=False)
+
+    async def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            await close()
+        self._client = None
+
+
+class OpenAIProvider(CaptionProvider):
+    name = "openai"
+    model = "gpt-4o-mini"
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            if not settings.OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._client
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        response = await self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.7,
+        )
+        return json.loads(response.choices[0].message.content)
+
+    async def stream(self, system: str, prompt: str, variants: int = 1) -> AsyncIterator[str]:
+        response = await self._get_client().chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.7,
+            stream=True,
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class AnthropicProvider(CaptionProvider):
+    name = "anthropic"
+    model = "claude-haiku-4-5-20251001"
+
+    def _get_client(self):
+        if self._client is None:
+            import anthropic
+
+            if not settings.ANTHROPIC_API_KEY:
+                raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
+            self._client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        return self._client
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        message = await self._get_client().messages.create(
+            model=self.model,
+            max_tokens=4096,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return parse_json(message.content[0].text)
+
+    async def stream(self, system: str, prompt: str, variants: int = 1) -> AsyncIterator[str]:
+        async with self._get_client().messages.stream(
+            model=self.model,
+            max_tokens=4096,
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+
+class GeminiProvider(CaptionProvider):
+    name = "gemini"
+    model = "gemini-1.5-flash"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._models: dict[str, Any] = {}  # system 프롬프트별 GenerativeModel
+
+    def _get_model(self, system: str):
+        gemini = self._models.get(system)
+        if gemini is None:
+            import google.generativeai as genai
+
+            if not settings.GEMINI_API_KEY:
+                raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
+            if self._client is None:
+                genai.configure(api_key=settings.GEMINI_API_KEY)
+                self._client = genai
+            gemini = self._models[system] = genai.GenerativeModel(
+                model_name=self.model,
+                system_instruction=system,
+            )
+        return gemini
+
+    def _generation_config(self):
+        return self._client.types.GenerationConfig(
+            response_mime_type="application/json",
+            temperature=0.7,
+        )
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        gemini = self._get_model(system)
+        response = await gemini.generate_content_async(prompt, generation_config=self._generation_config())
+        return json.loads(response.text)
+
+    async def stream(self, system: str, prompt: str, variants: int = 1) -> AsyncIterator[str]:
+        gemini = self._get_model(system)
+        response = await gemini.generate_content_async(
+            prompt, generation_config=self._generation_config(), stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def close(self) -> None:
+        self._models.clear()
+        self._client = None
+
+
+class StubProvider(CaptionProvider):
+    """같은 프롬프트에 항상 같은 응답. CAPTION_STUB_LATENCY_MS만큼 기다린 뒤 응답한다."""
+
+    name = "stub"
+    model = "stub-1"
+
+    STREAM_CHUNK_CHARS = 16
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        await asyncio.sleep(settings.CAPTION_STUB_LATENCY_MS / 1000)
+        return self._respond(prompt, variants)
+
+    async def stream(self, system: str, prompt: str, variants: int = 1) -> AsyncIterator[str]:
+        """전체 지연을 조각 수로 나눠 토큰 스트림처럼 흉내 낸다."""
+        text = json.dumps(self._respond(prompt, variants), ensure_ascii=False)
+        pieces = [text[i:i + self.STREAM_CHUNK_CHARS] for i in range(0, len(text), self.STREAM_CHUNK_CHARS)]
+        delay = settings.CAPTION_STUB_LATENCY_MS / 1000 / len(pieces)
+        for piece in pieces:
+            await asyncio.sleep(delay)
+            yield piece
+
+    def _respond(self, prompt: str, variants: int) -> dict:
+        topic_match = re.search(r"주제: (.*)", prompt)
+        count_match = re.search(r"해시태그 수: (\d+)", prompt)
+        topic = topic_match.group(1).strip() if topic_match else prompt[:30]
+        hashtag_count = int(count_match.group(1)) if count_match else 5
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+
+        items = [
+            {
+                "caption": f"{topic} #{i + 1} ({digest[:8]})",
+                "hashtags": [f"#{digest[j:j + 6]}" for j in range(i, i + hashtag_count)],
+            }
+            for i in range(variants)
+        ]
+        return items[0] if variants == 1 else {"variants": items}
+
+
+_PROVIDER_CLASSES: dict[str, type[CaptionProvider]] = {
+    cls.name: cls for cls in (OpenAIProvider, AnthropicProvider, GeminiProvider, StubProvider)
+}
+_providers: dict[str, CaptionProvider] = {}
+
+
+def register_provider(provider: CaptionProvider) -> None:
+    """provider 인스턴스를 등록(교체)한다."""
+    _providers[provider.name] = provider
+
+
+def get_provider(name: Optional[str] = None) -> CaptionProvider:
+    """이름(기본: settings.AI_PROVIDER)의 provider. 알 수 없는 이름은 openai."""
+    name = name or settings.AI_PROVIDER
+    if name not in _PROVIDER_CLASSES and name not in _providers:
+        name = "openai"
+    provider = _providers.get(name)
+    if provider is None:
+        provider = _providers[name] = _PROVIDER_CLASSES[name]()
+    return provider
+
+
+def provider_names() -> list[str]:
+    return sorted(set(_PROVIDER_CLASSES) | set(_providers))
+
+
+async def close_providers() -> None:
+    for provider in list(_providers.values()):
+        await provider.close()
@@ -1,9 +1,43 @@
 """
 AI 캡션 생성 서비스
-OpenAI 또는 Anthropic을 설정에 따라 선택
+AI_PROVIDER_CHAIN(없으면 AI_PROVIDER) 순서로 provider를 시도한다 (caption_chain: 장애 조치/헤징).
+같은 요청(정규화 후) + provider 체인 결과는 캐시한다: 메모리 LRU, 선택적으로 DB(caption_cache).
+여러 후보(variants)는 프롬프트 하나로 묶어 한 번의 호출로 생성한다.
 """
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.schemas.caption import GenerateCaptionRequest, GenerateCaptionResponse
+from app.schemas.caption import (
+    BatchCaptionResult,
+    BatchGenerateCaptionResponse,
+    GenerateCaptionRequest,
+    GenerateCaptionResponse,
+)
+from app.services import caption_chain
+from app.services.caption_providers import parse_json
+
+logger = logging.getLogger(__name__)
+
+_cache = TTLCache(settings.CAPTION_CACHE_SIZE, settings.CAPTION_CACHE_TTL_SECONDS)
+_cache_counters = {
+    "persistent_hits": 0,
+    "bypasses": 0,        # regenerate=True 요청
+    "generated": 0,       # 실제 AI 호출 수
+    "generate_seconds": 0.0,
+    "saved_seconds": 0.0,  # 캐시 적중으로 아낀 시간 (평균 생성 시간 기준 추정)
+}
+
+_variants_adapter = TypeAdapter(list[GenerateCaptionResponse])
 
 _SYSTEM_PROMPT = """당신은 Instagram 마케팅 전문가입니다.
 소상공인을 위한 효과적이고 매력적인 SNS 캡션을 작성해주세요.
@@ -13,6 +47,16 @@ _SYSTEM_PROMPT = """당신은 Instagram 마케팅 전문가입니다.
   "hashtags": ["#태그1", "#태그2", ...]
 }"""
 
+_VARIANTS_SYSTEM_PROMPT = """당신은 Instagram 마케팅 전문가입니다.
+소상공인을 위한 효과적이고 매력적인 SNS 캡션을 요청한 개수만큼, 서로 다른 표현과 구성으로 작성해주세요.
+반드시 JSON 형식으로 응답하세요:
+{
+  "variants": [
+    {"caption": "캡션 내용", "hashtags": ["#태그1", "#태그2", ...]},
+    ...
+  ]
+}"""
+
 
 def _build_user_prompt(req: GenerateCaptionRequest) -> str:
     extra = f"\n추가 컨텍스트: {req.extra_context}" if req.extra_context else ""
@@ -25,98 +69,224 @@ def _build_user_prompt(req: GenerateCaptionRequest) -> str:
     )
 
 
-async def generate_caption(req: GenerateCaptionRequest) -> GenerateCaptionResponse:
-    if settings.AI_PROVIDER == "anthropic":
-        return await _generate_anthropic(req)
-    if settings.AI_PROVIDER == "gemini":
-        return await _generate_gemini(req)
-    return await _generate_openai(req)
-
-
-async def _generate_openai(req: GenerateCaptionRequest) -> GenerateCaptionResponse:
-    import json
-
-    from openai import AsyncOpenAI
-
-    if not settings.OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-    response = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": _SYSTEM_PROMPT},
-            {"role": "user", "content": _build_user_prompt(req)},
-        ],
-        response_format={"type": "json_object"},
-        temperature=0.7,
+def _build_variants_prompt(req: GenerateCaptionRequest, variants: int) -> str:
+    return (
+        _build_user_prompt(req)
+        + f"\n서로 다른 캡션 후보 {variants}개를 variants 배열에 담아주세요."
     )
 
-    data = json.loads(response.choices[0].message.content)
-    caption = data.get("caption", "")
-    hashtags = data.get("hashtags", [])
 
-    full_text = _combine(caption, hashtags)
-    return GenerateCaptionResponse(caption=caption, hashtags=hashtags, full_text=full_text)
+async def generate_caption(req: GenerateCaptionRequest) -> GenerateCaptionResponse:
+    return (await _generate_cached(req, 1))[0]
 
 
-async def _generate_anthropic(req: GenerateCaptionRequest) -> GenerateCaptionResponse:
-    import json
+async def generate_caption_variants(req: GenerateCaptionRequest, variants: int) -> list[GenerateCaptionResponse]:
+    """같은 요청에 대한 캡션 후보 여러 개 (AI 호출 1회)."""
+    return await _generate_cached(req, variants)
 
-    import anthropic
 
-    if not settings.ANTHROPIC_API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
+async def stream_caption(req: GenerateCaptionRequest) -> AsyncIterator[tuple[str, dict]]:
+    """(event, data)를 차례로 내보낸다: provider 토큰마다 "token", 마지막에 파싱한 결과 "done".
 
-    client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-    message = await client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=1024,
-        system=_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": _build_user_prompt(req)}],
-    )
+    캐시 적중이면 곧바로 "done" 하나만 보낸다. 실패하면 "error"로 끝난다.
+    """
+    key = _cache_key(req, caption_chain.chain_id())
+
+    if req.regenerate:
+        _cache_counters["bypasses"] += 1
+    else:
+        cached = await _cache_lookup(key, 1)
+        if cached is not None:
+            yield "done", cached[0].model_dump()
+            return
+
+    started = time.monotonic()
+    parts: list[str] = []
+    provider = None
+    try:
+        async for provider, delta in caption_chain.stream(_SYSTEM_PROMPT, _build_user_prompt(req)):
+            parts.append(delta)
+            yield "token", {"text": delta}
+        responses = _to_responses(parse_json("".join(parts)), 1)
+    except Exception as e:
+        logger.warning("캡션 스트리밍 실패 (%s): %s", provider.name if provider else "-", e)
+        yield "error", {"detail": str(e) or type(e).__name__}
+        return
+    _cache_counters["generated"] += 1
+    _cache_counters["generate_seconds"] += time.monotonic() - started
 
-    text = message.content[0].text
-    # JSON 블록 추출
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0].strip()
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0].strip()
+    await _cache_store(key, provider.name, provider.model, responses)
+    yield "done", responses[0].model_dump()
 
-    data = json.loads(text)
-    caption = data.get("caption", "")
-    hashtags = data.get("hashtags", [])
 
-    full_text = _combine(caption, hashtags)
-    return GenerateCaptionResponse(caption=caption, hashtags=hashtags, full_text=full_text)
+async def generate_captions_batch(
+    items: list[GenerateCaptionRequest], variants: int = 1
+) -> BatchGenerateCaptionResponse:
+    """여러 요청을 CAPTION_BATCH_CONCURRENCY개씩 동시에 생성한다. 결과는 요청 순서, 실패는 항목별 오류."""
+    slots = asyncio.Semaphore(settings.CAPTION_BATCH_CONCURRENCY)
+
+    async def run(index: int, req: GenerateCaptionRequest) -> BatchCaptionResult:
+        async with slots:
+            try:
+                return BatchCaptionResult(index=index, variants=await _generate_cached(req, variants))
+            except Exception as e:
+                logger.warning("배치 캡션 %d 생성 실패: %s", index, e)
+                return BatchCaptionResult(index=index, error=str(e) or type(e).__name__)
+
+    results = await asyncio.gather(*(run(i, req) for i, req in enumerate(items)))
+    succeeded = sum(1 for r in results if r.error is None)
+    return BatchGenerateCaptionResponse(
+        items=list(results), succeeded=succeeded, failed=len(results) - succeeded
+    )
+
 
+async def _generate_cached(req: GenerateCaptionRequest, variants: int) -> list[GenerateCaptionResponse]:
+    key = _cache_key(req, caption_chain.chain_id(), variants)
 
-async def _generate_gemini(req: GenerateCaptionRequest) -> GenerateCaptionResponse:
-    import json
-    import google.generativeai as genai
+    if req.regenerate:
+        _cache_counters["bypasses"] += 1
+    else:
+        cached = await _cache_lookup(key, variants)
+        if cached is not None:
+            return cached
 
-    if not settings.GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
+    if variants == 1:
+        system, prompt = _SYSTEM_PROMPT, _build_user_prompt(req)
+    else:
+        system, prompt = _VARIANTS_SYSTEM_PROMPT, _build_variants_prompt(req, variants)
 
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    model = genai.GenerativeModel(
-        model_name="gemini-1.5-flash",
-        system_instruction=_SYSTEM_PROMPT,
+    started = time.monotonic()
+    responses, provider = await caption_chain.complete(
+        system, prompt, variants, validate=lambda data: _to_responses(data, variants)
     )
-    response = await model.generate_content_async(
-        _build_user_prompt(req),
-        generation_config=genai.types.GenerationConfig(
-            response_mime_type="application/json",
-            temperature=0.7,
-        ),
+    _cache_counters["generated"] += 1
+    _cache_counters["generate_seconds"] += time.monotonic() - started
+
+    await _cache_store(key, provider.name, provider.model, responses)
+    return responses
+
+
+def _to_responses(data: dict, variants: int) -> list[GenerateCaptionResponse]:
+    items = [data] if variants == 1 else data.get("variants") or []
+    if not items:
+        raise ValueError("AI 응답에 캡션이 없습니다.")
+    responses = []
+    for item in items[:variants]:
+        caption = item.get("caption", "")
+        hashtags = item.get("hashtags", [])
+        responses.append(
+            GenerateCaptionResponse(caption=caption, hashtags=hashtags, full_text=_combine(caption, hashtags))
+        )
+    return responses
+
+
+def _normalize(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _cache_key(req: GenerateCaptionRequest, chain: str, variants: int = 1) -> str:
+    """공백/대소문자 차이만 있는 요청은 같은 키가 되도록 정규화해 해시한다 (chain: provider:model 목록)."""
+    payload = {
+        "topic": _normalize(req.topic),
+        "tone": _normalize(req.tone),
+        "hashtag_count": req.hashtag_count,
+        "language": _normalize(req.language),
+        "extra_context": _normalize(req.extra_context) if req.extra_context else None,
+        "chain": chain,
+    }
+    if variants > 1:
+        payload["variants"] = variants
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+def _avg_generate_seconds() -> float:
+    generated = _cache_counters["generated"]
+    return _cache_counters["generate_seconds"] / generated if generated else 0.0
+
+
+async def _cache_lookup(key: str, variants: int) -> Optional[list[GenerateCaptionResponse]]:
+    cached = _cache.get(key)
+    if cached is None and settings.CAPTION_CACHE_PERSIST:
+        cached = await _persistent_lookup(key, variants)
+        if cached is not None:
+            _cache_counters["persistent_hits"] += 1
+    if cached is None:
+        return None
+    _cache_counters["saved_seconds"] += _avg_generate_seconds()
+    return [r.model_copy(deep=True) for r in cached]
+
+
+async def _persistent_lookup(key: str, variants: int) -> Optional[list[GenerateCaptionResponse]]:
+    from app.core.database import AsyncSessionLocal
+    from app.models.caption_cache import CaptionCacheEntry
+
+    now = datetime.now(timezone.utc)
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(CaptionCacheEntry.response, CaptionCacheEntry.expires_at).where(
+                    CaptionCacheEntry.key == key,
+                    CaptionCacheEntry.expires_at > now,
+                )
+            )
+            row = result.first()
+    except Exception as e:
+        logger.warning("캡션 영속 캐시 조회 실패: %s", e)
+        return None
+    if row is None:
+        return None
+    # 단일 캡션은 객체, 후보 여러 개는 배열로 저장돼 있다
+    if variants == 1:
+        responses = [GenerateCaptionResponse.model_validate_json(row.response)]
+    else:
+        responses = _variants_adapter.validate_json(row.response)
+    expires_at = row.expires_at if row.expires_at.tzinfo else row.expires_at.replace(tzinfo=timezone.utc)
+    _cache.set(key, responses, ttl_seconds=(expires_at - now).total_seconds())
+    return responses
+
+
+async def _cache_store(
+    key: str, provider: str, model: str, responses: list[GenerateCaptionResponse]
+) -> None:
+    _cache.set(key, [r.model_copy(deep=True) for r in responses])
+    if not settings.CAPTION_CACHE_PERSIST:
+        return
+
+    from app.core.database import AsyncSessionLocal, dialect_insert
+    from app.models.caption_cache import CaptionCacheEntry
+
+    now = datetime.now(timezone.utc)
+    payload = (
+        responses[0].model_dump_json()
+        if len(responses) == 1
+        else _variants_adapter.dump_json(responses).decode()
     )
+    values = {
+        "provider": provider,
+        "model": model,
+        "response": payload,
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=settings.CAPTION_CACHE_TTL_SECONDS),
+    }
+    try:
+        async with AsyncSessionLocal() as db:
+            stmt = dialect_insert(db, CaptionCacheEntry).values(key=key, **values)
+            await db.execute(stmt.on_conflict_do_update(index_elements=[CaptionCacheEntry.key], set_=values))
+            await db.execute(delete(CaptionCacheEntry).where(CaptionCacheEntry.expires_at <= now))
+            await db.commit()
+    except Exception as e:
+        logger.warning("캡션 영속 캐시 저장 실패: %s", e)
 
-    data = json.loads(response.text)
-    caption = data.get("caption", "")
-    hashtags = data.get("hashtags", [])
 
-    full_text = _combine(caption, hashtags)
-    return GenerateCaptionResponse(caption=caption, hashtags=hashtags, full_text=full_text)
+def caption_cache_stats() -> dict:
+    return {
+        "memory": _cache.stats(),
+        "persistent": settings.CAPTION_CACHE_PERSIST,
+        **_cache_counters,
+        "avg_generate_seconds": round(_avg_generate_seconds(), 3),
+        "saved_seconds": round(_cache_counters["saved_seconds"], 3),
+        "generate_seconds": round(_cache_counters["generate_seconds"], 3),
+    }
 
 
 def _combine(caption: str, hashtags: list[str]) -> str:
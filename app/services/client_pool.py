@@ -0,0 +1,153 @@
+"""
+로그인된 instagrapi Client 풀
+IGAccount.id 기준으로 Client를 재사용해 포스팅마다 반복되는 로그인 비용을 없앤다.
+- TTL이 지난 Client는 버리고 다시 로그인
+- 최대 개수를 넘으면 가장 오래 사용하지 않은 Client부터 축출 (LRU)
+- 같은 계정의 동시 요청은 진행 중인 로그인 하나를 공유
+"""
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.ig_executor import ig_executor
+from app.core.security import decrypt_password
+from app.models.ig_account import IGAccount
+
+_AUTOSNS_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(_AUTOSNS_ROOT) not in sys.path:
+    sys.path.insert(0, str(_AUTOSNS_ROOT))
+
+logger = logging.getLogger(__name__)
+
+
+def account_key(user_id: int, username: str) -> tuple[int, str]:
+    """IG 작업 직렬화 키. 세션 파일(SESSIONS_DIR/<user_id>/<username>.json)과 1:1."""
+    return (user_id, username)
+
+
+@dataclass
+class _PoolEntry:
+    client: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ClientPool:
+    """계정별 로그인된 Client 캐시 (이벤트 루프 단일 스레드에서만 접근)."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, _PoolEntry]" = OrderedDict()
+        self._inflight: dict[int, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _is_expired(self, entry: _PoolEntry, now: float) -> bool:
+        return now - entry.created_at >= self.ttl_seconds
+
+    async def acquire(self, account: IGAccount) -> Any:
+        """계정의 로그인된 Client를 반환한다. 없거나 만료됐으면 로그인한다."""
+        account_id = account.id
+        now = time.monotonic()
+
+        entry = self._entries.get(account_id)
+        if entry is not None:
+            if not self._is_expired(entry, now):
+                entry.last_used = now
+                self._entries.move_to_end(account_id)
+                self.hits += 1
+                return entry.client
+            self._entries.pop(account_id, None)
+
+        self.misses += 1
+        future = self._inflight.get(account_id)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._login(
+                    account_id,
+                    account.username,
+                    account.encrypted_password,
+                    account.user_id,
+                )
+            )
+            self._inflight[account_id] = future
+            future.add_done_callback(lambda _f: self._inflight.pop(account_id, None))
+        # 한 호출자가 취소돼도 다른 대기자를 위해 로그인은 계속 진행
+        return await asyncio.shield(future)
+
+    async def warm(self, account: IGAccount) -> None:
+        """예약 포스팅 전에 미리 로그인해 둔다. 실패는 로그만 남긴다."""
+        try:
+            await self.acquire(account)
+        except Exception as e:
+            logger.warning("계정 %d 클라이언트 사전 로그인 실패: %s", account.id, e)
+
+    def invalidate(self, account_id: int) -> None:
+        """세션 만료, 비밀번호 변경, 계정 삭제 시 풀에서 제거한다."""
+        if self._entries.pop(account_id, None) is not None:
+            logger.info("계정 %d 클라이언트를 풀에서 제거", account_id)
+
+    async def refresh(self, account: IGAccount) -> Any:
+        """업로드 중 LoginRequired가 나면 호출: 세션을 stale로 표시하고 다시 로그인한다."""
+        from autosns.client import mark_session_stale
+
+        self.invalidate(account.id)
+        mark_session_stale(account.username, settings.SESSIONS_DIR / str(account.user_id))
+        return await self.acquire(account)
+
+    def prune(self) -> None:
+        """TTL이 지난 항목을 정리한다."""
+        now = time.monotonic()
+        for account_id in [k for k, e in self._entries.items() if self._is_expired(e, now)]:
+            self._entries.pop(account_id, None)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "inflight_logins": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def _login(self, account_id: int, username: str, encrypted_password: str, user_id: int) -> Any:
+        from autosns.client import get_client
+
+        password = decrypt_password(encrypted_password)
+        session_dir = settings.SESSIONS_DIR / str(user_id)
+        session_dir.mkdir(parents=True, exist_ok=True)
+
+        started = time.monotonic()
+        cl = await ig_executor.run(
+            account_key(user_id, username),
+            get_client,
+            username,
+            password,
+            session_dir,
+            timeout=settings.IG_LOGIN_TIMEOUT_SECONDS,
+        )
+        logger.info("계정 %d 로그인 완료 (%.1fs)", account_id, time.monotonic() - started)
+
+        self._entries[account_id] = _PoolEntry(client=cl)
+        self._entries.move_to_end(account_id)
+        while len(self._entries) > self.max_size:
+            evicted_id, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug("LRU 축출: 계정 %d", evicted_id)
+        return cl
+
+
+client_pool = ClientPool(
+    max_size=settings.IG_CLIENT_POOL_MAX_SIZE,
+    ttl_seconds=settings.IG_CLIENT_POOL_TTL_SECONDS,
+)
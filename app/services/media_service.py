@@ -1,27 +1,68 @@
 """
 미디어 파일 업로드 서비스 — Cloudflare R2 저장
+요청 본문을 청크 단위로 저장소에 스트리밍하므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+같은 내용의 파일은 SHA-256 기준으로 한 번만 저장한다 (MediaBlob + ref_count).
+이미지는 Instagram 규격 JPEG(blobs/<sha256>.ig.jpg)로 정규화한 사본을 함께 저장하고 포스팅에는 사본을 쓴다.
+동영상은 MP4/MOV 메타데이터(moov)만 읽어 길이/크기/코덱을 기록하고 지원하지 않는 파일은 거절한다.
 """
+import asyncio
+import json
+import os
 import sys
+import tempfile
 import uuid
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import AsyncIterator, Awaitable, Optional
 
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.storage import upload_file
+from app.core.database import dialect_insert
+from app.core.security import create_upload_token, decode_token
+from app.core.media_cache import media_cache
+from app.core.media_processor import normalize_image
+from app.core.storage import (
+    MIN_PART_SIZE,
+    FileTooLargeError,
+    StoredObject,
+    complete_multipart,
+    delete_object,
+    head_object,
+    inspect_object,
+    is_direct_upload_supported,
+    key_from_location,
+    location_for_key,
+    presign_multipart,
+    presign_put,
+    promote_object,
+    upload_file,
+    upload_stream,
+)
+from app.models.media_blob import MediaBlob
 from app.models.media_file import MediaFile
-from app.schemas.media import MediaFileResponse
+from app.models.post import Post
+from app.schemas.media import (
+    CompleteUploadRequest,
+    MediaFileResponse,
+    PresignUploadRequest,
+    PresignUploadResponse,
+)
 
 _AUTOSNS_ROOT = Path(__file__).resolve().parent.parent.parent
 if str(_AUTOSNS_ROOT) not in sys.path:
     sys.path.insert(0, str(_AUTOSNS_ROOT))
 
+from autosns.media_probe import VideoInfo, check_supported, probe_file, probe_video  # noqa: E402
+
 ALLOWED_MIMETYPES = {
     "image/jpeg", "image/png", "image/webp",
     "video/mp4", "video/quicktime",
 }
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
 
 MIME_TO_EXT = {
     "image/jpeg": ".jpg",
@@ -32,36 +73,406 @@ MIME_TO_EXT = {
 }
 
 
+async def _iter_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def _tee(chunks: AsyncIterator[bytes], fh) -> AsyncIterator[bytes]:
+    """저장소로 보내는 청크를 로컬 파일에도 기록한다 (정규화 입력용)."""
+    loop = asyncio.get_running_loop()
+    async for chunk in chunks:
+        await loop.run_in_executor(None, fh.write, chunk)
+        yield chunk
+
+
+# multipart 경계/헤더 등 파일 외 본문 여유분
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def check_declared_size(content_length: Optional[str]) -> None:
+    """업로드 요청의 Content-Length가 한도를 넘으면 본문을 받기 전에 413.
+
+    chunked 전송처럼 길이를 선언하지 않은 요청은 save_upload의 누적 크기 검사에 맡긴다.
+    """
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD_BYTES:
+        raise _too_large()
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail="파일 크기는 100MB를 초과할 수 없습니다.",
+    )
+
+
 async def save_upload(db: AsyncSession, user_id: int, file: UploadFile) -> MediaFileResponse:
-    """업로드 파일을 R2에 저장하고 DB에 기록한다."""
+    """업로드 파일을 R2에 저장하고 DB에 기록한다.
+
+    내용(SHA-256)이 같은 파일은 blobs/<sha256><ext> 하나만 저장하고 MediaFile이 이를 공유한다.
+    """
     if file.content_type not in ALLOWED_MIMETYPES:
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
             detail=f"지원하지 않는 파일 형식: {file.content_type}",
         )
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="파일 크기는 100MB를 초과할 수 없습니다.",
-        )
+    # 선언된 Content-Length는 라우트에서 본문 파싱 전에 이미 확인했다.
+    # 여기서는 스풀링된 파일 크기로 저장소 전송 전에 거절한다
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise _too_large()
 
     suffix = MIME_TO_EXT.get(file.content_type, Path(file.filename or "").suffix.lower() or ".bin")
-    unique_name = f"{uuid.uuid4().hex}{suffix}"
-    r2_key = f"{user_id}/{unique_name}"
+    tmp_key = f"tmp/{user_id}/{uuid.uuid4().hex}{suffix}"
+
+    # 이미지 정규화/동영상 메타데이터 확인에 쓸 로컬 사본을 스트리밍하면서 함께 만든다
+    is_video = file.content_type.startswith("video/")
+    source = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        chunks = _tee(_iter_chunks(file), source)
+
+        # 해시는 다 받아야 알 수 있으므로 임시 키로 스트리밍 업로드 (미설정 시 로컬 저장)
+        try:
+            stored = await upload_stream(chunks, tmp_key, file.content_type, max_size=MAX_FILE_SIZE)
+        except FileTooLargeError:
+            raise _too_large()
 
-    # R2 업로드 (미설정 시 로컬 저장)
-    file_url = await upload_file(content, r2_key, file.content_type)
+        source.close()
+        normalized_path: Optional[str] = None
+        video: dict = {}
+        if is_video:
+            loop = asyncio.get_running_loop()
+            info = await _probe_video(tmp_key, loop.run_in_executor(None, probe_file, source.name))
+            video = _video_fields(info)
+        else:
+            normalized_path = await _normalized_location(db, stored, tmp_key, source.name)
+
+        blob = await _attach_blob(db, stored, tmp_key, suffix, file.content_type)
+    finally:
+        source.close()
+        Path(source.name).unlink(missing_ok=True)
 
     media = MediaFile(
         user_id=user_id,
-        filename=file.filename or unique_name,
-        filepath=file_url,  # R2 URL 또는 로컬 경로
+        filename=file.filename or Path(blob.storage_key).name,
+        filepath=blob.url,  # R2 URL 또는 로컬 경로 (같은 내용이면 공유)
+        normalized_path=normalized_path,
         mimetype=file.content_type,
-        size=len(content),
+        size=stored.size,
+        sha256=stored.sha256,
+        blob_sha256=blob.sha256,
+        **video,
     )
     db.add(media)
     await db.commit()
     await db.refresh(media)
     return MediaFileResponse.model_validate(media)
+
+
+async def _probe_video(key: str, probe: Awaitable[VideoInfo]) -> VideoInfo:
+    """영상 메타데이터를 읽고 지원 여부를 확인한다. 실패하면 저장된 객체를 지우고 400."""
+    try:
+        info = await probe
+        check_supported(info)
+    except ValueError as e:
+        await delete_object(key)
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 동영상입니다: {e}")
+    except BaseException:
+        await delete_object(key)  # 예상 못 한 오류여도 임시 객체는 남기지 않는다
+        raise
+    return info
+
+
+def _video_fields(info: VideoInfo) -> dict:
+    return {
+        "duration_seconds": info.duration,
+        "width": info.display_width,
+        "height": info.display_height,
+        "rotation": info.rotation,
+        "video_codec": info.video_codec,
+        "audio_codec": info.audio_codec,
+    }
+
+
+def _normalized_key(sha256: str) -> str:
+    return f"blobs/{sha256}.ig.jpg"
+
+
+async def _normalized_location(
+    db: AsyncSession, stored: StoredObject, tmp_key: str, source_path: str
+) -> str:
+    """Instagram 업로드용 JPEG 사본을 저장하고 위치를 반환한다. 같은 내용은 기존 사본을 재사용."""
+    result = await db.execute(
+        select(MediaFile.normalized_path)
+        .where(MediaFile.blob_sha256 == stored.sha256, MediaFile.normalized_path.isnot(None))
+        .limit(1)
+    )
+    existing = result.scalar_one_or_none()
+    if existing is not None:
+        return existing
+
+    out_path = source_path + ".ig.jpg"
+    try:
+        try:
+            await normalize_image(source_path, out_path)
+        except ValueError:
+            await delete_object(tmp_key)
+            raise HTTPException(status_code=400, detail="이미지 파일을 읽을 수 없습니다.")
+        content = Path(out_path).read_bytes()  # 정규화 결과는 수 MB 이하
+        return await upload_file(content, _normalized_key(stored.sha256), "image/jpeg")
+    finally:
+        if os.path.exists(out_path):
+            os.unlink(out_path)
+
+
+async def presign_upload(user_id: int, req: PresignUploadRequest) -> PresignUploadResponse:
+    """클라이언트가 API 서버를 거치지 않고 저장소에 직접 올릴 수 있는 업로드 대상을 발급한다.
+
+    R2: presigned PUT URL (STORAGE_PART_SIZE보다 크면 파트별 URL로 멀티파트).
+    로컬: 같은 형태의 PUT 대상으로 /uploads/direct/{token} 을 돌려준다.
+    """
+    _validate_declared(req.content_type, req.size)
+
+    suffix = MIME_TO_EXT.get(req.content_type, Path(req.filename).suffix.lower() or ".bin")
+    key = f"direct/{user_id}/{uuid.uuid4().hex}{suffix}"
+    expires = settings.DIRECT_UPLOAD_EXPIRE_SECONDS
+
+    if not is_direct_upload_supported():
+        token = create_upload_token(user_id, key, req.content_type, req.size)
+        return PresignUploadResponse(
+            upload_token=token,
+            url=f"/api/v1/uploads/direct/{token}",
+            headers={"Content-Type": req.content_type},
+        )
+
+    part_size = max(settings.STORAGE_PART_SIZE, MIN_PART_SIZE)
+    if req.size <= part_size:
+        url = await presign_put(key, req.content_type, expires)
+        return PresignUploadResponse(
+            upload_token=create_upload_token(user_id, key, req.content_type, req.size),
+            url=url,
+            headers={"Content-Type": req.content_type},
+        )
+
+    upload_id, part_urls = await presign_multipart(key, req.content_type, req.size, part_size, expires)
+    return PresignUploadResponse(
+        upload_token=create_upload_token(user_id, key, req.content_type, req.size, upload_id),
+        multipart=True,
+        part_size=part_size,
+        part_urls=part_urls,
+    )
+
+
+async def receive_direct_upload(token: str, chunks: AsyncIterator[bytes]) -> None:
+    """로컬 모드의 직접 업로드 대상: 요청 본문을 토큰에 적힌 키로 스트리밍 저장한다.
+
+    토큰은 한 번만 쓸 수 있다: 이미 올렸거나 완료 처리된 업로드는 덮어쓰지 않는다(409).
+    """
+    claims = _decode_upload_token(token)
+    key = claims["key"]
+    if await head_object(key) is not None or await head_object(_completed_key(key)) is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 업로드된 파일입니다.")
+    try:
+        await upload_stream(chunks, claims["key"], claims["ct"], max_size=claims["size"])
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="선언한 파일 크기를 초과했습니다.",
+        )
+
+
+async def complete_upload(db: AsyncSession, user_id: int, req: CompleteUploadRequest) -> MediaFileResponse:
+    """직접 업로드 완료: 저장된 객체의 크기/형식을 확인하고 MediaFile을 기록한다.
+
+    확인을 마친 객체는 업로드 URL이 가리키지 않는 키로 옮기므로,
+    완료 후 같은 presigned URL로 다시 올려도 확인된 내용이 바뀌지 않는다.
+    """
+    claims = _decode_upload_token(req.upload_token)
+    if int(claims["sub"]) != user_id:
+        raise HTTPException(status_code=403, detail="다른 사용자의 업로드 토큰입니다.")
+    key = claims["key"]
+    final_key = _completed_key(key)
+    location = location_for_key(final_key)
+
+    # 재시도로 두 번 완료해도 같은 파일 하나만 기록
+    result = await db.execute(
+        select(MediaFile).where(MediaFile.user_id == user_id, MediaFile.filepath == location)
+    )
+    existing = result.scalar_one_or_none()
+    if existing:
+        return MediaFileResponse.model_validate(existing)
+
+    if claims.get("uid"):
+        if not req.parts:
+            raise HTTPException(status_code=400, detail="멀티파트 업로드의 parts가 필요합니다.")
+        await complete_multipart(
+            key,
+            claims["uid"],
+            [{"PartNumber": p.part_number, "ETag": p.etag} for p in req.parts],
+        )
+
+    head = await head_object(key)
+    if head is None:
+        raise HTTPException(status_code=400, detail="업로드된 파일을 찾을 수 없습니다.")
+    size, content_type = head
+    if size != claims["size"] or (content_type is not None and content_type != claims["ct"]):
+        await delete_object(key)
+        raise HTTPException(status_code=400, detail="업로드된 파일의 크기 또는 형식이 요청과 다릅니다.")
+
+    # Content-Type 헤더는 클라이언트(또는 멀티파트 생성 시 서버)가 정한 값이므로 실제 내용으로 확인
+    magic = await inspect_object(key, lambda fh: fh.read(SNIFF_BYTES))
+    if not _content_matches(magic, claims["ct"]):
+        await delete_object(key)
+        raise HTTPException(status_code=400, detail="업로드된 파일의 내용이 선언한 형식과 다릅니다.")
+
+    video: dict = {}
+    if claims["ct"].startswith("video/"):
+        # moov만 range로 읽으므로 큰 동영상도 전체를 내려받지 않는다
+        video = _video_fields(await _probe_video(key, inspect_object(key, probe_video)))
+
+    location = await promote_object(key, final_key)
+    media = MediaFile(
+        user_id=user_id,
+        filename=Path(final_key).name,
+        filepath=location,
+        mimetype=claims["ct"],
+        size=size,
+        **video,
+    )
+    db.add(media)
+    await db.commit()
+    await db.refresh(media)
+    return MediaFileResponse.model_validate(media)
+
+
+def _completed_key(key: str) -> str:
+    """직접 업로드 키(direct/...)를 완료 후 보관 키(media/...)로."""
+    return "media/" + key.removeprefix("direct/")
+
+
+SNIFF_BYTES = 16
+# ftyp 없이 시작하는 오래된 QuickTime 파일의 첫 atom
+_ISO_BMFF_BOXES = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip"}
+
+
+def _content_matches(head: bytes, content_type: str) -> bool:
+    """파일 앞부분의 시그니처가 선언한 형식과 맞는지 확인한다."""
+    if content_type == "image/jpeg":
+        return head.startswith(b"\xff\xd8\xff")
+    if content_type == "image/png":
+        return head.startswith(b"\x89PNG\r\n\x1a\n")
+    if content_type == "image/webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    if content_type in ("video/mp4", "video/quicktime"):
+        # MP4/MOV는 같은 컨테이너 계열: 세부 검사는 probe_video가 한다
+        return head[4:8] in _ISO_BMFF_BOXES
+    return False
+
+
+def _validate_declared(content_type: str, size: int) -> None:
+    if content_type not in ALLOWED_MIMETYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"지원하지 않는 파일 형식: {content_type}",
+        )
+    if size <= 0:
+        raise HTTPException(status_code=400, detail="파일 크기가 올바르지 않습니다.")
+    if size > MAX_FILE_SIZE:
+        raise _too_large()
+
+
+def _decode_upload_token(token: str) -> dict:
+    claims = decode_token(token)
+    if claims is None or claims.get("type") != "upload":
+        raise HTTPException(status_code=401, detail="유효하지 않은 업로드 토큰입니다.")
+    return claims
+
+
+async def _attach_blob(
+    db: AsyncSession, stored: StoredObject, tmp_key: str, suffix: str, mimetype: str
+) -> MediaBlob:
+    """임시 객체를 내용 주소 blob으로 만들고 참조 수를 1 늘린다 (커밋은 호출자가)."""
+    blob_key = f"blobs/{stored.sha256}{suffix}"
+    existing = await db.get(MediaBlob, stored.sha256)
+    if existing is not None:
+        # 이미 같은 내용이 저장돼 있으면 방금 올린 임시 객체는 버린다
+        await delete_object(tmp_key)
+        url = existing.url
+    else:
+        url = await promote_object(tmp_key, blob_key)
+
+    # 동시에 같은 내용이 올라와도 행은 하나, ref_count는 정확히 증가
+    stmt = dialect_insert(db, MediaBlob).values(
+        sha256=stored.sha256,
+        storage_key=blob_key,
+        url=url,
+        mimetype=mimetype,
+        size=stored.size,
+        ref_count=1,
+        created_at=datetime.now(timezone.utc),
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[MediaBlob.sha256],
+            set_={"ref_count": MediaBlob.ref_count + 1},
+        )
+    )
+    result = await db.execute(
+        select(MediaBlob).where(MediaBlob.sha256 == stored.sha256).execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def delete_media(db: AsyncSession, user_id: int, media_id: int) -> None:
+    """MediaFile을 삭제하고, 마지막 참조였으면 blob과 저장소 객체도 삭제한다."""
+    result = await db.execute(
+        select(MediaFile).where(MediaFile.id == media_id, MediaFile.user_id == user_id)
+    )
+    media = result.scalar_one_or_none()
+    if not media:
+        raise HTTPException(status_code=404, detail="미디어 파일을 찾을 수 없습니다.")
+
+    blob = await db.get(MediaBlob, media.blob_sha256) if media.blob_sha256 else None
+    last_reference = blob is None or blob.ref_count <= 1
+    if last_reference and await _used_by_pending_post(db, media.filepath, media.normalized_path):
+        raise HTTPException(status_code=409, detail="예약된 포스팅에서 사용 중인 파일입니다.")
+
+    await db.delete(media)
+    storage_keys: list[str] = []
+    if blob is None:
+        # blob 도입 이전 업로드: 파일마다 고유 키
+        storage_keys.append(key_from_location(media.filepath))
+    else:
+        await db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == blob.sha256)
+            .values(ref_count=MediaBlob.ref_count - 1)
+        )
+        deleted = await db.execute(
+            delete(MediaBlob).where(MediaBlob.sha256 == blob.sha256, MediaBlob.ref_count <= 0)
+        )
+        if deleted.rowcount:
+            storage_keys.append(blob.storage_key)
+            if media.normalized_path:
+                storage_keys.append(_normalized_key(blob.sha256))
+    await db.commit()
+
+    for storage_key in storage_keys:
+        if storage_key:
+            await delete_object(storage_key)
+            media_cache.invalidate(storage_key)
+
+
+async def _used_by_pending_post(db: AsyncSession, filepath: str, normalized_path: Optional[str]) -> bool:
+    used = Post._media_paths.contains(json.dumps(filepath))
+    if normalized_path:
+        used = or_(used, Post._media_paths.contains(json.dumps(normalized_path)))
+    result = await db.execute(
+        select(Post.id)
+        .where(
+            Post.status.in_(("pending", "running")),
+            used,
+        )
+        .limit(1)
+    )
+    return result.first() is not None
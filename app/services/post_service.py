@@ -2,30 +2,55 @@
 포스팅 서비스 - autosns.uploader 비동기 래핑 (핵심 통합)
 """
 import asyncio
+import base64
+import json
+import logging
+import os
+import socket
 import sys
-from datetime import datetime, timezone
+import uuid
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import decrypt_password
+from app.core.database import AsyncSessionLocal
+from app.core.ig_executor import ig_executor
+from app.core.media_cache import media_cache
 from app.models.ig_account import IGAccount
 from app.models.media_file import MediaFile
 from app.models.post import Post
-from app.models.user import User
-from app.schemas.post import CreatePostRequest, PostListResponse, PostResponse
-from app.services.quota_service import check_quota
+from app.models.user import CurrentUser
+from app.schemas.post import (
+    BatchCreatePostResponse,
+    BatchPostResult,
+    CreatePostRequest,
+    PostListResponse,
+    PostResponse,
+)
+from app.services.client_pool import account_key, client_pool
+from app.services.quota_service import check_quota, increment_usage
+from app.tasks.scheduler import schedule_post, unschedule_post
 
 _AUTOSNS_ROOT = Path(__file__).resolve().parent.parent.parent
 if str(_AUTOSNS_ROOT) not in sys.path:
     sys.path.insert(0, str(_AUTOSNS_ROOT))
 
+from autosns.media_probe import VideoInfo, check_for_post  # noqa: E402
 
-async def create_post(db: AsyncSession, user: User, req: CreatePostRequest) -> PostResponse:
+logger = logging.getLogger(__name__)
+
+VIDEO_POST_TYPES = ("video", "reel")
+
+# 이 프로세스의 리스 소유자 식별자 (인스턴스/워커 간 구분)
+LEASE_OWNER = settings.INSTANCE_ID or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+async def create_post(db: AsyncSession, user: CurrentUser, req: CreatePostRequest) -> PostResponse:
     """포스팅 생성 - 즉시 실행 또는 예약."""
     # 할당량 체크
     await check_quota(db, user)
@@ -41,16 +66,20 @@ async def create_post(db: AsyncSession, user: User, req: CreatePostRequest) -> P
     if not account:
         raise HTTPException(status_code=404, detail="Instagram 계정을 찾을 수 없습니다.")
 
-    # 미디어 파일 확인 및 경로 수집
+    # 미디어 파일 확인 및 경로 수집 (IN 쿼리 1회)
+    media_by_id = await _load_media_paths(db, user.id, req.media_file_ids)
     media_paths: list[str] = []
     for file_id in req.media_file_ids:
-        mf_result = await db.execute(
-            select(MediaFile).where(MediaFile.id == file_id, MediaFile.user_id == user.id)
-        )
-        mf = mf_result.scalar_one_or_none()
-        if not mf:
+        if file_id not in media_by_id:
             raise HTTPException(status_code=404, detail=f"미디어 파일 {file_id}를 찾을 수 없습니다.")
-        media_paths.append(mf.filepath)
+        media_paths.append(media_by_id[file_id])
+
+    # 동영상/릴스 길이·비율·코덱 확인 (실행 시점이 아니라 지금 거절)
+    if req.post_type in VIDEO_POST_TYPES:
+        videos = await _load_video_info(db, user.id, req.media_file_ids)
+        error = _check_video_post(req.post_type, req.media_file_ids, videos)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
 
     # Post 생성
     post = Post(
@@ -67,17 +96,201 @@ async def create_post(db: AsyncSession, user: User, req: CreatePostRequest) -> P
     await db.refresh(post)
 
     # 즉시 실행 (scheduled_at 없음)
-    if req.scheduled_at is None:
+    if req.scheduled_at is not None:
+        schedule_post(post.id, post.account_id, post.scheduled_at)
+    else:
         await execute_post(db, post.id)
         await db.refresh(post)
 
     return PostResponse.model_validate(post)
 
 
+async def create_posts_batch(
+    db: AsyncSession, user: CurrentUser, items: list[CreatePostRequest]
+) -> BatchCreatePostResponse:
+    """여러 포스팅을 한 트랜잭션으로 생성한다.
+
+    소유권 확인은 테이블당 IN 쿼리 1회, 할당량 체크는 배치 전체에 1회만 수행한다.
+    검증에 실패한 항목은 건너뛰고 항목별 오류로 돌려준다.
+    scheduled_at이 없는 항목은 요청을 붙잡지 않도록 지금 시각으로 예약해 디스패처가 실행한다.
+    """
+    await check_quota(db, user)
+
+    account_ids = {item.account_id for item in items}
+    acc_result = await db.execute(
+        select(IGAccount.id).where(IGAccount.user_id == user.id, IGAccount.id.in_(account_ids))
+    )
+    owned_accounts = set(acc_result.scalars().all())
+
+    media_by_id = await _load_media_paths(
+        db, user.id, {fid for item in items for fid in item.media_file_ids}
+    )
+    videos = await _load_video_info(
+        db,
+        user.id,
+        {fid for item in items if item.post_type in VIDEO_POST_TYPES for fid in item.media_file_ids},
+    )
+
+    now = datetime.now(timezone.utc)
+    results: list[BatchPostResult] = []
+    created: list[tuple[int, Post]] = []
+    for index, item in enumerate(items):
+        if item.account_id not in owned_accounts:
+            results.append(BatchPostResult(index=index, error="Instagram 계정을 찾을 수 없습니다."))
+            continue
+        missing = [fid for fid in item.media_file_ids if fid not in media_by_id]
+        if missing:
+            results.append(
+                BatchPostResult(index=index, error=f"미디어 파일 {missing[0]}를 찾을 수 없습니다.")
+            )
+            continue
+        error = (
+            _check_video_post(item.post_type, item.media_file_ids, videos)
+            if item.post_type in VIDEO_POST_TYPES
+            else None
+        )
+        if error:
+            results.append(BatchPostResult(index=index, error=error))
+            continue
+
+        post = Post(
+            user_id=user.id,
+            account_id=item.account_id,
+            post_type=item.post_type,
+            caption=item.caption,
+            status="pending",
+            scheduled_at=item.scheduled_at or now,
+            error_message=None,
+            executed_at=None,
+        )
+        post.media_paths = [media_by_id[fid] for fid in item.media_file_ids]
+        created.append((index, post))
+
+    db.add_all([post for _, post in created])
+    await db.commit()
+
+    for index, post in created:
+        schedule_post(post.id, post.account_id, post.scheduled_at)
+        results.append(BatchPostResult(index=index, post=PostResponse.model_validate(post)))
+    results.sort(key=lambda r: r.index)
+
+    return BatchCreatePostResponse(
+        items=results,
+        created=len(created),
+        failed=len(items) - len(created),
+    )
+
+
+async def _load_media_paths(db: AsyncSession, user_id: int, file_ids) -> dict[int, str]:
+    """사용자 소유 MediaFile id → 포스팅에 쓸 경로 (정규화 사본이 있으면 사본)."""
+    if not file_ids:
+        return {}
+    result = await db.execute(
+        select(MediaFile.id, MediaFile.filepath, MediaFile.normalized_path).where(
+            MediaFile.user_id == user_id,
+            MediaFile.id.in_(set(file_ids)),
+        )
+    )
+    return {file_id: normalized or filepath for file_id, filepath, normalized in result.all()}
+
+
+async def _load_video_info(db: AsyncSession, user_id: int, file_ids) -> dict[int, VideoInfo]:
+    """MediaFile id → 업로드 때 읽은 동영상 메타데이터 (기록이 없는 파일은 제외)."""
+    if not file_ids:
+        return {}
+    result = await db.execute(
+        select(MediaFile).where(
+            MediaFile.user_id == user_id,
+            MediaFile.id.in_(set(file_ids)),
+            MediaFile.video_codec.isnot(None),
+        )
+    )
+    return {
+        m.id: VideoInfo(
+            duration=m.duration_seconds or 0.0,
+            width=m.width or 0,
+            height=m.height or 0,  # 이미 회전을 적용한 크기
+            video_codec=m.video_codec,
+            audio_codec=m.audio_codec,
+        )
+        for m in result.scalars().all()
+    }
+
+
+def _check_video_post(post_type: str, file_ids: list[int], videos: dict[int, VideoInfo]) -> Optional[str]:
+    """video/reel 포스팅 제약 위반 메시지. 문제 없으면 None (업로드되는 것은 첫 파일)."""
+    if not file_ids:
+        return None
+    info = videos.get(file_ids[0])
+    if info is None:
+        return None  # 메타데이터 기록 이전 업로드: 실행 시점 검사에 맡긴다
+    try:
+        check_for_post(info, post_type)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+async def claim_post(db: AsyncSession, post_id: int) -> bool:
+    """Post 실행 리스(lease)를 원자적으로 획득한다.
+
+    pending이거나 리스가 만료된 running 상태일 때만 조건부 UPDATE가 성공하므로
+    SQLite/Postgres 모두에서 여러 인스턴스 중 정확히 하나만 실행하게 된다.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        update(Post)
+        .where(
+            Post.id == post_id,
+            or_(
+                Post.status == "pending",
+                and_(Post.status == "running", Post.lease_expires_at < now),
+            ),
+        )
+        .values(
+            status="running",
+            lease_owner=LEASE_OWNER,
+            lease_expires_at=now + timedelta(seconds=settings.POST_LEASE_SECONDS),
+            heartbeat_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def _heartbeat(post_id: int) -> None:
+    """실행 중 리스를 주기적으로 연장한다 (별도 세션 사용)."""
+    interval = settings.POST_LEASE_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        now = datetime.now(timezone.utc)
+        try:
+            async with AsyncSessionLocal() as hb_db:
+                await hb_db.execute(
+                    update(Post)
+                    .where(Post.id == post_id, Post.lease_owner == LEASE_OWNER)
+                    .values(
+                        lease_expires_at=now + timedelta(seconds=settings.POST_LEASE_SECONDS),
+                        heartbeat_at=now,
+                    )
+                )
+                await hb_db.commit()
+        except Exception as e:
+            logger.warning("포스팅 %d 리스 연장 실패: %s", post_id, e)
+
+
 async def execute_post(db: AsyncSession, post_id: int) -> None:
-    """Post를 실제로 Instagram에 업로드한다."""
+    """Post를 실제로 Instagram에 업로드한다.
+
+    리스를 먼저 획득해야 실행한다. 다른 워커/인스턴스가 이미 잡은 Post면 아무것도 하지 않는다.
+    """
+    if not await claim_post(db, post_id):
+        logger.info("포스팅 %d: 이미 다른 워커가 실행 중이거나 실행 대상이 아님", post_id)
+        return
+
     result = await db.execute(
-        select(Post).where(Post.id == post_id)
+        select(Post).where(Post.id == post_id).execution_options(populate_existing=True)
     )
     post = result.scalar_one_or_none()
     if not post:
@@ -90,96 +303,156 @@ async def execute_post(db: AsyncSession, post_id: int) -> None:
     if not account:
         post.status = "failed"
         post.error_message = "연결된 Instagram 계정을 찾을 수 없습니다."
+        _release_lease(post)
         await db.commit()
         return
 
-    post.status = "running"
-    await db.commit()
-
+    heartbeat = asyncio.create_task(_heartbeat(post_id))
     try:
-        from autosns.client import get_client
-        from autosns.uploader import upload_carousel, upload_photo, upload_video
-
-        username = account.username
-        password = decrypt_password(account.encrypted_password)
-        session_dir = settings.SESSIONS_DIR / str(account.user_id)
-        session_dir.mkdir(parents=True, exist_ok=True)
+        from instagrapi.exceptions import LoginRequired
 
-        loop = asyncio.get_event_loop()
+        key = account_key(account.user_id, account.username)
+        upload_timeout = settings.IG_UPLOAD_TIMEOUT_SECONDS
 
-        # 클라이언트 획득
-        cl = await loop.run_in_executor(None, get_client, username, password, session_dir)
-
-        # R2 URL이면 임시 파일로 다운로드
-        from app.core.storage import download_to_tempfile
-        raw_paths = post.media_paths
-        tmp_files: list[str] = []
-        for p in raw_paths:
-            suffix = Path(p).suffix or ".bin"
-            local = await download_to_tempfile(p, suffix)
-            tmp_files.append(local)
+        # 클라이언트 획득 (풀에 로그인된 Client가 있으면 재사용)
+        cl = await client_pool.acquire(account)
 
         caption = post.caption
         post_type = post.post_type
 
-        try:
-            if post_type == "photo":
-                await loop.run_in_executor(None, upload_photo, cl, tmp_files[0], caption)
-            elif post_type == "carousel":
-                await loop.run_in_executor(None, upload_carousel, cl, tmp_files, caption)
-            elif post_type == "video":
-                await loop.run_in_executor(None, upload_video, cl, tmp_files[0], caption, False)
-            elif post_type == "reel":
-                await loop.run_in_executor(None, upload_video, cl, tmp_files[0], caption, True)
-            else:
-                raise ValueError(f"지원하지 않는 post_type: {post_type}")
-        finally:
-            # R2에서 다운로드한 임시 파일 정리
-            for tmp in tmp_files:
-                if tmp not in raw_paths:
-                    Path(tmp).unlink(missing_ok=True)
+        # R2 URL이면 로컬 캐시로 동시에 내려받고, 로컬 경로는 그대로 사용
+        async with media_cache.use(post.media_paths) as local_paths:
+            try:
+                await ig_executor.run(
+                    key, _upload_media, cl, post_type, local_paths, caption, timeout=upload_timeout
+                )
+            except LoginRequired:
+                # 검증 없이 복원한 세션이 끊긴 경우: 전체 검증/재로그인 후 1회 재시도
+                logger.warning("포스팅 %d: LoginRequired, 세션을 재검증 후 재시도", post.id)
+                cl = await client_pool.refresh(account)
+                await ig_executor.run(
+                    key, _upload_media, cl, post_type, local_paths, caption, timeout=upload_timeout
+                )
 
         post.status = "done"
         post.executed_at = datetime.now(timezone.utc)
 
     except Exception as e:
+        from instagrapi.exceptions import LoginRequired
+
+        if isinstance(e, (LoginRequired, TimeoutError)):
+            # 세션이 끊겼거나 시간 초과로 스레드가 붙잡고 있는 Client는 버리고 다음 실행 때 다시 로그인
+            client_pool.invalidate(account.id)
         post.status = "failed"
         post.error_message = str(e)
 
+    finally:
+        heartbeat.cancel()
+        media_cache.unpin(post_id)
+
+    if post.status == "done":
+        # 사용량 집계는 done 변경과 같은 트랜잭션으로 커밋
+        await increment_usage(db, post.user_id, post.executed_at)
+    _release_lease(post)
     await db.commit()
 
 
+def _release_lease(post: Post) -> None:
+    post.lease_owner = None
+    post.lease_expires_at = None
+
+
+def _upload_media(cl, post_type: str, files: list[str], caption: str) -> None:
+    """post_type에 맞는 autosns.uploader 함수로 업로드한다 (블로킹)."""
+    from autosns.uploader import upload_carousel, upload_photo, upload_video
+
+    if post_type == "photo":
+        upload_photo(cl, files[0], caption)
+    elif post_type == "carousel":
+        upload_carousel(cl, files, caption)
+    elif post_type == "video":
+        upload_video(cl, files[0], caption, False)
+    elif post_type == "reel":
+        upload_video(cl, files[0], caption, True)
+    else:
+        raise ValueError(f"지원하지 않는 post_type: {post_type}")
+
+
+# count="estimate"일 때 이 개수까지만 센다
+ESTIMATE_COUNT_CAP = 1000
+
+
 async def list_posts(
     db: AsyncSession,
     user_id: int,
     page: int = 1,
     size: int = 20,
+    cursor: Optional[str] = None,
+    count: str = "exact",
 ) -> PostListResponse:
+    """포스팅 목록 (created_at, id 내림차순).
+
+    cursor가 있으면 키셋 페이지네이션(OFFSET 없음), 없으면 기존 page/size 방식.
+    count: "exact" 전체 COUNT | "estimate" ESTIMATE_COUNT_CAP까지만 COUNT | "none" 생략
+    """
     from sqlalchemy import func
 
-    total_result = await db.execute(
-        select(func.count(Post.id)).where(Post.user_id == user_id)
-    )
-    total = total_result.scalar_one()
+    base = select(Post).where(Post.user_id == user_id)
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor)
+        query = base.where(
+            or_(
+                Post.created_at < created_at,
+                and_(Post.created_at == created_at, Post.id < last_id),
+            )
+        )
+    else:
+        query = base.offset((page - 1) * size)
 
-    offset = (page - 1) * size
     result = await db.execute(
-        select(Post)
-        .where(Post.user_id == user_id)
-        .order_by(Post.created_at.desc())
-        .offset(offset)
-        .limit(size)
+        query.order_by(Post.created_at.desc(), Post.id.desc()).limit(size + 1)
     )
     posts = result.scalars().all()
+    has_more = len(posts) > size
+    posts = posts[:size]
+
+    total: Optional[int] = None
+    total_exact = True
+    if count == "exact":
+        total_result = await db.execute(
+            select(func.count(Post.id)).where(Post.user_id == user_id)
+        )
+        total = total_result.scalar_one()
+    elif count == "estimate":
+        capped = select(Post.id).where(Post.user_id == user_id).limit(ESTIMATE_COUNT_CAP).subquery()
+        total_result = await db.execute(select(func.count()).select_from(capped))
+        total = total_result.scalar_one()
+        total_exact = total < ESTIMATE_COUNT_CAP
 
     return PostListResponse(
         items=[PostResponse.model_validate(p) for p in posts],
         total=total,
+        total_exact=total_exact,
         page=page,
         size=size,
+        next_cursor=_encode_cursor(posts[-1]) if has_more else None,
     )
 
 
+def _encode_cursor(post: Post) -> str:
+    raw = json.dumps({"c": post.created_at.isoformat(), "i": post.id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 cursor입니다.")
+
+
 async def get_post(db: AsyncSession, user_id: int, post_id: int) -> PostResponse:
     result = await db.execute(
         select(Post).where(Post.id == post_id, Post.user_id == user_id)
@@ -202,3 +475,5 @@ async def delete_post(db: AsyncSession, user_id: int, post_id: int) -> None:
 
     await db.delete(post)
     await db.commit()
+    unschedule_post(post_id)
+    media_cache.unpin(post_id)
@@ -1,32 +1,99 @@
 """
 월별 사용량 체크 → 초과 시 HTTP 429
+사용량은 usage_counters 집계 테이블에서 PK 조회로 읽는다.
+Post가 done이 될 때 같은 트랜잭션에서 +1 하고, 주기 작업이 posts 기준으로 재계산한다.
 """
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import DateTime, and_, delete, func, literal, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import dialect_insert
 from app.models.post import Post
-from app.models.user import User
+from app.models.usage_counter import UsageCounter
+from app.models.user import CurrentUser
+
+
+def _month_key(dt: datetime) -> str:
+    return dt.strftime("%Y-%m")
+
+
+def _start_of_month(dt: datetime) -> datetime:
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
 
 async def get_monthly_usage(db: AsyncSession, user_id: int) -> int:
     """이번 달 완료(done) 포스팅 수 반환."""
+    month = _month_key(datetime.now(timezone.utc))
+    result = await db.execute(
+        select(UsageCounter.done_count).where(
+            UsageCounter.user_id == user_id,
+            UsageCounter.month == month,
+        )
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def increment_usage(db: AsyncSession, user_id: int, executed_at: datetime) -> None:
+    """완료 포스팅 1건 반영. 커밋하지 않으므로 status=done 변경과 같은 트랜잭션에서 호출한다."""
     now = datetime.now(timezone.utc)
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    stmt = dialect_insert(db, UsageCounter).values(
+        user_id=user_id,
+        month=_month_key(executed_at),
+        done_count=1,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UsageCounter.user_id, UsageCounter.month],
+        set_={"done_count": UsageCounter.done_count + 1, "updated_at": now},
+    )
+    await db.execute(stmt)
 
-    result = await db.execute(
-        select(func.count(Post.id)).where(
-            Post.user_id == user_id,
-            Post.status == "done",
-            Post.executed_at >= start_of_month,
+
+async def rebuild_usage_counters(db: AsyncSession, now: Optional[datetime] = None) -> int:
+    """이번 달 집계를 posts 테이블 기준으로 다시 계산한다. 갱신된 사용자 수 반환.
+
+    집계와 덮어쓰기를 한 INSERT ... SELECT 업서트로 처리해, 그 사이에 커밋된 increment_usage가 사라지지 않게 한다.
+    PostgreSQL은 READ COMMITTED에서 문장 시작 이후 커밋을 보지 못하므로 먼저 usage_counters에
+    쓰기 잠금을 걸어 진행 중인 증가분의 커밋을 기다리고, 새 증가분은 재계산이 끝날 때까지 막는다.
+    SQLite는 쓰기 문장이 DB 쓰기 잠금을 잡은 뒤 읽으므로 따로 잠그지 않는다.
+    """
+    now = now or datetime.now(timezone.utc)
+    start_of_month = _start_of_month(now)
+    month = _month_key(now)
+
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("LOCK TABLE usage_counters IN SHARE ROW EXCLUSIVE MODE"))
+
+    done_this_month = and_(Post.status == "done", Post.executed_at >= start_of_month)
+    counts = (
+        select(Post.user_id, literal(month), func.count(Post.id), literal(now, DateTime(timezone=True)))
+        .where(done_this_month)
+        .group_by(Post.user_id)
+    )
+    stmt = dialect_insert(db, UsageCounter).from_select(
+        ["user_id", "month", "done_count", "updated_at"], counts
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UsageCounter.user_id, UsageCounter.month],
+        set_={"done_count": stmt.excluded.done_count, "updated_at": stmt.excluded.updated_at},
+    )
+    result = await db.execute(stmt)
+
+    # 이번 달 완료 포스팅이 없어진 사용자의 카운터는 지운다
+    await db.execute(
+        delete(UsageCounter).where(
+            UsageCounter.month == month,
+            UsageCounter.user_id.not_in(select(Post.user_id).where(done_this_month)),
         )
     )
-    return result.scalar_one() or 0
+    await db.commit()
+    return result.rowcount
 
 
-async def check_quota(db: AsyncSession, user: User) -> None:
+async def check_quota(db: AsyncSession, user: CurrentUser) -> None:
     """사용량 초과 시 HTTP 429 발생."""
     limit = user.monthly_limit
     if limit == -1:
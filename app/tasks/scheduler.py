@@ -1,63 +1,372 @@
 """
-APScheduler - AsyncIOScheduler
-1분 주기로 예약 포스팅(pending + scheduled_at <= now)을 실행한다.
+예약 포스팅 실행
+- 타이머 디스패처: 예약 시각 min-heap을 메모리에 두고 다음 시각까지 잠들었다가 정확히 실행
+- APScheduler(AsyncIOScheduler): 느린 주기로 DB 전체를 다시 훑는 안전망(reconcile)과
+  곧 실행될 예약 포스팅의 Instagram 클라이언트 사전 로그인과 미디어 사전 다운로드
+실행은 전역/계정별 동시 실행 한도가 있는 워커로 병렬 처리한다.
 """
+import asyncio
+import heapq
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, update
 
 logger = logging.getLogger(__name__)
 
 _scheduler: AsyncIOScheduler | None = None
 
+# 동시 실행 워커 상태 (이벤트 루프에서만 접근)
+_global_slots: asyncio.Semaphore | None = None
+_account_slots: dict[int, asyncio.Semaphore] = {}
+_account_slot_users: dict[int, int] = {}
+_inflight_posts: set[int] = set()
+_worker_tasks: set[asyncio.Task] = set()
+
+# 타이머 디스패처 상태: (scheduled_at, post_id) min-heap.
+# 재예약/삭제된 항목은 heap에서 바로 빼지 않고 _deadlines와 비교해 꺼낼 때 버린다.
+_heap: list[tuple[datetime, int]] = []
+_deadlines: dict[int, tuple[datetime, int]] = {}  # post_id -> (scheduled_at, account_id)
+_wakeup: asyncio.Event | None = None
+# _load_schedule 도중 들어온 변경 (DB 조회 후 덮어쓰지 않도록 다시 적용)
+_changes_during_load: dict[int, tuple[datetime, int] | None] | None = None
+_dispatcher_task: asyncio.Task | None = None
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # SQLite는 tz 정보를 보존하지 않으므로 naive 값은 UTC로 간주
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def schedule_post(post_id: int, account_id: int, scheduled_at: datetime) -> None:
+    """예약 시각을 등록(또는 변경)한다. 가장 이른 시각이 바뀌면 디스패처를 깨운다."""
+    when = _as_utc(scheduled_at)
+    _deadlines[post_id] = (when, account_id)
+    if _changes_during_load is not None:
+        _changes_during_load[post_id] = (when, account_id)
+    heapq.heappush(_heap, (when, post_id))
+    if _wakeup is not None and _heap[0][1] == post_id:
+        _wakeup.set()
+
+
+def unschedule_post(post_id: int) -> None:
+    """삭제/취소된 포스팅을 예약에서 뺀다."""
+    _deadlines.pop(post_id, None)
+    if _changes_during_load is not None:
+        _changes_during_load[post_id] = None
+
+
+async def _load_schedule() -> None:
+    """DB의 pending 예약 포스팅으로 heap을 다시 만든다."""
+    from app.core.database import AsyncSessionLocal
+    from app.models.post import Post
+
+    global _changes_during_load
+    _changes_during_load = {}
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Post.id, Post.account_id, Post.scheduled_at).where(
+                    Post.status == "pending",
+                    Post.scheduled_at.isnot(None),
+                )
+            )
+            rows = result.all()
+        changes = _changes_during_load
+    finally:
+        _changes_during_load = None
+
+    _deadlines.clear()
+    for post_id, account_id, scheduled_at in rows:
+        _deadlines[post_id] = (_as_utc(scheduled_at), account_id)
+    for post_id, entry in changes.items():
+        if entry is None:
+            _deadlines.pop(post_id, None)
+        else:
+            _deadlines[post_id] = entry
+    _heap[:] = [(when, post_id) for post_id, (when, _) in _deadlines.items()]
+    heapq.heapify(_heap)
+    if _wakeup is not None:
+        _wakeup.set()
+    logger.info("예약 포스팅 %d건 로드", len(rows))
+
+
+async def _dispatch_loop() -> None:
+    """가장 이른 예약 시각까지 잠들었다가 도래한 포스팅을 워커에 넘긴다."""
+    assert _wakeup is not None
+    while True:
+        # 재예약/삭제로 무효가 된 항목 정리
+        while _heap and _deadlines.get(_heap[0][1], (None,))[0] != _heap[0][0]:
+            heapq.heappop(_heap)
+
+        _wakeup.clear()
+        if not _heap:
+            await _wakeup.wait()
+            continue
+
+        when, post_id = _heap[0]
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        heapq.heappop(_heap)
+        _, account_id = _deadlines.pop(post_id)
+        dispatch_post(post_id, account_id)
+
 
 async def poll_pending_posts() -> None:
-    """scheduled_at이 지났고 status=pending인 Post를 실행한다."""
+    """scheduled_at이 지났고 status=pending인 Post를 동시 실행 워커에 넘긴다.
+
+    실행 완료를 기다리지 않으므로 느린 업로드가 다음 폴링을 막지 않는다.
+    디스패처가 놓친 포스팅과 리스가 만료된 포스팅을 잡는 안전망이다.
+    실제 실행 여부는 워커의 리스 획득(claim_post)으로 결정되므로 여러 인스턴스가 동시에 돌려도 된다.
+    """
     from app.core.database import AsyncSessionLocal
     from app.models.post import Post
+
+    now = datetime.now(timezone.utc)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Post.id, Post.account_id).where(
+                or_(
+                    and_(
+                        Post.status == "pending",
+                        Post.scheduled_at.isnot(None),
+                        Post.scheduled_at <= now,
+                    ),
+                    # 실행하던 인스턴스가 죽어 리스가 만료된 포스팅 회수
+                    and_(Post.status == "running", Post.lease_expires_at < now),
+                )
+            )
+        )
+        due = [(post_id, account_id) for post_id, account_id in result.all() if post_id not in _inflight_posts]
+
+    if due:
+        logger.info("예약 포스팅 %d건 실행 시작 (실행 중 %d건)", len(due), len(_inflight_posts))
+
+    for post_id, account_id in due:
+        dispatch_post(post_id, account_id)
+
+
+def dispatch_post(post_id: int, account_id: int) -> None:
+    """포스팅 실행 워커를 띄운다. 이미 실행 중인 포스팅이면 무시."""
+    if post_id in _inflight_posts:
+        return
+    _inflight_posts.add(post_id)
+    task = asyncio.create_task(_run_post(post_id, account_id))
+    _worker_tasks.add(task)
+    task.add_done_callback(_worker_tasks.discard)
+
+
+async def _run_post(post_id: int, account_id: int) -> None:
+    """전역/계정별 동시 실행 한도 안에서 자체 DB 세션으로 포스팅을 실행한다."""
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
     from app.services.post_service import execute_post
 
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(settings.SCHEDULER_MAX_CONCURRENCY)
+    account_slots = _account_slots.get(account_id)
+    if account_slots is None:
+        account_slots = _account_slots[account_id] = asyncio.Semaphore(
+            settings.SCHEDULER_PER_ACCOUNT_CONCURRENCY
+        )
+    _account_slot_users[account_id] = _account_slot_users.get(account_id, 0) + 1
+
+    try:
+        async with account_slots, _global_slots:
+            async with AsyncSessionLocal() as db:
+                await execute_post(db, post_id)
+    except Exception as e:
+        logger.error("포스팅 %d 실행 오류: %s", post_id, e)
+    finally:
+        _inflight_posts.discard(post_id)
+        remaining = _account_slot_users[account_id] - 1
+        if remaining:
+            _account_slot_users[account_id] = remaining
+        else:
+            del _account_slot_users[account_id]
+            _account_slots.pop(account_id, None)
+
+
+async def warm_upcoming_clients() -> None:
+    """IG_CLIENT_WARMUP_MINUTES 안에 실행될 포스팅의 계정을 미리 로그인한다."""
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.models.ig_account import IGAccount
+    from app.models.post import Post
+    from app.services.client_pool import client_pool
+
+    now = datetime.now(timezone.utc)
+    horizon = now + timedelta(minutes=settings.IG_CLIENT_WARMUP_MINUTES)
+
+    client_pool.prune()
+
+    async with AsyncSessionLocal() as db:
+        account_ids = (
+            select(Post.account_id)
+            .where(
+                Post.status == "pending",
+                Post.scheduled_at.isnot(None),
+                Post.scheduled_at <= horizon,
+            )
+            .distinct()
+        )
+        result = await db.execute(select(IGAccount).where(IGAccount.id.in_(account_ids)))
+        accounts = result.scalars().all()
+
+    if accounts:
+        logger.info("클라이언트 사전 로그인 %d개 계정", len(accounts))
+        await asyncio.gather(*(client_pool.warm(a) for a in accounts))
+
+
+async def prestage_upcoming_media() -> None:
+    """MEDIA_PRESTAGE_LEAD_MINUTES 안에 실행될 포스팅의 미디어를 로컬 캐시에 미리 받아 고정한다.
+
+    고정한 용량이 MEDIA_PRESTAGE_MAX_BYTES를 넘으면 나머지는 다음 주기로 미룬다.
+    실패해도 실행 시점에 다시 받으므로 포스팅 자체는 막지 않는다.
+    """
+    from app.core.config import settings
+    from app.core.database import AsyncSessionLocal
+    from app.core.media_cache import media_cache
+    from app.models.post import Post
+
     now = datetime.now(timezone.utc)
+    horizon = now + timedelta(minutes=settings.MEDIA_PRESTAGE_LEAD_MINUTES)
 
     async with AsyncSessionLocal() as db:
+        # 끝났거나 삭제된 포스팅의 고정 해제
+        pinned = media_cache.pinned_posts()
+        if pinned:
+            result = await db.execute(
+                select(Post.id).where(Post.id.in_(pinned), Post.status.in_(("pending", "running")))
+            )
+            alive = set(result.scalars().all())
+            for post_id in pinned:
+                if post_id not in alive:
+                    media_cache.unpin(post_id)
+
         result = await db.execute(
-            select(Post).where(
+            select(Post)
+            .where(
                 Post.status == "pending",
                 Post.scheduled_at.isnot(None),
-                Post.scheduled_at <= now,
+                Post.scheduled_at <= horizon,
             )
+            .order_by(Post.scheduled_at)
         )
-        posts = result.scalars().all()
+        posts = [p for p in result.scalars().all() if p.id not in media_cache.pinned_posts()]
 
-        if posts:
-            logger.info("예약 포스팅 %d건 실행 시작", len(posts))
+    if not posts:
+        return
 
-        for post in posts:
+    slots = asyncio.Semaphore(settings.MEDIA_PRESTAGE_CONCURRENCY)
+    outcome: dict[str, list[int]] = {"staged": [], "failed": []}
+
+    async def stage(post) -> None:
+        async with slots:
+            if media_cache.pinned_bytes >= settings.MEDIA_PRESTAGE_MAX_BYTES:
+                return  # 디스크 예산 초과: 다음 주기에 다시 시도
             try:
-                await execute_post(db, post.id)
+                await media_cache.pin(post.id, post.media_paths)
+                outcome["staged"].append(post.id)
             except Exception as e:
-                logger.error("포스팅 %d 실행 오류: %s", post.id, e)
+                logger.warning("포스팅 %d 미디어 사전 다운로드 실패: %s", post.id, e)
+                outcome["failed"].append(post.id)
+
+    await asyncio.gather(*(stage(p) for p in posts))
+
+    async with AsyncSessionLocal() as db:
+        for status, post_ids in outcome.items():
+            if post_ids:
+                await db.execute(
+                    update(Post)
+                    .where(Post.id.in_(post_ids), Post.status == "pending")
+                    .values(prestage_status=status)
+                )
+        await db.commit()
+    logger.info(
+        "미디어 사전 다운로드: 성공 %d, 실패 %d (고정 %d bytes)",
+        len(outcome["staged"]), len(outcome["failed"]), media_cache.pinned_bytes,
+    )
+
+
+async def reconcile_usage_counters() -> None:
+    """usage_counters를 posts 기준으로 재계산한다 (집계 누락/드리프트 보정)."""
+    from app.core.database import AsyncSessionLocal
+    from app.services.quota_service import rebuild_usage_counters
+
+    async with AsyncSessionLocal() as db:
+        updated = await rebuild_usage_counters(db)
+    logger.info("월간 사용량 집계 재계산 완료 (%d명)", updated)
+
+
+async def reconcile_schedule() -> None:
+    """안전망: 지난 예약을 실행하고 heap을 DB 기준으로 다시 만든다."""
+    await poll_pending_posts()
+    await _load_schedule()
 
 
 async def start_scheduler() -> None:
-    global _scheduler
+    from app.core.config import settings
+
+    global _scheduler, _wakeup, _dispatcher_task
+    _wakeup = asyncio.Event()
+    await _load_schedule()
+    _dispatcher_task = asyncio.create_task(_dispatch_loop())
+
     _scheduler = AsyncIOScheduler(timezone="UTC")
     _scheduler.add_job(
-        poll_pending_posts,
+        reconcile_schedule,
+        trigger="interval",
+        minutes=settings.SCHEDULER_RECONCILE_MINUTES,
+        id="reconcile_schedule",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _scheduler.add_job(
+        reconcile_usage_counters,
+        trigger="interval",
+        minutes=settings.USAGE_RECONCILE_MINUTES,
+        next_run_time=datetime.now(timezone.utc),  # 기동 시 한 번 (기존 DB 초기 집계)
+        id="reconcile_usage_counters",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _scheduler.add_job(
+        warm_upcoming_clients,
+        trigger="interval",
+        minutes=1,
+        id="warm_upcoming_clients",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _scheduler.add_job(
+        prestage_upcoming_media,
         trigger="interval",
         minutes=1,
-        id="poll_pending_posts",
+        id="prestage_upcoming_media",
         replace_existing=True,
         max_instances=1,
     )
     _scheduler.start()
-    logger.info("스케줄러 시작 (1분 주기 폴링)")
+    logger.info("스케줄러 시작 (타이머 디스패치, %d분 주기 재조정)", settings.SCHEDULER_RECONCILE_MINUTES)
 
 
 async def stop_scheduler() -> None:
-    global _scheduler
+    global _scheduler, _dispatcher_task
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
         logger.info("스케줄러 종료")
+    if _dispatcher_task is not None:
+        _dispatcher_task.cancel()
+        _dispatcher_task = None
+    for task in list(_worker_tasks):
+        task.cancel()
@@ -5,11 +5,24 @@ AI 캡션 생성
   - none  : AI 사용 안 함
   - openai: OpenAI gpt-4o-mini
   - claude: Anthropic claude-opus-4-6
+
+비동기 API(agenerate_caption / agenerate_captions)가 기본이고,
+generate_caption / generate_captions는 이를 백그라운드 스레드의 상주 이벤트 루프에서 실행하는
+동기 버전이다 (실행 중인 이벤트 루프 안에서 불러도 된다).
+SDK 클라이언트는 이벤트 루프마다 한 번만 만들어 연결을 재사용한다.
 """
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+from typing import Any, Iterable, NamedTuple
+
 from autosns.utils import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_CONCURRENCY = 4
+
 _SYSTEM_PROMPT = (
     "당신은 Instagram 마케터입니다. "
     "사용자가 제공한 키워드/상황을 바탕으로 "
@@ -19,7 +32,73 @@ _SYSTEM_PROMPT = (
 )
 
 
-def generate_caption(prompt: str, provider: str | None = None) -> str:
+class _AIConfig(NamedTuple):
+    provider: str
+    openai_api_key: str
+    anthropic_api_key: str
+    openai_model: str
+    claude_model: str
+
+
+@lru_cache(maxsize=1)
+def _config() -> _AIConfig:
+    from config import AI_PROVIDER, OPENAI_API_KEY, ANTHROPIC_API_KEY, OPENAI_MODEL, CLAUDE_MODEL
+
+    return _AIConfig(AI_PROVIDER, OPENAI_API_KEY, ANTHROPIC_API_KEY, OPENAI_MODEL, CLAUDE_MODEL)
+
+
+# 비동기 클라이언트의 연결 풀은 만든 이벤트 루프에 묶이므로 루프별로 보관한다
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _loop_clients() -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    clients = _clients.get(loop)
+    if clients is None:
+        clients = _clients[loop] = {}
+    return clients
+
+
+def _openai_client(api_key: str):
+    try:
+        from openai import AsyncOpenAI
+    except ImportError:
+        raise ImportError("openai 패키지가 설치되어 있지 않습니다: pip install openai")
+
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    clients = _loop_clients()
+    key = f"openai:{api_key}"
+    if key not in clients:
+        clients[key] = AsyncOpenAI(api_key=api_key)
+    return clients[key]
+
+
+def _claude_client(api_key: str):
+    try:
+        import anthropic
+    except ImportError:
+        raise ImportError("anthropic 패키지가 설치되어 있지 않습니다: pip install anthropic")
+
+    if not api_key:
+        raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
+
+    clients = _loop_clients()
+    key = f"claude:{api_key}"
+    if key not in clients:
+        clients[key] = anthropic.AsyncAnthropic(api_key=api_key)
+    return clients[key]
+
+
+async def aclose_clients() -> None:
+    """현재 이벤트 루프에서 만든 클라이언트를 닫는다."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+async def agenerate_caption(prompt: str, provider: str | None = None) -> str:
     """AI로 Instagram 캡션을 생성한다.
 
     Args:
@@ -29,35 +108,89 @@ def generate_caption(prompt: str, provider: str | None = None) -> str:
     Returns:
         생성된 캡션 문자열. AI 비활성화 시 빈 문자열.
     """
-    from config import AI_PROVIDER, OPENAI_API_KEY, ANTHROPIC_API_KEY, OPENAI_MODEL, CLAUDE_MODEL
-
-    prov = (provider or AI_PROVIDER).lower()
+    cfg = _config()
+    prov = (provider or cfg.provider).lower()
 
     if prov == "none":
         logger.debug("AI_PROVIDER=none, 캡션 생성을 건너뜁니다.")
         return ""
 
     if prov == "openai":
-        return _openai_caption(prompt, OPENAI_API_KEY, OPENAI_MODEL)
+        return await _openai_caption(prompt, cfg.openai_api_key, cfg.openai_model)
 
     if prov == "claude":
-        return _claude_caption(prompt, ANTHROPIC_API_KEY, CLAUDE_MODEL)
+        return await _claude_caption(prompt, cfg.anthropic_api_key, cfg.claude_model)
 
     raise ValueError(f"알 수 없는 AI_PROVIDER: {prov} (none | openai | claude)")
 
 
-def _openai_caption(prompt: str, api_key: str, model: str) -> str:
-    try:
-        from openai import OpenAI
-    except ImportError:
-        raise ImportError("openai 패키지가 설치되어 있지 않습니다: pip install openai")
+async def agenerate_captions(
+    prompts: Iterable[str],
+    provider: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> list:
+    """여러 프롬프트의 캡션을 최대 concurrency개씩 동시에 생성한다.
 
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+    Args:
+        prompts: 캡션 주제/키워드/상황 설명 목록
+        provider: agenerate_caption과 같음
+        concurrency: 동시에 진행할 AI 요청 수
+        return_exceptions: True면 실패한 항목 자리에 예외 객체를 넣고 나머지는 계속 진행
+
+    Returns:
+        prompts와 같은 순서의 캡션 목록
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency는 1 이상이어야 합니다.")
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(prompt: str) -> str:
+        async with slots:
+            return await agenerate_caption(prompt, provider)
+
+    return await asyncio.gather(*(run(p) for p in prompts), return_exceptions=return_exceptions)
+
+
+def generate_caption(prompt: str, provider: str | None = None) -> str:
+    """agenerate_caption의 동기 버전. 호출 간 클라이언트를 재사용한다."""
+    return _run_sync(agenerate_caption(prompt, provider))
 
-    client = OpenAI(api_key=api_key)
+
+def generate_captions(
+    prompts: Iterable[str],
+    provider: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> list:
+    """agenerate_captions의 동기 버전 (예: 대기 중인 게시물 폴더의 캡션을 한 번에 생성)."""
+    return _run_sync(agenerate_captions(prompts, provider, concurrency, return_exceptions))
+
+
+_sync_loop: asyncio.AbstractEventLoop | None = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """동기 API 전용 상주 이벤트 루프 (첫 호출 시 데몬 스레드로 시작)."""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="caption-ai", daemon=True).start()
+            _sync_loop = loop
+        return _sync_loop
+
+
+def _run_sync(coro):
+    # asyncio.run과 달리 호출하는 스레드의 이벤트 루프 여부와 무관하고, 루프가 유지되므로 클라이언트도 유지된다
+    return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
+
+
+async def _openai_caption(prompt: str, api_key: str, model: str) -> str:
+    client = _openai_client(api_key)
     logger.info("OpenAI(%s)로 캡션 생성 중...", model)
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=model,
         messages=[
             {"role": "system", "content": _SYSTEM_PROMPT},
@@ -71,18 +204,10 @@ def _openai_caption(prompt: str, api_key: str, model: str) -> str:
     return caption
 
 
-def _claude_caption(prompt: str, api_key: str, model: str) -> str:
-    try:
-        import anthropic
-    except ImportError:
-        raise ImportError("anthropic 패키지가 설치되어 있지 않습니다: pip install anthropic")
-
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다.")
-
-    client = anthropic.Anthropic(api_key=api_key)
+async def _claude_caption(prompt: str, api_key: str, model: str) -> str:
+    client = _claude_client(api_key)
     logger.info("Claude(%s)로 캡션 생성 중...", model)
-    message = client.messages.create(
+    message = await client.messages.create(
         model=model,
         max_tokens=300,
         system=_SYSTEM_PROMPT,
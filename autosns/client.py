@@ -2,12 +2,15 @@
 Instagram 로그인 & 세션 관리
 
 세션 재사용 우선 전략:
-  1. data/sessions/<username>.json 로드
-  2. account_info() 로 세션 유효성 검증
+  1. <username>.meta.json 의 마지막 검증 시각/쿠키 만료가 신선하면
+     data/sessions/<username>.json 만 로드하고 바로 반환 (네트워크 없음)
+  2. 오래됐으면 세션 로드 후 login() + get_timeline_feed() 로 유효성 검증
   3. 만료/없음 → 풀 로그인 → 세션 저장
 """
 import json
+import time
 from pathlib import Path
+from typing import Optional
 
 from instagrapi import Client
 from instagrapi.exceptions import LoginRequired, ChallengeRequired
@@ -16,29 +19,112 @@ from autosns.utils import get_logger
 
 logger = get_logger(__name__)
 
+# 마지막 검증 후 이 시간 안에는 네트워크 검증 없이 세션을 재사용
+SESSION_REVALIDATE_SECONDS = 6 * 60 * 60
+# 세션 쿠키 만료 직전이면 신선하지 않은 것으로 간주
+COOKIE_EXPIRY_MARGIN_SECONDS = 60 * 60
+
 
 def _session_path(username: str, session_dir: Path) -> Path:
     return session_dir / f"{username}.json"
 
 
-def get_client(username: str, password: str, session_dir: Path) -> Client:
-    """로그인된 instagrapi Client를 반환한다."""
+def _meta_path(username: str, session_dir: Path) -> Path:
+    return session_dir / f"{username}.meta.json"
+
+
+def _read_meta(username: str, session_dir: Path) -> dict:
+    path = _meta_path(username, session_dir)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _cookie_expiry(cl: Client) -> Optional[float]:
+    """sessionid 쿠키의 만료 시각(epoch). 알 수 없으면 None."""
+    jar = getattr(getattr(cl, "private", None), "cookies", None)
+    if jar is None:
+        return None
+    expiries = [c.expires for c in jar if c.name == "sessionid" and c.expires]
+    return float(min(expiries)) if expiries else None
+
+
+def _write_meta(cl: Client, username: str, session_dir: Path) -> None:
+    meta = {"validated_at": time.time(), "cookie_expires_at": _cookie_expiry(cl)}
+    _meta_path(username, session_dir).write_text(json.dumps(meta), encoding="utf-8")
+
+
+def _is_fresh(meta: dict, max_age: float) -> bool:
+    now = time.time()
+    validated_at = meta.get("validated_at")
+    if not validated_at or now - validated_at >= max_age:
+        return False
+    expires_at = meta.get("cookie_expires_at")
+    if expires_at and expires_at - now < COOKIE_EXPIRY_MARGIN_SECONDS:
+        return False
+    return True
+
+
+def mark_session_stale(username: str, session_dir: Path) -> None:
+    """업로드 중 LoginRequired 등으로 세션이 끊겼을 때 호출.
+
+    다음 get_client()는 빠른 경로를 건너뛰고 전체 검증을 수행한다.
+    """
+    _meta_path(username, session_dir).unlink(missing_ok=True)
+
+
+def get_client(
+    username: str,
+    password: str,
+    session_dir: Path,
+    max_age: float = SESSION_REVALIDATE_SECONDS,
+    verify_password: bool = False,
+) -> Client:
+    """로그인된 instagrapi Client를 반환한다.
+
+    Args:
+        username: Instagram 사용자명
+        password: Instagram 비밀번호
+        session_dir: 세션 파일 디렉토리
+        max_age: 마지막 검증 후 네트워크 검증 없이 세션을 신뢰할 시간(초).
+            0이면 항상 검증한다.
+        verify_password: True면 저장된 세션이 있어도 비밀번호로 다시 로그인한다.
+            세션 검증만으로는 비밀번호가 맞는지 알 수 없으므로 새 비밀번호를 저장하기 전에 쓴다.
+    """
     cl = Client()
     cl.delay_range = [2, 5]  # 봇 감지 회피
 
     session_file = _session_path(username, session_dir)
 
     if session_file.exists():
+        if not verify_password and _is_fresh(_read_meta(username, session_dir), max_age):
+            try:
+                cl.load_settings(session_file)
+                # 세션이 끊기면 instagrapi가 relogin()으로 스스로 복구할 수 있도록
+                cl.username = username
+                cl.password = password
+                logger.info("최근 검증된 세션을 재사용합니다: %s", session_file)
+                return cl
+            except Exception as e:
+                logger.warning("세션 파일 로드 실패, 전체 검증으로 진행: %s", e)
+                cl = Client()
+                cl.delay_range = [2, 5]
+
         logger.info("저장된 세션을 로드합니다: %s", session_file)
         try:
             cl.load_settings(session_file)
-            cl.login(username, password)  # 세션 갱신용 (토큰 유효 시 빠름)
+            # 세션 갱신용 (토큰 유효 시 빠름). relogin이면 기기 정보는 유지하고 비밀번호로 다시 로그인
+            cl.login(username, password, relogin=verify_password)
             cl.get_timeline_feed()  # 세션 유효성 검증
+            cl.dump_settings(session_file)
+            _write_meta(cl, username, session_dir)
             logger.info("세션 재사용 성공")
             return cl
         except (LoginRequired, ChallengeRequired, Exception) as e:
             logger.warning("세션이 만료되었거나 유효하지 않습니다: %s", e)
             logger.info("새로 로그인합니다...")
+            mark_session_stale(username, session_dir)
 
     # 풀 로그인
     cl = Client()
@@ -47,6 +133,7 @@ def get_client(username: str, password: str, session_dir: Path) -> Client:
 
     session_dir.mkdir(parents=True, exist_ok=True)
     cl.dump_settings(session_file)
+    _write_meta(cl, username, session_dir)
     logger.info("로그인 성공. 세션을 저장했습니다: %s", session_file)
     return cl
 
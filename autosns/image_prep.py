@@ -0,0 +1,98 @@
+"""
+Instagram 업로드용 이미지 정규화 (Pillow)
+- EXIF 회전 적용 후 메타데이터 제거
+- sRGB(RGB)로 변환, 투명 영역은 흰 배경으로 합성
+- Instagram 허용 비율(4:5 ~ 1.91:1)로 가운데 자르고 가로 1080px 이하로 축소
+- 목표 크기 이하가 되도록 품질을 낮춰가며 JPEG 인코딩
+프로세스 풀에서 호출되므로 모듈 최상위 함수와 기본 타입 인자만 사용한다.
+"""
+import io
+from pathlib import Path
+
+MIN_ASPECT = 4 / 5      # 세로 최대 (0.8)
+MAX_ASPECT = 1.91       # 가로 최대
+MAX_WIDTH = 1080
+MIN_WIDTH = 320
+JPEG_QUALITIES = (90, 85, 80, 75, 70)
+TARGET_BYTES = 1536 * 1024  # 1.5 MB
+
+
+def _to_srgb(img):
+    from PIL import Image, ImageCms
+
+    icc = img.info.get("icc_profile")
+    if icc:
+        try:
+            src = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+            dst = ImageCms.createProfile("sRGB")
+            if img.mode not in ("RGB", "RGBA", "CMYK"):
+                img = img.convert("RGBA" if img.mode in ("LA", "P") else "RGB")
+            out_mode = "RGBA" if img.mode == "RGBA" else "RGB"
+            img = ImageCms.profileToProfile(img, src, dst, outputMode=out_mode)
+        except (ImageCms.PyCMSError, OSError, ValueError):
+            pass  # 깨진 프로파일은 무시하고 그대로 변환
+
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def _crop_to_aspect(img):
+    w, h = img.size
+    aspect = w / h
+    if aspect < MIN_ASPECT:
+        new_h = round(w / MIN_ASPECT)
+        top = (h - new_h) // 2
+        return img.crop((0, top, w, top + new_h))
+    if aspect > MAX_ASPECT:
+        new_w = round(h * MAX_ASPECT)
+        left = (w - new_w) // 2
+        return img.crop((left, 0, left + new_w, h))
+    return img
+
+
+def _resize(img):
+    from PIL import Image
+
+    w, h = img.size
+    if MIN_WIDTH <= w <= MAX_WIDTH:
+        return img
+    target_w = MAX_WIDTH if w > MAX_WIDTH else MIN_WIDTH
+    target_h = max(1, round(h * target_w / w))
+    return img.resize((target_w, target_h), Image.Resampling.LANCZOS)
+
+
+def normalize_image(src: str | Path, dst: str | Path, target_bytes: int = TARGET_BYTES) -> tuple[int, int, int]:
+    """src 이미지를 Instagram 규격 JPEG로 dst에 저장한다.
+
+    Returns:
+        (width, height, 저장된 바이트 수)
+
+    Raises:
+        ValueError: 이미지로 읽을 수 없을 때
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(src) as opened:
+            opened.load()
+            img = ImageOps.exif_transpose(opened)
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {e}") from e
+
+    img = _resize(_crop_to_aspect(_to_srgb(img)))
+
+    # exif/icc를 넘기지 않으므로 메타데이터는 모두 제거된다
+    data = b""
+    for quality in JPEG_QUALITIES:
+        buf = io.BytesIO()
+        img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True, subsampling="4:2:0")
+        data = buf.getvalue()
+        if len(data) <= target_bytes:
+            break
+
+    Path(dst).write_bytes(data)
+    return img.width, img.height, len(data)
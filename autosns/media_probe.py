@@ -0,0 +1,273 @@
+"""
+MP4/MOV 컨테이너 메타데이터 파서 (순수 Python)
+최상위 box 헤더만 건너뛰며 읽고 moov box 하나만 메모리에 올리므로
+mdat(실제 영상 데이터) 크기와 무관하게 파일의 극히 일부만 읽는다.
+seek/read를 지원하는 파일 객체(로컬 파일, 저장소 range reader 등)에서 동작한다.
+"""
+import math
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+MAX_MOOV_BYTES = 32 * 1024 * 1024
+MAX_TOP_LEVEL_BOXES = 64
+
+SUPPORTED_VIDEO_CODECS = {"avc1", "avc3", "hvc1", "hev1"}  # H.264 / HEVC
+SUPPORTED_AUDIO_CODECS = {"mp4a"}  # AAC
+
+# Instagram 업로드 제약 (instagrapi clip_upload/video_upload 기준)
+VIDEO_MIN_SECONDS = 3
+VIDEO_MAX_SECONDS = 60 * 60
+REEL_MIN_SECONDS = 3
+REEL_MAX_SECONDS = 180
+REEL_MIN_ASPECT = 0.5   # 세로 영상 (9:16 = 0.5625)
+REEL_MAX_ASPECT = 1.0
+VIDEO_MIN_ASPECT = 0.8  # 4:5
+VIDEO_MAX_ASPECT = 1.91
+MIN_WIDTH = 320
+
+
+class MediaProbeError(ValueError):
+    """컨테이너를 해석할 수 없을 때."""
+
+
+@dataclass
+class VideoInfo:
+    duration: float  # 초
+    width: int       # 회전 적용 전 (저장된 프레임 크기)
+    height: int
+    rotation: int = 0  # 0 | 90 | 180 | 270
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+
+    @property
+    def display_width(self) -> int:
+        return self.height if self.rotation in (90, 270) else self.width
+
+    @property
+    def display_height(self) -> int:
+        return self.width if self.rotation in (90, 270) else self.height
+
+
+def _iter_boxes(data: bytes, start: int, end: int) -> Iterator[tuple[str, int, int]]:
+    """data[start:end] 안의 box를 (type, payload 시작, box 끝)으로 순회한다."""
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                raise MediaProbeError("잘린 box 헤더")
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise MediaProbeError(f"잘못된 box 크기: {box_type!r}")
+        yield box_type.decode("latin-1"), pos + header, pos + size
+        pos += size
+
+
+def _find(data: bytes, start: int, end: int, box_type: str) -> Optional[tuple[int, int]]:
+    for t, payload, box_end in _iter_boxes(data, start, end):
+        if t == box_type:
+            return payload, box_end
+    return None
+
+
+def _require(payload: int, end: int, length: int, box_type: str) -> None:
+    """box 내용이 length 바이트보다 짧으면 MediaProbeError (다음 box를 잘못 읽지 않도록)."""
+    if payload + length > end:
+        raise MediaProbeError(f"{box_type} box가 너무 짧습니다")
+
+
+def _read_moov(fh: BinaryIO) -> bytes:
+    """최상위 box 헤더만 읽으며 moov를 찾아 그 내용을 반환한다."""
+    fh.seek(0)
+    pos = 0
+    for _ in range(MAX_TOP_LEVEL_BOXES):
+        fh.seek(pos)
+        header = fh.read(16)
+        if len(header) < 8:
+            break
+        size, box_type = struct.unpack_from(">I4s", header, 0)
+        header_len = 8
+        if size == 1:
+            if len(header) < 16:
+                break
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_len = 16
+        if box_type == b"moov":
+            if size == 0:
+                fh.seek(pos + header_len)
+                data = fh.read(MAX_MOOV_BYTES + 1)
+            else:
+                if size - header_len > MAX_MOOV_BYTES:
+                    raise MediaProbeError("moov box가 너무 큽니다")
+                fh.seek(pos + header_len)
+                data = fh.read(size - header_len)
+                if len(data) < size - header_len:
+                    raise MediaProbeError("moov box가 잘려 있습니다")
+            if len(data) > MAX_MOOV_BYTES:
+                raise MediaProbeError("moov box가 너무 큽니다")
+            return data
+        if size == 0:
+            break  # 파일 끝까지 이어지는 box (mdat 등)
+        if size < header_len:
+            raise MediaProbeError(f"잘못된 box 크기: {box_type!r}")
+        pos += size
+    raise MediaProbeError("MP4/MOV 메타데이터(moov)를 찾을 수 없습니다")
+
+
+def _parse_time_header(data: bytes, payload: int, end: int, box_type: str) -> tuple[int, int]:
+    """mvhd/mdhd → (timescale, duration)."""
+    _require(payload, end, 1, box_type)
+    version = data[payload]
+    _require(payload, end, 4 + (16 + 12 if version == 1 else 8 + 8), box_type)
+    if version == 1:
+        timescale, duration = struct.unpack_from(">IQ", data, payload + 4 + 16)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, payload + 4 + 8)
+    return timescale, duration
+
+
+def _parse_tkhd(data: bytes, payload: int, end: int) -> tuple[int, int, int]:
+    """tkhd → (width, height, rotation)."""
+    _require(payload, end, 1, "tkhd")
+    version = data[payload]
+    offset = payload + 4 + (32 if version == 1 else 20)
+    offset += 8 + 2 + 2 + 2 + 2  # reserved, layer, alternate_group, volume, reserved
+    _require(offset, end, 36 + 8, "tkhd")
+    a, b = struct.unpack_from(">ii", data, offset)  # 변환 행렬 [a b u; c d v; x y w]
+    width, height = struct.unpack_from(">II", data, offset + 36)
+    angle = math.degrees(math.atan2(b, a)) if (a or b) else 0.0
+    rotation = int(round(angle / 90.0)) * 90 % 360
+    return width >> 16, height >> 16, rotation
+
+
+def _parse_track(data: bytes, start: int, end: int) -> dict:
+    track: dict = {}
+    tkhd = _find(data, start, end, "tkhd")
+    if tkhd:
+        track["width"], track["height"], track["rotation"] = _parse_tkhd(data, *tkhd)
+    mdia = _find(data, start, end, "mdia")
+    if not mdia:
+        return track
+    hdlr = _find(data, *mdia, "hdlr")
+    if hdlr:
+        _require(*hdlr, 12, "hdlr")
+        track["handler"] = data[hdlr[0] + 8:hdlr[0] + 12].decode("latin-1")
+    mdhd = _find(data, *mdia, "mdhd")
+    if mdhd:
+        track["timescale"], track["duration"] = _parse_time_header(data, *mdhd, "mdhd")
+    minf = _find(data, *mdia, "minf")
+    stbl = _find(data, *minf, "stbl") if minf else None
+    stsd = _find(data, *stbl, "stsd") if stbl else None
+    if stsd:
+        _require(*stsd, 8, "stsd")
+        entries = struct.unpack_from(">I", data, stsd[0] + 4)[0]
+        if entries:
+            entry = stsd[0] + 8
+            _require(entry, stsd[1], 8, "stsd")
+            track["codec"] = data[entry + 4:entry + 8].decode("latin-1")
+            if track.get("handler") == "vide" and not track.get("width"):
+                # tkhd에 크기가 없으면 VisualSampleEntry의 width/height
+                _require(entry, stsd[1], 8 + 24 + 4, "stsd")
+                track["width"], track["height"] = struct.unpack_from(">HH", data, entry + 8 + 24)
+    return track
+
+
+def probe_video(fh: BinaryIO) -> VideoInfo:
+    """seek 가능한 파일 객체에서 MP4/MOV 메타데이터를 읽는다.
+
+    Raises:
+        MediaProbeError: 컨테이너가 아니거나 영상 트랙이 없을 때
+    """
+    moov = _read_moov(fh)
+    try:
+        end = len(moov)
+        duration = 0.0
+        mvhd = _find(moov, 0, end, "mvhd")
+        if mvhd:
+            timescale, units = _parse_time_header(moov, *mvhd, "mvhd")
+            if timescale:
+                duration = units / timescale
+        mvex = _find(moov, 0, end, "mvex")
+        mehd = _find(moov, *mvex, "mehd") if mvex and mvhd else None
+        if not duration and mehd:
+            # fragmented MP4: 전체 길이는 mehd에 있다
+            _require(*mehd, 1, "mehd")
+            version = moov[mehd[0]]
+            _require(*mehd, 4 + (8 if version == 1 else 4), "mehd")
+            units = struct.unpack_from(">Q" if version == 1 else ">I", moov, mehd[0] + 4)[0]
+            duration = units / timescale if timescale else 0.0
+
+        tracks = [
+            _parse_track(moov, payload, box_end)
+            for box_type, payload, box_end in _iter_boxes(moov, 0, end)
+            if box_type == "trak"
+        ]
+    except (struct.error, IndexError) as e:
+        raise MediaProbeError(f"잘린 메타데이터: {e}") from e
+
+    video = next((t for t in tracks if t.get("handler") == "vide"), None)
+    if video is None:
+        raise MediaProbeError("영상 트랙이 없습니다")
+    audio = next((t for t in tracks if t.get("handler") == "soun"), None)
+    if not duration and video.get("timescale"):
+        duration = video["duration"] / video["timescale"]
+
+    return VideoInfo(
+        duration=round(duration, 3),
+        width=video.get("width", 0),
+        height=video.get("height", 0),
+        rotation=video.get("rotation", 0),
+        video_codec=video.get("codec"),
+        audio_codec=audio.get("codec") if audio else None,
+    )
+
+
+def probe_file(path: str | Path) -> VideoInfo:
+    with open(path, "rb") as fh:
+        return probe_video(fh)
+
+
+def check_supported(info: VideoInfo) -> None:
+    """Instagram이 받는 코덱/크기인지 확인한다 (게시 형식과 무관한 조건).
+
+    Raises:
+        ValueError: 지원하지 않는 영상일 때
+    """
+    if info.video_codec not in SUPPORTED_VIDEO_CODECS:
+        raise ValueError(f"지원하지 않는 영상 코덱: {info.video_codec} (H.264/HEVC만 지원)")
+    if info.audio_codec is not None and info.audio_codec not in SUPPORTED_AUDIO_CODECS:
+        raise ValueError(f"지원하지 않는 오디오 코덱: {info.audio_codec} (AAC만 지원)")
+    if not info.width or not info.height:
+        raise ValueError("영상 크기를 알 수 없습니다")
+    if not info.duration:
+        raise ValueError("영상 길이를 알 수 없습니다")
+
+
+def check_for_post(info: VideoInfo, post_type: str) -> None:
+    """video/reel 게시 형식별 길이/비율 제약을 확인한다.
+
+    Raises:
+        ValueError: 제약을 벗어날 때
+    """
+    check_supported(info)
+    aspect = info.display_width / info.display_height
+    if post_type == "reel":
+        min_s, max_s, min_a, max_a, label = (
+            REEL_MIN_SECONDS, REEL_MAX_SECONDS, REEL_MIN_ASPECT, REEL_MAX_ASPECT, "릴스",
+        )
+    else:
+        min_s, max_s, min_a, max_a, label = (
+            VIDEO_MIN_SECONDS, VIDEO_MAX_SECONDS, VIDEO_MIN_ASPECT, VIDEO_MAX_ASPECT, "동영상",
+        )
+    if not min_s <= info.duration <= max_s:
+        raise ValueError(f"{label} 길이는 {min_s}~{max_s}초여야 합니다 (현재 {info.duration:.1f}초)")
+    if not min_a <= aspect <= max_a:
+        raise ValueError(f"{label} 화면 비율이 허용 범위를 벗어났습니다 ({info.display_width}x{info.display_height})")
+    if info.display_width < MIN_WIDTH:
+        raise ValueError(f"{label} 가로 해상도는 {MIN_WIDTH}px 이상이어야 합니다")
@@ -38,10 +38,11 @@ def _execute_job(job_file: Path) -> None:
 
 def _run_post(data: dict) -> None:
     """data dict의 내용으로 실제 포스팅을 수행한다."""
-    from autosns.client import build_client
-    from autosns.uploader import upload_photo, upload_carousel, upload_video
+    from instagrapi.exceptions import LoginRequired
+
+    from autosns.client import build_client, mark_session_stale
     from autosns.hashtags import load_hashtags, append_hashtags
-    from config import HASHTAG_DIR, HASHTAG_MAX
+    from config import HASHTAG_DIR, HASHTAG_MAX, IG_USERNAME, SESSION_DIR
 
     media_type = data.get("type", "photo")
     caption = data.get("caption", "")
@@ -56,16 +57,29 @@ def _run_post(data: dict) -> None:
         tags = load_hashtags(hashtag_sets, HASHTAG_DIR, HASHTAG_MAX)
         caption = append_hashtags(caption, tags)
 
+    if media_type not in ("photo", "carousel", "video", "reel"):
+        raise ValueError(f"알 수 없는 미디어 타입: {media_type}")
+
     cl = build_client()
+    try:
+        _upload(cl, media_type, media, caption)
+    except LoginRequired:
+        # 검증 없이 재사용한 세션이 끊긴 경우: 세션을 무효화하고 전체 검증/재로그인 후 1회 재시도
+        logger.warning("LoginRequired, 세션을 재검증 후 재시도합니다.")
+        mark_session_stale(IG_USERNAME, SESSION_DIR)
+        cl = build_client()
+        _upload(cl, media_type, media, caption)
+
+
+def _upload(cl, media_type: str, media: list, caption: str) -> None:
+    from autosns.uploader import upload_photo, upload_carousel, upload_video
 
     if media_type == "photo":
         upload_photo(cl, media[0], caption)
     elif media_type == "carousel":
         upload_carousel(cl, media, caption)
-    elif media_type in ("video", "reel"):
-        upload_video(cl, media[0], caption, is_reel=(media_type == "reel"))
     else:
-        raise ValueError(f"알 수 없는 미디어 타입: {media_type}")
+        upload_video(cl, media[0], caption, is_reel=(media_type == "reel"))
 
 
 def load_pending_jobs(queue_dir: Path) -> list[Path]:
@@ -0,0 +1,29 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base
+from app.models import caption_cache, ig_account, media_blob, media_file, post, usage_counter, user  # noqa: F401
+
+
+@pytest.fixture
+def open_db(tmp_path):
+    """임시 SQLite 파일 DB를 만들어 AsyncSession을 여는 async context manager.
+
+    테스트마다 asyncio.run으로 루프가 바뀌므로 연결 풀은 쓰지 않는다.
+    """
+
+    @asynccontextmanager
+    async def _open():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                yield db
+        finally:
+            await engine.dispose()
+
+    return _open
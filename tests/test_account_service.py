@@ -0,0 +1,100 @@
+"""계정 재연결 시 비밀번호 검증 (account_service.link_account, autosns.client.get_client)."""
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import decrypt_password, encrypt_password
+from app.models.ig_account import IGAccount
+from app.models.user import User
+from app.schemas.ig_account import LinkAccountRequest
+from app.services import account_service
+from autosns import client as ig_client
+
+STORED_PASSWORD = "old"
+VALID_PASSWORDS = {"old", "new"}  # Instagram 쪽에서 비밀번호를 바꾼 직후처럼 둘 다 통과시킨다
+
+
+class FakeClient:
+    """비밀번호가 VALID_PASSWORDS에 있을 때만 로그인되는 instagrapi Client 대역."""
+
+    logins: list[tuple[str, bool]] = []
+
+    def __init__(self) -> None:
+        self.user_id = None
+
+    def load_settings(self, path) -> None:
+        self.user_id = 1
+
+    def login(self, username: str, password: str, relogin: bool = False) -> bool:
+        FakeClient.logins.append((password, relogin))
+        if self.user_id and not relogin:
+            return True  # instagrapi: 세션이 있으면 비밀번호를 확인하지 않는다
+        if password not in VALID_PASSWORDS:
+            raise RuntimeError("bad password")
+        self.user_id = 1
+        return True
+
+    def get_timeline_feed(self) -> None:
+        pass
+
+    def dump_settings(self, path) -> None:
+        path.write_text("{}", encoding="utf-8")
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SESSIONS_DIR", tmp_path)
+    monkeypatch.setattr(ig_client, "Client", FakeClient)
+    FakeClient.logins = []
+    session_dir = tmp_path / "1"
+    session_dir.mkdir()
+    # 방금 검증된 세션 (빠른 경로 대상)
+    (session_dir / "ig.json").write_text("{}", encoding="utf-8")
+    (session_dir / "ig.meta.json").write_text(json.dumps({"validated_at": time.time()}), encoding="utf-8")
+    return session_dir
+
+
+def _link(open_db, password: str):
+    async def run():
+        async with open_db() as db:
+            db.add(User(id=1, email="u@test", hashed_password="x"))
+            db.add(IGAccount(id=1, user_id=1, username="ig", encrypted_password=encrypt_password(STORED_PASSWORD)))
+            await db.commit()
+            try:
+                await account_service.link_account(db, 1, LinkAccountRequest(username="ig", password=password))
+                error = None
+            except HTTPException as e:
+                error = e
+            account = await db.get(IGAccount, 1)
+            await db.refresh(account)
+            return error, decrypt_password(account.encrypted_password)
+
+    return asyncio.run(run())
+
+
+def test_relink_with_wrong_password_is_rejected(open_db, sessions):
+    error, stored = _link(open_db, "wrong")
+
+    assert error is not None and error.status_code == 400
+    assert stored == STORED_PASSWORD
+    assert ("wrong", True) in FakeClient.logins
+
+
+def test_relink_with_same_password_uses_fresh_session(open_db, sessions):
+    error, stored = _link(open_db, STORED_PASSWORD)
+
+    assert error is None
+    assert stored == STORED_PASSWORD
+    assert FakeClient.logins == []
+
+
+def test_relink_with_new_valid_password_verifies_and_saves(open_db, sessions):
+    error, stored = _link(open_db, "new")
+
+    assert error is None
+    assert stored == "new"
+    assert FakeClient.logins == [("new", True)]
@@ -0,0 +1,78 @@
+"""autosns.caption_ai 동기/비동기 API (가짜 openai SDK)."""
+import asyncio
+import sys
+import types
+
+import pytest
+
+from autosns import caption_ai
+
+LATENCY_SECONDS = 0.05
+
+
+class FakeAsyncOpenAI:
+    instances: list["FakeAsyncOpenAI"] = []
+
+    def __init__(self, api_key: str) -> None:
+        self.chat = self.completions = self
+        self.active = self.peak = 0
+        FakeAsyncOpenAI.instances.append(self)
+
+    async def create(self, messages, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(LATENCY_SECONDS)
+        self.active -= 1
+        message = types.SimpleNamespace(content=f" {messages[1]['content']} 캡션 ")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_sdk(monkeypatch, request):
+    config = types.ModuleType("config")
+    config.AI_PROVIDER = "openai"
+    config.OPENAI_API_KEY = f"key-{request.node.name}"  # 테스트마다 새 클라이언트
+    config.ANTHROPIC_API_KEY = ""
+    config.OPENAI_MODEL = "gpt-test"
+    config.CLAUDE_MODEL = "claude-test"
+    monkeypatch.setitem(sys.modules, "config", config)
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(AsyncOpenAI=FakeAsyncOpenAI))
+    caption_ai._config.cache_clear()
+    FakeAsyncOpenAI.instances.clear()
+    yield
+    caption_ai._config.cache_clear()
+
+
+def test_sync_calls_reuse_one_client():
+    assert caption_ai.generate_caption("카페") == "카페 캡션"
+    assert caption_ai.generate_caption("빵집") == "빵집 캡션"
+    assert len(FakeAsyncOpenAI.instances) == 1
+
+
+def test_sync_wrapper_works_inside_running_loop():
+    async def handler():
+        return caption_ai.generate_caption("꽃집")
+
+    assert asyncio.run(handler()) == "꽃집 캡션"
+
+
+def test_batch_is_ordered_and_bounded():
+    prompts = [f"상품{i}" for i in range(8)]
+
+    captions = caption_ai.generate_captions(prompts, concurrency=3)
+
+    assert captions == [f"{p} 캡션" for p in prompts]
+    assert FakeAsyncOpenAI.instances[0].peak == 3
+
+
+def test_batch_return_exceptions_keeps_going():
+    captions = caption_ai.generate_captions(["a", "b"], provider="unknown", return_exceptions=True)
+    assert all(isinstance(c, ValueError) for c in captions)
+
+
+def test_provider_none_skips_ai():
+    assert caption_ai.generate_caption("x", provider="none") == ""
+    assert FakeAsyncOpenAI.instances == []
@@ -0,0 +1,71 @@
+"""app.services.caption_service 결과 캐시 (stub provider)."""
+import asyncio
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.caption import GenerateCaptionRequest
+from app.services import caption_chain, caption_providers, caption_service
+
+
+@pytest.fixture(autouse=True)
+def stub(monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER", "stub")
+    monkeypatch.setattr(settings, "AI_PROVIDER_CHAIN", "")
+    monkeypatch.setattr(settings, "CAPTION_STUB_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "CAPTION_CACHE_PERSIST", False)
+    monkeypatch.setattr(caption_chain, "_stats", {})
+    monkeypatch.setattr(caption_providers, "_providers", {})
+    monkeypatch.setattr(caption_service, "_cache", TTLCache(100, 3600))
+    monkeypatch.setattr(caption_service, "_cache_counters", dict.fromkeys(caption_service._cache_counters, 0))
+
+
+def _generate(**fields):
+    return asyncio.run(caption_service.generate_caption(GenerateCaptionRequest(**fields)))
+
+
+def test_same_request_is_served_from_cache():
+    first = _generate(topic="신메뉴 출시")
+    second = _generate(topic="신메뉴 출시")
+
+    assert second == first
+    assert caption_service._cache_counters["generated"] == 1
+    assert caption_service._cache.hits == 1
+
+
+def test_different_request_misses():
+    _generate(topic="신메뉴 출시")
+    _generate(topic="신메뉴 출시", hashtag_count=3)
+    _generate(topic="주말 할인")
+
+    assert caption_service._cache_counters["generated"] == 3
+    assert caption_service._cache.hits == 0
+
+
+def test_whitespace_and_case_differences_share_a_key():
+    _generate(topic="New  Menu", tone="Friendly", language="KO", extra_context="Latte ")
+    _generate(topic=" new menu", tone="friendly ", language="ko", extra_context="latte")
+
+    assert caption_service._cache_counters["generated"] == 1
+    assert caption_service._cache.hits == 1
+
+
+def test_regenerate_bypasses_cache_and_refreshes_it():
+    _generate(topic="신메뉴 출시")
+    _generate(topic="신메뉴 출시", regenerate=True)
+
+    assert caption_service._cache_counters["generated"] == 2
+    assert caption_service._cache_counters["bypasses"] == 1
+    assert caption_service._cache.hits == 0
+
+    _generate(topic="신메뉴 출시")
+    assert caption_service._cache_counters["generated"] == 2
+    assert caption_service._cache.hits == 1
+
+
+def test_cached_result_is_a_copy():
+    first = _generate(topic="신메뉴 출시")
+    first.hashtags.append("#changed")
+
+    assert "#changed" not in _generate(topic="신메뉴 출시").hashtags
@@ -0,0 +1,74 @@
+"""app.services.caption_chain 순서 조정/장애 조치."""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import caption_chain, caption_providers
+
+
+class FakeProvider(caption_providers.CaptionProvider):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False) -> None:
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        return {"caption": self.name}
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    monkeypatch.setattr(caption_chain, "_stats", {})
+    monkeypatch.setattr(caption_providers, "_providers", {})
+    monkeypatch.setattr(settings, "AI_PROVIDER_CHAIN", "openai,anthropic")
+    monkeypatch.setattr(settings, "AI_HEDGE_ENABLED", False)
+
+    def install(**providers: FakeProvider) -> None:
+        for provider in providers.values():
+            caption_providers.register_provider(provider)
+
+    return install
+
+
+def _complete():
+    return caption_chain.complete("system", "prompt", 1, validate=lambda data: data)
+
+
+def test_untried_backup_does_not_jump_ahead_of_healthy_primary(chain):
+    primary, backup = FakeProvider("openai", delay=0.005), FakeProvider("anthropic")
+    chain(primary=primary, backup=backup)
+
+    async def run():
+        for _ in range(4):
+            await _complete()
+
+    asyncio.run(run())
+    assert (primary.calls, backup.calls) == (4, 0)
+
+
+def test_failing_primary_fails_over_and_moves_back(chain):
+    primary, backup = FakeProvider("openai", fail=True), FakeProvider("anthropic")
+    chain(primary=primary, backup=backup)
+
+    async def run():
+        for _ in range(caption_chain.MIN_SAMPLES + 1):
+            result, provider = await _complete()
+            assert provider is backup
+
+    asyncio.run(run())
+    assert [p.name for p in caption_chain.ordered_providers()] == ["anthropic", "openai"]
+    assert primary.calls == caption_chain.MIN_SAMPLES
+
+
+def test_all_providers_failing_raises_value_error(chain):
+    chain(primary=FakeProvider("openai", fail=True), backup=FakeProvider("anthropic", fail=True))
+
+    with pytest.raises(ValueError):
+        asyncio.run(_complete())
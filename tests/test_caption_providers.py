@@ -0,0 +1,77 @@
+"""app.services.caption_providers: stub provider와 레지스트리."""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import caption_providers
+from app.services.caption_providers import StubProvider, parse_json
+
+PROMPT = "주제: 신메뉴 출시\n톤앤매너: 친근한\n해시태그 수: 3개"
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(caption_providers, "_providers", {})
+    monkeypatch.setattr(settings, "CAPTION_STUB_LATENCY_MS", 0)
+
+
+def test_stub_is_deterministic_and_follows_prompt():
+    stub = StubProvider()
+    first = asyncio.run(stub.complete("system", PROMPT))
+
+    assert asyncio.run(stub.complete("other system", PROMPT)) == first
+    assert first["caption"].startswith("신메뉴 출시 #1")
+    assert len(first["hashtags"]) == 3
+    assert asyncio.run(stub.complete("system", PROMPT + "\n추가")) != first
+
+
+def test_stub_variants_are_distinct():
+    data = asyncio.run(StubProvider().complete("system", PROMPT, variants=3))
+
+    captions = [item["caption"] for item in data["variants"]]
+    assert len(captions) == 3
+    assert len(set(captions)) == 3
+
+
+def test_stub_stream_reassembles_to_complete_response():
+    async def collect():
+        return [chunk async for chunk in StubProvider().stream("system", PROMPT)]
+
+    chunks = asyncio.run(collect())
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= StubProvider.STREAM_CHUNK_CHARS for chunk in chunks)
+    assert parse_json("".join(chunks)) == asyncio.run(StubProvider().complete("system", PROMPT))
+
+
+def test_get_provider_reuses_instances(monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER", "stub")
+
+    provider = caption_providers.get_provider()
+    assert isinstance(provider, StubProvider)
+    assert caption_providers.get_provider("stub") is provider
+
+
+def test_unknown_provider_falls_back_to_openai():
+    assert caption_providers.get_provider("nope").name == "openai"
+
+
+def test_register_provider_replaces_and_adds():
+    class Custom(caption_providers.CaptionProvider):
+        name = "custom"
+
+        async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+            return {"caption": "custom", "hashtags": []}
+
+    custom = Custom()
+    caption_providers.register_provider(custom)
+
+    assert caption_providers.get_provider("custom") is custom
+    assert "custom" in caption_providers.provider_names()
+    assert {"openai", "anthropic", "gemini", "stub"} <= set(caption_providers.provider_names())
+
+
+def test_parse_json_strips_code_fence():
+    assert parse_json('```json\n{"caption": "a"}\n```') == {"caption": "a"}
+    assert parse_json('{"caption": "b"}') == {"caption": "b"}
@@ -0,0 +1,110 @@
+"""/captions/generate/batch, /captions/generate/stream (stub provider)."""
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import captions
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.deps import get_current_user
+from app.models.user import CurrentUser
+from app.services import caption_chain, caption_providers, caption_service
+from app.services.caption_providers import StubProvider
+
+
+class FlakyStub(StubProvider):
+    """주제에 "fail"이 들어 있으면 실패하는 stub."""
+
+    async def complete(self, system: str, prompt: str, variants: int = 1) -> dict:
+        if "fail" in prompt:
+            raise RuntimeError("provider down")
+        return await super().complete(system, prompt, variants)
+
+    async def stream(self, system: str, prompt: str, variants: int = 1):
+        if "fail" in prompt:
+            raise RuntimeError("provider down")
+        async for chunk in super().stream(system, prompt, variants):
+            yield chunk
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "AI_PROVIDER", "stub")
+    monkeypatch.setattr(settings, "AI_PROVIDER_CHAIN", "")
+    monkeypatch.setattr(settings, "CAPTION_STUB_LATENCY_MS", 0)
+    monkeypatch.setattr(settings, "CAPTION_CACHE_PERSIST", False)
+    monkeypatch.setattr(caption_chain, "_stats", {})
+    monkeypatch.setattr(caption_providers, "_providers", {})
+    monkeypatch.setattr(caption_service, "_cache", TTLCache(100, 3600))
+    monkeypatch.setattr(caption_service, "_cache_counters", dict.fromkeys(caption_service._cache_counters, 0))
+    caption_providers.register_provider(FlakyStub())
+
+    app = FastAPI()
+    app.include_router(captions.router)
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        id=1, email="u@test", plan="free", is_active=True, created_at=datetime.now(timezone.utc)
+    )
+    return TestClient(app)
+
+
+def _frames(body: str) -> list[tuple[str, dict]]:
+    frames = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        frames.append((lines["event"], json.loads(lines["data"])))
+    return frames
+
+
+def test_batch_keeps_order_and_reports_item_errors(client):
+    items = [{"topic": "신메뉴"}, {"topic": "fail"}, {"topic": "할인", "hashtag_count": 2}]
+    response = client.post("/captions/generate/batch", json={"items": items, "variants": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    assert [item["index"] for item in body["items"]] == [0, 1, 2]
+
+    first, failed, last = body["items"]
+    assert first["error"] is None and len(first["variants"]) == 2
+    assert first["variants"][0]["caption"] != first["variants"][1]["caption"]
+    assert failed["variants"] == [] and "provider down" in failed["error"]
+    assert all(len(v["hashtags"]) == 2 for v in last["variants"])
+
+
+def test_batch_rejects_too_many_variants(client):
+    response = client.post("/captions/generate/batch", json={"items": [{"topic": "a"}], "variants": 99})
+    assert response.status_code == 422
+
+
+def test_stream_sends_tokens_then_done(client):
+    response = client.post("/captions/generate/stream", json={"topic": "신메뉴", "hashtag_count": 3})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = _frames(response.text)
+    events = [event for event, _ in frames]
+    assert events[-1] == "done"
+    assert events[:-1] and set(events[:-1]) == {"token"}
+
+    done = frames[-1][1]
+    assert json.loads("".join(data["text"] for _, data in frames[:-1]))["caption"] == done["caption"]
+    assert len(done["hashtags"]) == 3
+    assert done["full_text"].startswith(done["caption"])
+
+
+def test_stream_cache_hit_sends_only_done(client):
+    first = _frames(client.post("/captions/generate/stream", json={"topic": "신메뉴"}).text)
+    second = _frames(client.post("/captions/generate/stream", json={"topic": "신메뉴"}).text)
+
+    assert second == [first[-1]]
+
+
+def test_stream_failure_ends_with_error(client):
+    frames = _frames(client.post("/captions/generate/stream", json={"topic": "fail"}).text)
+
+    assert frames[-1][0] == "error"
+    assert "provider down" in frames[-1][1]["detail"]
+    assert [event for event, _ in frames[:-1]] == []
@@ -0,0 +1,61 @@
+"""app.deps.get_current_user 인증 캐시."""
+import asyncio
+import dataclasses
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import deps
+from app.core.cache import TTLCache
+from app.core.security import create_access_token
+from app.models.user import CurrentUser, User
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(deps, "_token_cache", TTLCache(100, 60))
+    monkeypatch.setattr(deps, "_user_cache", TTLCache(100, 60))
+
+
+def _credentials(user_id: int) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(user_id))
+
+
+def test_returns_read_only_snapshot_and_reuses_it(open_db):
+    async def run():
+        async with open_db() as db:
+            db.add(User(id=1, email="u@test", hashed_password="x", plan="pro"))
+            await db.commit()
+            first = await deps.get_current_user(_credentials(1), db)
+            second = await deps.get_current_user(_credentials(1), db)
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, CurrentUser)
+    assert (first.id, first.email, first.plan, first.monthly_limit) == (1, "u@test", "pro", -1)
+    assert second is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.plan = "free"
+
+
+def test_invalidate_reloads_changed_user(open_db):
+    async def run():
+        async with open_db() as db:
+            db.add(User(id=1, email="u@test", hashed_password="x"))
+            await db.commit()
+            await deps.get_current_user(_credentials(1), db)
+
+            user = await db.get(User, 1)
+            user.is_active = False
+            await db.commit()
+            stale = await deps.get_current_user(_credentials(1), db)
+
+            deps.invalidate_user_cache(1)
+            with pytest.raises(HTTPException) as exc:
+                await deps.get_current_user(_credentials(1), db)
+            return stale, exc.value
+
+    stale, error = asyncio.run(run())
+    assert stale.is_active
+    assert error.status_code == 401
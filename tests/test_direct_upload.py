@@ -0,0 +1,92 @@
+"""직접 업로드(로컬 저장소 모드): 내용 시그니처 확인과 업로드 토큰 1회 사용."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.media import CompleteUploadRequest, PresignUploadRequest
+from app.services import media_service
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 100
+JPEG = b"\xff\xd8\xff\xe0" + b"\0" * 100
+
+
+@pytest.fixture(autouse=True)
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOADS_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(settings, "R2_ACCOUNT_ID", "")
+    monkeypatch.setattr(settings, "R2_ENDPOINT_URL", "")
+
+
+async def _body(data: bytes):
+    yield data
+
+
+async def _upload(db, content_type: str, declared: bytes, sent: bytes):
+    db.add(User(id=1, email="u@test", hashed_password="x"))
+    await db.commit()
+    presigned = await media_service.presign_upload(
+        1, PresignUploadRequest(filename="a", content_type=content_type, size=len(declared))
+    )
+    token = presigned.upload_token
+    await media_service.receive_direct_upload(token, _body(sent))
+    return token
+
+
+def test_complete_accepts_matching_content_and_moves_it(open_db):
+    async def run():
+        async with open_db() as db:
+            token = await _upload(db, "image/png", PNG, PNG)
+            media = await media_service.complete_upload(db, 1, CompleteUploadRequest(upload_token=token))
+            assert [p.read_bytes() for p in (settings.UPLOADS_DIR / "media").rglob("*.png")] == [PNG]
+            assert not list((settings.UPLOADS_DIR / "direct").rglob("*.png"))
+            # 같은 토큰으로 다시 완료해도 같은 파일
+            again = await media_service.complete_upload(db, 1, CompleteUploadRequest(upload_token=token))
+            assert again.id == media.id
+
+    asyncio.run(run())
+
+
+def test_complete_rejects_content_that_does_not_match_declared_type(open_db):
+    async def run():
+        async with open_db() as db:
+            token = await _upload(db, "image/png", PNG, JPEG[: len(PNG)])
+            with pytest.raises(HTTPException) as exc:
+                await media_service.complete_upload(db, 1, CompleteUploadRequest(upload_token=token))
+            assert exc.value.status_code == 400
+            assert not list(settings.UPLOADS_DIR.rglob("*.png"))
+
+    asyncio.run(run())
+
+
+def test_put_after_upload_or_complete_is_rejected(open_db):
+    async def run():
+        async with open_db() as db:
+            token = await _upload(db, "image/png", PNG, PNG)
+            with pytest.raises(HTTPException) as exc:
+                await media_service.receive_direct_upload(token, _body(PNG))
+            assert exc.value.status_code == 409
+
+            await media_service.complete_upload(db, 1, CompleteUploadRequest(upload_token=token))
+            with pytest.raises(HTTPException) as exc:
+                await media_service.receive_direct_upload(token, _body(JPEG[: len(PNG)]))
+            assert exc.value.status_code == 409
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "content_type, head, expected",
+    [
+        ("image/jpeg", JPEG, True),
+        ("image/jpeg", PNG, False),
+        ("image/webp", b"RIFF\0\0\0\0WEBPVP8 ", True),
+        ("video/mp4", b"\0\0\0\x18ftypisom", True),
+        ("video/quicktime", b"\0\0\0\x08wide", True),
+        ("video/mp4", PNG, False),
+    ],
+)
+def test_content_signatures(content_type, head, expected):
+    assert media_service._content_matches(head[: media_service.SNIFF_BYTES], content_type) is expected
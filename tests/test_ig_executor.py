@@ -0,0 +1,58 @@
+"""app.core.ig_executor 계정 단위 직렬화와 시간 초과."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.ig_executor import IGExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = IGExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def test_timed_out_call_keeps_account_busy_until_thread_finishes(executor):
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def upload(name: str, seconds: float) -> str:
+        with lock:
+            events.append(f"{name}:start")
+        time.sleep(seconds)
+        with lock:
+            events.append(f"{name}:end")
+        return name
+
+    async def run():
+        with pytest.raises(TimeoutError):
+            await executor.run("account", upload, "slow", 0.3, timeout=0.05)
+        assert executor.stats()["abandoned"] == 1
+        # 다른 계정은 막히지 않는다
+        assert await executor.run("other", upload, "other", 0.0) == "other"
+        assert await executor.run("account", upload, "next", 0.0) == "next"
+
+    asyncio.run(run())
+    assert events.index("slow:end") < events.index("next:start")
+    assert events.index("other:end") < events.index("slow:end")
+    assert executor.stats()["abandoned"] == 0
+    assert executor.stats()["accounts_waiting"] == 0
+
+
+def test_timeout_while_queued_releases_immediately(executor):
+    async def run():
+        gate = threading.Event()
+        first = asyncio.ensure_future(executor.run("account", gate.wait, 1.0))
+        await asyncio.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(executor.run("account", lambda: "never"), 0.05)
+        gate.set()
+        await first
+        assert await executor.run("account", lambda: "ok") == "ok"
+
+    asyncio.run(run())
+    assert executor.stats()["queued"] == 0
+    assert executor.stats()["accounts_waiting"] == 0
@@ -0,0 +1,75 @@
+"""app.core.media_cache 참조 카운트/축출."""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.core import storage
+from app.core.media_cache import MediaCache
+
+FILE_SIZE = 100
+
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    """URL의 ?delay=N 만큼 이벤트 루프를 양보한 뒤 FILE_SIZE 바이트를 쓴다 (URL에 fail이 있으면 실패)."""
+
+    async def download_to_path(url: str, dest: Path) -> int:
+        delay = int(url.rsplit("delay=", 1)[1]) if "delay=" in url else 0
+        for _ in range(delay):
+            await asyncio.sleep(0)
+        if "fail" in url:
+            raise OSError("download failed")
+        dest.write_bytes(b"x" * FILE_SIZE)
+        return FILE_SIZE
+
+    monkeypatch.setattr(storage, "download_to_path", download_to_path)
+
+
+@pytest.mark.parametrize("delays", [(0, 0), (0, 1), (1, 0), (0, 2), (2, 0), (1, 3), (3, 1)])
+def test_carousel_paths_survive_eviction_when_over_budget(tmp_path, fake_download, delays):
+    cache = MediaCache(root=tmp_path, max_bytes=FILE_SIZE)  # 한 파일만 들어가는 예산
+
+    async def run():
+        urls = [f"https://cdn.test/{i}.jpg?delay={d}" for i, d in enumerate(delays)]
+        async with cache.use(urls) as paths:
+            assert all(Path(p).exists() for p in paths)
+            assert all(cache._entries[cache._cache_key(u)].refs == 1 for u in urls)
+        assert cache.total_bytes <= FILE_SIZE
+
+    asyncio.run(run())
+
+
+def test_pinned_media_is_not_evicted(tmp_path, fake_download):
+    cache = MediaCache(root=tmp_path, max_bytes=FILE_SIZE)
+
+    async def run():
+        await cache.pin(1, ["https://cdn.test/pinned.jpg"])
+        async with cache.use(["https://cdn.test/a.jpg", "https://cdn.test/b.jpg?delay=1"]) as paths:
+            assert all(Path(p).exists() for p in paths)
+        assert Path(await cache.fetch("https://cdn.test/pinned.jpg")).exists()
+        cache.unpin(1)
+        assert cache.total_bytes <= FILE_SIZE
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("delays", [(0, 3), (3, 0), (0, 0)])
+def test_failed_item_leaves_no_references(tmp_path, fake_download, delays):
+    cache = MediaCache(root=tmp_path, max_bytes=FILE_SIZE * 10)
+    fail_delay, ok_delay = delays
+
+    async def run():
+        urls = [f"https://cdn.test/fail.jpg?delay={fail_delay}", f"https://cdn.test/ok.jpg?delay={ok_delay}"]
+        with pytest.raises(OSError):
+            async with cache.use(urls):
+                pass
+        with pytest.raises(OSError):
+            await cache.pin(1, urls)
+        # 취소된 대기자와 별개로 계속된 다운로드가 끝나도록 양보
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert cache.pinned_posts() == []
+    assert all(entry.refs == 0 for entry in cache._entries.values())
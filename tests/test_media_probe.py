@@ -0,0 +1,102 @@
+"""autosns.media_probe: 합성 MP4로 정상/잘린 파일/빈 box를 확인한다."""
+import io
+import struct
+
+import pytest
+
+from autosns.media_probe import MediaProbeError, check_for_post, probe_video
+
+
+def box(box_type: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def mvhd(timescale: int = 1000, duration: int = 15500) -> bytes:
+    return box(b"mvhd", struct.pack(">IIIII", 0, 0, 0, timescale, duration) + b"\0" * 80)
+
+
+def tkhd(width: int, height: int, rotation: int = 0) -> bytes:
+    one = 0x10000
+    a, b, c, d = {0: (one, 0, 0, one), 90: (0, one, -one, 0), 180: (-one, 0, 0, -one)}[rotation]
+    matrix = struct.pack(">9i", a, b, 0, c, d, 0, 0, 0, 0x40000000)
+    head = struct.pack(">IIIIII", 0, 0, 0, 1, 0, 0) + b"\0" * 16
+    return box(b"tkhd", head + matrix + struct.pack(">II", width << 16, height << 16))
+
+
+def trak(handler: bytes, codec: bytes, tkhd_box: bytes = b"", timescale: int = 600, duration: int = 9300) -> bytes:
+    mdhd = box(b"mdhd", struct.pack(">IIIII", 0, 0, 0, timescale, duration) + b"\0" * 4)
+    hdlr = box(b"hdlr", struct.pack(">I", 0) + b"\0" * 4 + handler + b"\0" * 13)
+    stsd = box(b"stsd", struct.pack(">II", 0, 1) + box(codec, b"\0" * 78))
+    minf = box(b"minf", box(b"stbl", stsd))
+    return box(b"trak", tkhd_box + box(b"mdia", mdhd + hdlr + minf))
+
+
+def mp4(*moov_children: bytes, mdat_size: int = 1024) -> bytes:
+    ftyp = box(b"ftyp", b"isom\0\0\0\0isomavc1")
+    return ftyp + box(b"mdat", b"\0" * mdat_size) + box(b"moov", b"".join(moov_children))
+
+
+def video_track(width=1080, height=1920, rotation=0) -> bytes:
+    return trak(b"vide", b"avc1", tkhd(width, height, rotation))
+
+
+def test_valid_reel():
+    data = mp4(mvhd(), video_track(), trak(b"soun", b"mp4a"))
+
+    info = probe_video(io.BytesIO(data))
+
+    assert (info.duration, info.width, info.height, info.rotation) == (15.5, 1080, 1920, 0)
+    assert (info.video_codec, info.audio_codec) == ("avc1", "mp4a")
+    check_for_post(info, "reel")
+
+
+def test_rotation_swaps_display_size():
+    info = probe_video(io.BytesIO(mp4(mvhd(), video_track(1920, 1080, rotation=90))))
+
+    assert info.rotation == 90
+    assert (info.display_width, info.display_height) == (1080, 1920)
+
+
+def test_duration_falls_back_to_track_header():
+    info = probe_video(io.BytesIO(mp4(mvhd(duration=0), video_track())))
+    assert info.duration == 15.5
+
+
+def test_reel_limits_are_enforced():
+    info = probe_video(io.BytesIO(mp4(mvhd(duration=200_000), video_track())))
+    with pytest.raises(ValueError):
+        check_for_post(info, "reel")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"not an mp4 file at all",
+        box(b"ftyp", b"isom") + box(b"mdat", b"\0" * 64),  # moov 없음
+        mp4(mvhd(), video_track())[:-20],  # moov 끝이 잘림
+        mp4(mvhd(), trak(b"soun", b"mp4a")),  # 영상 트랙 없음
+    ],
+    ids=["empty", "garbage", "no-moov", "truncated-moov", "audio-only"],
+)
+def test_invalid_or_truncated_files(data):
+    with pytest.raises(MediaProbeError):
+        probe_video(io.BytesIO(data))
+
+
+@pytest.mark.parametrize(
+    "moov_children",
+    [
+        (box(b"mvhd"), video_track()),
+        (box(b"mvhd", b"\0" * 8), video_track()),
+        (mvhd(), trak(b"vide", b"avc1", box(b"tkhd"))),
+        (mvhd(), trak(b"vide", b"avc1", box(b"tkhd", b"\0" * 30))),
+        (mvhd(duration=0), box(b"mvex", box(b"mehd")), video_track()),
+        (mvhd(), box(b"trak", box(b"mdia", box(b"hdlr")))),
+        (mvhd(), box(b"trak", box(b"mdia", box(b"mdhd")))),
+    ],
+    ids=["empty-mvhd", "short-mvhd", "empty-tkhd", "short-tkhd", "empty-mehd", "empty-hdlr", "empty-mdhd"],
+)
+def test_empty_or_short_boxes_raise_probe_error(moov_children):
+    with pytest.raises(MediaProbeError):
+        probe_video(io.BytesIO(mp4(*moov_children)))
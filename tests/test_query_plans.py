@@ -0,0 +1,180 @@
+"""핫 쿼리가 복합 인덱스를 타는지 확인한다 (인덱스 회귀 방지).
+
+- SQLite: EXPLAIN QUERY PLAN
+- PostgreSQL: 방언으로 컴파일한 CREATE INDEX의 컬럼 순서, 그리고
+  TEST_POSTGRES_URL(예: postgresql+asyncpg://...)이 있으면 실제 EXPLAIN
+"""
+import asyncio
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import and_, create_engine, func, inspect, or_, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.core.database import Base, _create_missing_indexes, _drop_retired_indexes
+from app.models import caption_cache, ig_account, media_blob, media_file, post, usage_counter, user  # noqa: F401
+from app.models.post import Post
+
+NOW = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _due_posts_query():
+    # app.tasks.scheduler: 실행할 예약 포스팅 + 리스 만료 회수
+    return select(Post.id, Post.account_id).where(
+        or_(
+            and_(Post.status == "pending", Post.scheduled_at.isnot(None), Post.scheduled_at <= NOW),
+            and_(Post.status == "running", Post.lease_expires_at < NOW),
+        )
+    )
+
+
+def _user_usage_query():
+    return select(func.count(Post.id)).where(Post.user_id == 1, Post.status == "done", Post.executed_at >= NOW)
+
+
+def _post_list_query():
+    # app.services.post_service.list_posts
+    return select(Post).where(Post.user_id == 1).order_by(Post.created_at.desc(), Post.id.desc()).limit(21)
+
+
+def _plan(engine, query) -> list[str]:
+    sql = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def _assert_no_table_scan(plan: list[str]) -> None:
+    assert not any(step.startswith("SCAN posts") for step in plan), plan
+
+
+def test_due_posts_use_status_composites(engine):
+    plan = _plan(engine, _due_posts_query())
+    _assert_no_table_scan(plan)
+    assert any("ix_posts_status_scheduled_at (status=? AND scheduled_at" in step for step in plan), plan
+    assert any("ix_posts_status_lease_expires_at (status=? AND lease_expires_at" in step for step in plan), plan
+
+
+def test_user_monthly_usage_uses_user_status_executed_at(engine):
+    plan = _plan(engine, _user_usage_query())
+    _assert_no_table_scan(plan)
+    assert any(
+        "ix_posts_user_status_executed_at (user_id=? AND status=? AND executed_at>?)" in step for step in plan
+    ), plan
+
+
+def test_monthly_usage_rebuild_does_not_scan(engine):
+    # app.services.quota_service: 모든 사용자의 이번 달 done 집계
+    plan = _plan(
+        engine,
+        select(Post.user_id, func.count(Post.id))
+        .where(Post.status == "done", Post.executed_at >= NOW)
+        .group_by(Post.user_id),
+    )
+    _assert_no_table_scan(plan)
+
+
+def test_post_list_keyset_avoids_sort(engine):
+    plan = _plan(engine, _post_list_query())
+    _assert_no_table_scan(plan)
+    assert any("ix_posts_user_created_at_id" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def _post_indexes(engine) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes("posts")}
+
+
+def test_migrated_schema_matches_fresh_schema(engine):
+    fresh = _post_indexes(engine)
+
+    legacy = create_engine("sqlite://")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        # 이전 스키마: status 단일 인덱스만 있고 복합 인덱스는 없다
+        for name in fresh - {"ix_posts_id", "ix_posts_user_id", "ix_posts_account_id"}:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("CREATE INDEX ix_posts_status ON posts (status)"))
+
+        _create_missing_indexes(conn)
+        _drop_retired_indexes(conn)
+
+    assert _post_indexes(legacy) == fresh
+    legacy.dispose()
+
+
+POSTGRES_INDEXES = {
+    "ix_posts_status_scheduled_at": "(status, scheduled_at)",
+    "ix_posts_status_lease_expires_at": "(status, lease_expires_at)",
+    "ix_posts_user_status_executed_at": "(user_id, status, executed_at)",
+    "ix_posts_user_created_at_id": "(user_id, created_at, id)",
+}
+
+
+@pytest.mark.parametrize("name, columns", POSTGRES_INDEXES.items())
+def test_postgres_index_ddl_column_order(name, columns):
+    index = next(i for i in Post.__table__.indexes if i.name == name)
+    ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+    assert ddl == f"CREATE INDEX {name} ON posts {columns}"
+
+
+def test_postgres_has_no_single_column_status_index():
+    assert not any(
+        [c.name for c in index.columns] == ["status"] for index in Post.__table__.indexes
+    )
+
+
+@pytest.mark.parametrize(
+    "query, fragments",
+    [
+        (_due_posts_query, ["posts.status = ", "posts.scheduled_at <= ", "posts.lease_expires_at < "]),
+        (_user_usage_query, ["posts.user_id = ", "posts.status = ", "posts.executed_at >= "]),
+        (_post_list_query, ["posts.user_id = ", "ORDER BY posts.created_at DESC, posts.id DESC"]),
+    ],
+)
+def test_postgres_queries_filter_on_index_prefixes(query, fragments):
+    sql = str(query().compile(dialect=postgresql.dialect()))
+    for fragment in fragments:
+        assert fragment in sql, sql
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL 미설정")
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (_due_posts_query, "ix_posts_status_scheduled_at"),
+        (_user_usage_query, "ix_posts_user_status_executed_at"),
+        (_post_list_query, "ix_posts_user_created_at_id"),
+    ],
+)
+def test_postgres_explain_uses_index(query, index):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async def run() -> str:
+        engine = create_async_engine(os.environ["TEST_POSTGRES_URL"])
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_create_missing_indexes)
+                await conn.run_sync(_drop_retired_indexes)
+                # 빈 테이블에서는 순차 스캔이 더 싸므로 플래너가 인덱스를 고르도록 강제
+                await conn.execute(text("SET LOCAL enable_seqscan = off"))
+                sql = query().compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+                rows = await conn.execute(text(f"EXPLAIN {sql}"))
+                plan = "\n".join(row[0] for row in rows)
+                await conn.rollback()
+                return plan
+        finally:
+            await engine.dispose()
+
+    plan = asyncio.run(run())
+    assert index in plan, plan
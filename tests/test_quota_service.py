@@ -0,0 +1,92 @@
+"""app.services.quota_service.rebuild_usage_counters."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.models.ig_account import IGAccount
+from app.models.post import Post
+from app.models.usage_counter import UsageCounter
+from app.models.user import User
+from app.services import quota_service
+
+NOW = datetime(2026, 5, 20, 12, 0, tzinfo=timezone.utc)
+MONTH = "2026-05"
+
+
+async def _seed(db, done: dict[int, int], pending_user: int | None = None) -> None:
+    for user_id in {*done, *([pending_user] if pending_user else [])}:
+        db.add(User(id=user_id, email=f"u{user_id}@example.com", hashed_password="x"))
+        db.add(IGAccount(id=user_id, user_id=user_id, username=f"ig{user_id}", encrypted_password="x"))
+    for user_id, count in done.items():
+        for _ in range(count):
+            db.add(Post(user_id=user_id, account_id=user_id, post_type="photo", status="done", executed_at=NOW))
+        # 지난달 완료분은 세지 않는다
+        db.add(Post(
+            user_id=user_id, account_id=user_id, post_type="photo", status="done",
+            executed_at=NOW - timedelta(days=30),
+        ))
+    if pending_user:
+        db.add(Post(user_id=pending_user, account_id=pending_user, post_type="photo", status="pending"))
+    await db.commit()
+
+
+async def _counters(db) -> dict[int, int]:
+    result = await db.execute(
+        select(UsageCounter.user_id, UsageCounter.done_count).where(UsageCounter.month == MONTH)
+    )
+    return dict(result.all())
+
+
+def test_rebuild_overwrites_drifted_counters(open_db):
+    async def run():
+        async with open_db() as db:
+            await _seed(db, {1: 3, 2: 1}, pending_user=3)
+            for user_id, count in {1: 7, 3: 2}.items():
+                await quota_service.increment_usage(db, user_id, NOW)
+                await db.execute(
+                    update(UsageCounter).where(UsageCounter.user_id == user_id).values(done_count=count)
+                )
+            await db.commit()
+
+            updated = await quota_service.rebuild_usage_counters(db, NOW)
+            return updated, await _counters(db)
+
+    updated, counters = asyncio.run(run())
+    assert updated == 2
+    assert counters == {1: 3, 2: 1}
+
+
+def test_increment_committed_during_rebuild_is_kept(open_db):
+    async def run():
+        async with open_db() as rebuild_db, open_db() as worker_db:
+            await _seed(rebuild_db, {1: 2}, pending_user=None)
+            rebuild_db.add(Post(id=100, user_id=1, account_id=1, post_type="photo", status="running"))
+            await rebuild_db.commit()
+
+            async def finish_post():
+                # post_service.execute_post와 같이 done 변경과 +1을 한 트랜잭션으로 커밋
+                await worker_db.execute(
+                    update(Post).where(Post.id == 100).values(status="done", executed_at=NOW)
+                )
+                await quota_service.increment_usage(worker_db, 1, NOW)
+                await worker_db.commit()
+
+            execute = rebuild_db.execute
+            worker = None
+
+            async def execute_then_finish(*args, **kwargs):
+                # 재계산의 첫 문장 직후 다른 트랜잭션이 포스팅을 완료시킨다
+                nonlocal worker
+                result = await execute(*args, **kwargs)
+                if worker is None:
+                    worker = asyncio.create_task(finish_post())
+                    await asyncio.wait([worker], timeout=0.3)
+                return result
+
+            rebuild_db.execute = execute_then_finish
+            await quota_service.rebuild_usage_counters(rebuild_db, NOW)
+            await worker
+            return await _counters(worker_db)
+
+    assert asyncio.run(run()) == {1: 3}
@@ -0,0 +1,72 @@
+"""예약 포스팅 워커 처리량: 고정 지연의 가짜 execute_post로 SCHEDULER_MAX_CONCURRENCY별 posts/s를 잰다.
+
+    python -m pytest -q -s tests/test_scheduler_throughput.py  # 처리량 표 출력
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core import database
+from app.core.config import settings
+from app.services import post_service
+from app.tasks import scheduler
+
+POST_LATENCY_SECONDS = 0.05
+POST_COUNT = 32
+ACCOUNT_COUNT = 16
+
+
+@pytest.fixture
+def fake_execute(monkeypatch):
+    running = {"now": 0, "peak": 0, "per_account": {}, "per_account_peak": 0}
+
+    @asynccontextmanager
+    async def session():
+        yield None
+
+    async def execute_post(db, post_id):
+        account_id = post_id % ACCOUNT_COUNT
+        running["now"] += 1
+        running["per_account"][account_id] = running["per_account"].get(account_id, 0) + 1
+        running["peak"] = max(running["peak"], running["now"])
+        running["per_account_peak"] = max(running["per_account_peak"], running["per_account"][account_id])
+        await asyncio.sleep(POST_LATENCY_SECONDS)
+        running["now"] -= 1
+        running["per_account"][account_id] -= 1
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", session)
+    monkeypatch.setattr(post_service, "execute_post", execute_post)
+    monkeypatch.setattr(settings, "SCHEDULER_PER_ACCOUNT_CONCURRENCY", 1)
+    return running
+
+
+def _throughput(monkeypatch, concurrency: int) -> float:
+    monkeypatch.setattr(settings, "SCHEDULER_MAX_CONCURRENCY", concurrency)
+    monkeypatch.setattr(scheduler, "_global_slots", None)
+
+    async def run() -> float:
+        started = time.perf_counter()
+        for post_id in range(POST_COUNT):
+            scheduler.dispatch_post(post_id, post_id % ACCOUNT_COUNT)
+        await asyncio.gather(*list(scheduler._worker_tasks))
+        return POST_COUNT / (time.perf_counter() - started)
+
+    return asyncio.run(run())
+
+
+def test_throughput_scales_with_worker_count(fake_execute, monkeypatch):
+    results = {c: _throughput(monkeypatch, c) for c in (1, 2, 4, 8, 16)}
+
+    print(f"\n지연 {POST_LATENCY_SECONDS * 1000:.0f}ms × {POST_COUNT}건, 계정 {ACCOUNT_COUNT}개")
+    for concurrency, posts_per_second in results.items():
+        print(f"  SCHEDULER_MAX_CONCURRENCY={concurrency:>2}: {posts_per_second:7.1f} posts/s")
+
+    # 이상적으로는 워커 수에 비례 (concurrency / 지연)
+    assert results[2] > results[1] * 1.6
+    assert results[8] > results[1] * 5
+    assert results[16] > results[8] * 1.4
+    assert fake_execute["peak"] <= 16
+    assert fake_execute["per_account_peak"] == 1
+    assert not scheduler._inflight_posts
@@ -0,0 +1,102 @@
+"""app.core.storage 멀티파트 스트리밍 업로드 (가짜 S3 클라이언트)."""
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+
+import pytest
+
+from app.core import storage
+from app.core.config import settings
+
+PART_SIZE = 1024
+
+
+class FakeS3:
+    """파트마다 임의 지연을 둬 완료 순서를 섞는다."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.parts: dict[int, bytes] = {}
+        self.part_numbers: list[int] = []
+        self.objects: dict[str, bytes] = {}
+        self.aborted = False
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, PartNumber, Body, **kwargs):
+        time.sleep(random.uniform(0, 0.01))
+        with self.lock:
+            self.part_numbers.append(PartNumber)
+            self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Key, MultipartUpload, **kwargs):
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        assert numbers == list(range(1, len(numbers) + 1))
+        assert all(p["ETag"] == f"etag-{p['PartNumber']}" for p in MultipartUpload["Parts"])
+        self.objects[Key] = b"".join(self.parts[n] for n in numbers)
+
+    def put_object(self, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    client = FakeS3()
+    monkeypatch.setattr(storage, "_get_s3_client", lambda: client)
+    monkeypatch.setattr(storage, "MIN_PART_SIZE", PART_SIZE)
+    monkeypatch.setattr(settings, "STORAGE_PART_SIZE", PART_SIZE)
+    monkeypatch.setattr(settings, "R2_ENDPOINT_URL", "http://s3.test")
+    monkeypatch.setattr(settings, "R2_ACCESS_KEY_ID", "key")
+    monkeypatch.setattr(settings, "R2_SECRET_ACCESS_KEY", "secret")
+    monkeypatch.setattr(settings, "R2_BUCKET_NAME", "bucket")
+    monkeypatch.setattr(settings, "R2_PUBLIC_URL", "https://cdn.test")
+    return client
+
+
+async def _chunks(data: bytes, chunk_size: int):
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4, 8])
+def test_multipart_parts_reassemble_in_order(fake_s3, monkeypatch, concurrency):
+    monkeypatch.setattr(settings, "STORAGE_MULTIPART_CONCURRENCY", concurrency)
+    data = os.urandom(PART_SIZE * 40 + 123)
+
+    result = asyncio.run(storage.upload_stream(_chunks(data, 300), "blobs/x.bin", "application/octet-stream"))
+
+    assert len(fake_s3.part_numbers) > concurrency
+    assert sorted(fake_s3.part_numbers) == list(range(1, len(fake_s3.part_numbers) + 1))
+    assert fake_s3.objects["blobs/x.bin"] == data
+    assert result.size == len(data)
+    assert result.sha256 == hashlib.sha256(data).hexdigest()
+    assert not fake_s3.aborted
+
+
+def test_small_upload_uses_single_put(fake_s3):
+    data = b"x" * (PART_SIZE - 1)
+
+    asyncio.run(storage.upload_stream(_chunks(data, 100), "blobs/small.bin", "application/octet-stream"))
+
+    assert fake_s3.part_numbers == []
+    assert fake_s3.objects["blobs/small.bin"] == data
+
+
+def test_too_large_aborts_multipart(fake_s3):
+    data = b"x" * (PART_SIZE * 3)
+
+    with pytest.raises(storage.FileTooLargeError):
+        asyncio.run(
+            storage.upload_stream(_chunks(data, 256), "blobs/big.bin", "application/octet-stream", PART_SIZE * 2)
+        )
+    assert fake_s3.aborted
+    assert "blobs/big.bin" not in fake_s3.objects
@@ -0,0 +1,58 @@
+"""/uploads: 선언된 크기가 한도를 넘으면 본문을 읽기 전에 거절."""
+import asyncio
+
+from fastapi import FastAPI
+
+from app.api.v1 import uploads
+from app.deps import get_current_user, get_db
+from app.services import media_service
+
+
+def _post_upload(content_length: int) -> tuple[int, int]:
+    """multipart POST /uploads를 ASGI로 직접 호출해 (상태 코드, 본문 receive 횟수)를 돌려준다."""
+    app = FastAPI()
+    app.include_router(uploads.router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: None
+
+    reads = 0
+    messages = []
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/uploads",
+        "raw_path": b"/uploads",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=x"),
+            (b"content-length", str(content_length).encode()),
+        ],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+
+    async def receive():
+        nonlocal reads
+        reads += 1
+        return {"type": "http.request", "body": b"--x--\r\n", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"], reads
+
+
+def test_declared_oversize_rejected_before_body_is_read():
+    status_code, reads = _post_upload(5 * 1024 ** 3)
+    assert status_code == 413
+    assert reads == 0
+
+
+def test_declared_size_within_limit_is_parsed():
+    status_code, reads = _post_upload(media_service.MAX_FILE_SIZE)
+    assert status_code != 413
+    assert reads > 0